@@ -0,0 +1,28 @@
+"""
+Framework Mininet-WiFi - Componentes Compartilhados
+===================================================
+
+Módulos reutilizados pelos cenários, ferramentas e interface web:
+- propagation: modelo de propagação vetorizado (matriz estação x AP)
+- spatial: índice espacial (grade) de APs para melhor AP e vizinhos ao alcance
+- interference: SINR estação x AP por canal (sobreposição 2.4 GHz, incremental)
+- coverage: mapas de cobertura pré-calculados (melhor AP, RSSI, SINR) em cache
+- backend: seleção entre Mininet-WiFi real e backend analítico (headless)
+- analytic: substituto em processo do Mininet-WiFi, sem root
+- clock: relógio simulado e escalonador de eventos discretos
+- params: parâmetros de execução dos cenários (FRAMEWORK_PARAMS)
+- sweep: varredura de parâmetros em paralelo com índice consolidado
+- logwriter: escrita de logs em lote por thread de fundo (fila limitada)
+- jsonlog: logs JSONL/JSONL.gz em streaming e leitura incremental
+- logstore: formato colunar de logs (.npz) preferido pelos leitores
+- logmeta: cache persistente de metadados de logs (mtime/tamanho)
+- framecache: cache LRU em memória de DataFrames de logs por sessão
+- chartcache: cache LRU em disco de gráficos renderizados (ETag)
+- catalog: catálogo SQLite de execuções, logs, gráficos e relatórios
+- apsummary: resumo por AP em uma agregação agrupada (RSSI, latência, qualidade)
+- compare: comparação de N execuções/grupos com deltas, Welch e séries alinhadas
+- events: barramento de eventos síncrono (FIFO) com latência de reação
+- loadbalance: balanceamento de carga entre APs (heaps de utilização, classes de QoS)
+- qos: políticas QoS compiladas em HTB/TBF (tc) e simulação com token buckets
+- stats: acumuladores estatísticos mescláveis (contagem, soma, mín/máx)
+"""
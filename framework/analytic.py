@@ -0,0 +1,203 @@
+"""
+Backend Analítico (Headless)
+============================
+
+Substituto em processo para as classes do Mininet-WiFi usadas pelos cenários
+(Mininet_wifi, addStation, addAccessPoint, Controller, CLI, info...).
+
+Os cenários só dependem do Mininet-WiFi para guardar posições e aplicar
+setPosition; RSSI, latência, throughput e handover são calculados em Python.
+Este backend mantém apenas esse estado em memória: não usa sudo, interfaces
+do kernel, mac80211_hwsim nem wmediumd.
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import math
+import sys
+
+_LOG_LEVELS = {
+    'debug': 10,
+    'info': 20,
+    'output': 25,
+    'warning': 30,
+    'error': 40,
+    'critical': 50
+}
+_log_level = _LOG_LEVELS['info']
+
+
+def setLogLevel(level='info'):
+    """Define o nível de log (mesma interface do mininet.log)"""
+    global _log_level
+    _log_level = _LOG_LEVELS.get(level, _LOG_LEVELS['info'])
+
+
+def _log(level, *args):
+    if _LOG_LEVELS[level] >= _log_level:
+        sys.stdout.write(''.join(str(arg) for arg in args))
+        sys.stdout.flush()
+
+
+def info(*args):
+    _log('info', *args)
+
+
+def output(*args):
+    _log('output', *args)
+
+
+def warn(*args):
+    _log('warning', *args)
+
+
+def error(*args):
+    _log('error', *args)
+
+
+def _parse_position(position):
+    """Converte 'x,y,z' (ou sequência) em lista de floats"""
+    if isinstance(position, str):
+        position = position.split(',')
+    coords = [float(value) for value in position]
+    while len(coords) < 3:
+        coords.append(0.0)
+    return coords[:3]
+
+
+class Node:
+    """Nó analítico: guarda parâmetros e posição em memória"""
+
+    def __init__(self, name, **params):
+        self.name = name
+        self.params = dict(params)
+        self.position = [0.0, 0.0, 0.0]
+        if 'position' in params:
+            self.setPosition(params['position'])
+
+    def setPosition(self, position):
+        """Atualiza a posição do nó ('x,y,z')"""
+        self.position = _parse_position(position)
+        self.params['position'] = ','.join(str(value) for value in self.position)
+        self.params['x'], self.params['y'], self.params['z'] = self.position
+
+    def getDistanceTo(self, other):
+        """Distância euclidiana até outro nó"""
+        return math.dist(self.position, other.position)
+
+    def cmd(self, *args, **kwargs):
+        """Comandos de shell não são executados no modo analítico"""
+        return ''
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name}>"
+
+
+class Station(Node):
+    """Estação Wi-Fi analítica"""
+
+    def __init__(self, name, **params):
+        super().__init__(name, **params)
+        self.associated_ap = None
+
+    def setAssociation(self, ap, intf=None):
+        """Associa a estação a um AP"""
+        self.associated_ap = ap
+
+
+class OVSKernelAP(Node):
+    """Access Point analítico"""
+
+    def start(self, controllers):
+        self.controllers = controllers
+
+    def stop(self):
+        pass
+
+
+class Controller:
+    """Controlador analítico (sem processo OpenFlow)"""
+
+    def __init__(self, name, **params):
+        self.name = name
+        self.params = dict(params)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class wmediumd:
+    """Marcador do tipo de link; wmediumd não é iniciado no modo analítico"""
+
+
+class Mininet_wifi:
+    """Rede analítica com a mesma interface usada pelos cenários"""
+
+    def __init__(self, controller=Controller, link=None, accessPoint=OVSKernelAP,
+                 station=Station, **params):
+        self.controller = controller
+        self.link = link
+        self.accessPoint = accessPoint
+        self.station = station
+        self.params = dict(params)
+        self.controllers = []
+        self.aps = []
+        self.stations = []
+        self.nameToNode = {}
+        self.propagation_model = {}
+        self.mobility_model = {}
+
+    def _add(self, node, group):
+        group.append(node)
+        self.nameToNode[node.name] = node
+        return node
+
+    def addController(self, name='c0', controller=None, **params):
+        controller = controller or self.controller
+        return self._add(controller(name, **params), self.controllers)
+
+    def addAccessPoint(self, name, cls=None, **params):
+        return self._add((cls or self.accessPoint)(name, **params), self.aps)
+
+    def addStation(self, name, cls=None, **params):
+        return self._add((cls or self.station)(name, **params), self.stations)
+
+    def setPropagationModel(self, **params):
+        self.propagation_model = params
+
+    def setMobilityModel(self, **params):
+        self.mobility_model = params
+
+    def configureWifiNodes(self):
+        pass
+
+    def build(self):
+        pass
+
+    def get(self, *names):
+        nodes = [self.nameToNode[name] for name in names]
+        return nodes[0] if len(nodes) == 1 else nodes
+
+    def __getitem__(self, name):
+        return self.nameToNode[name]
+
+    def pingAll(self, timeout=None):
+        """Sem pacotes reais: todos os nós são considerados alcançáveis"""
+        hosts = self.stations + self.aps
+        output(f"*** Ping (analítico): {len(hosts)} nós, 0% de perda\n")
+        return 0.0
+
+    def stop(self):
+        info("*** Parando rede analítica\n")
+
+
+def CLI(net, **params):
+    """Não há CLI interativa no modo analítico"""
+    info("*** CLI indisponível no backend analítico\n")
+
+
+CLI_wifi = CLI
@@ -0,0 +1,100 @@
+"""
+Resumo por Access Point
+=======================
+
+Uma única agregação agrupada (linear no número de registros) que produz,
+para todos os APs de um log de uma vez:
+- RSSI médio, mínimo e máximo
+- quantidade de scans
+- distância média
+- latência média e percentis (P50/P90/P99)
+- classe de qualidade pelo RSSI médio
+
+Usado por tools/show_data.py, tools/analyze_logs.py e pela interface web.
+
+    table = ap_summary(df)          # DataFrame indexado pelo AP
+    for ap, row in table.iterrows():
+        print(ap, row['rssi_mean'], row['quality'])
+
+Logs do mastering_scenario_1 (best_ap, distance_to_ap, latency_ms) são
+reconhecidos pelos nomes alternativos das colunas.
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import numpy as np
+import pandas as pd
+
+LATENCY_QUANTILES = (0.5, 0.9, 0.99)
+
+# Nome canônico -> nomes aceitos, em ordem de preferência
+COLUMN_ALIASES = {
+    'ap': ('ap', 'best_ap'),
+    'rssi': ('rssi',),
+    'distance': ('distance', 'distance_to_ap'),
+    'latency': ('latency', 'latency_ms'),
+}
+
+# Classes de qualidade pelo RSSI médio: (limite inferior exclusivo, classe)
+QUALITY_LEVELS = ((-50, 'Excelente'), (-60, 'Boa'), (-70, 'Regular'), (-np.inf, 'Ruim'))
+QUALITY_ICONS = {'Excelente': '🟢', 'Boa': '🟡', 'Regular': '🟠', 'Ruim': '🔴'}
+
+
+def resolve_columns(df):
+    """Colunas do log para cada nome canônico presente"""
+    columns = {}
+    for name, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in df.columns:
+                columns[name] = alias
+                break
+    return columns
+
+
+def rssi_quality(rssi):
+    """Classe de qualidade de um RSSI (ou de um array de RSSI, vetorizado)"""
+    rssi = np.asarray(rssi, dtype=float)
+    conditions = [rssi > limit for limit, _ in QUALITY_LEVELS[:-1]]
+    labels = [label for _, label in QUALITY_LEVELS]
+    quality = np.select(conditions, labels[:-1], default=labels[-1])
+    return quality.item() if quality.ndim == 0 else quality
+
+
+def ap_summary(df):
+    """Resumo de todos os APs de um log em uma agregação agrupada
+
+    Retorna um DataFrame indexado pelo AP (ordem de primeira aparição) com
+    rssi_mean, rssi_min, rssi_max, scans, distance_mean, latency_mean,
+    latency_p50, latency_p90, latency_p99 e quality; colunas ausentes no
+    log são omitidas. Sem coluna de AP, retorna um DataFrame vazio.
+    """
+    columns = resolve_columns(df)
+    if 'ap' not in columns:
+        return pd.DataFrame()
+
+    grouped = df.groupby(columns['ap'], observed=True, sort=False)
+    aggregations = {'scans': (columns['ap'], 'size')}
+    if 'rssi' in columns:
+        aggregations.update(rssi_mean=(columns['rssi'], 'mean'),
+                            rssi_min=(columns['rssi'], 'min'),
+                            rssi_max=(columns['rssi'], 'max'))
+    if 'distance' in columns:
+        aggregations['distance_mean'] = (columns['distance'], 'mean')
+    if 'latency' in columns:
+        aggregations['latency_mean'] = (columns['latency'], 'mean')
+    summary = grouped.agg(**aggregations)
+
+    if 'latency' in columns:
+        percentiles = grouped[columns['latency']].quantile(list(LATENCY_QUANTILES)).unstack()
+        percentiles.columns = [f'latency_p{int(q * 100)}' for q in percentiles.columns]
+        summary = summary.join(percentiles)
+    if 'rssi' in columns:
+        summary['quality'] = rssi_quality(summary['rssi_mean'].to_numpy())
+
+    order = [name for name in ('rssi_mean', 'rssi_min', 'rssi_max', 'scans', 'distance_mean', 'latency_mean',
+                               'latency_p50', 'latency_p90', 'latency_p99', 'quality') if name in summary.columns]
+    summary = summary[order]
+    summary.index = summary.index.astype(str)
+    summary.index.name = 'ap'
+    return summary
@@ -0,0 +1,37 @@
+"""
+Seleção do Backend de Execução
+==============================
+
+Exporta as classes usadas pelos cenários a partir do backend escolhido pela
+variável de ambiente FRAMEWORK_BACKEND:
+
+- mininet (padrão): Mininet-WiFi real (requer root e mac80211_hwsim)
+- analytic: substituto em processo (framework.analytic), sem root
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import os
+
+BACKENDS = ('mininet', 'analytic')
+BACKEND = os.environ.get('FRAMEWORK_BACKEND', 'mininet')
+
+if BACKEND not in BACKENDS:
+    raise ValueError(f"Backend desconhecido: {BACKEND} (opções: {', '.join(BACKENDS)})")
+
+if BACKEND == 'analytic':
+    from framework.analytic import (Controller, setLogLevel, info, OVSKernelAP,
+                                    wmediumd, CLI, Mininet_wifi)
+else:
+    from mininet.node import Controller
+    from mininet.log import setLogLevel, info
+    from mn_wifi.node import OVSKernelAP
+    from mn_wifi.link import wmediumd
+    from mn_wifi.cli import CLI
+    from mn_wifi.net import Mininet_wifi
+
+
+def is_analytic():
+    """Indica se o backend analítico está ativo"""
+    return BACKEND == 'analytic'
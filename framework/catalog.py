@@ -0,0 +1,443 @@
+"""
+Catálogo de Execuções (SQLite)
+==============================
+
+Banco SQLite embutido que registra cada execução de cenário e os arquivos
+produzidos (logs, gráficos e relatórios iperf), com os resumos já
+calculados. Listar, filtrar e comparar execuções vira uma consulta
+indexada em vez de um glob no diretório seguido da leitura de cada arquivo.
+
+Tabelas:
+- runs: cenário, backend, parâmetros (JSON), início/fim, status, diretório
+- files: caminho, tipo (log/chart/report), formato, registros, intervalo de
+  tempo, RSSI médio/mín/máx, taxa de conectividade, APs, colunas e
+  agregados por coluna (RunningStats), validados por mtime/tamanho
+- aps: APs de cada execução (nome, SSID, canal, posição, alcance)
+
+Os cenários chamam record_run() ao terminar; index_paths()/backfill()
+cataloga arquivos já existentes (diretório atual, logs/ e runs/).
+
+    catalog = RunCatalog()
+    for entry in catalog.list_files(kind='log', scenario='mastering_scenario_1'):
+        print(entry['path'], entry['records'], entry['avg_rssi'])
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import glob
+import json
+import os
+import re
+import sqlite3
+import time
+
+from framework.jsonlog import iter_json_log, is_json_log
+from framework.logmeta import CACHE_DIR, LogMetadataCache
+from framework.params import load_params
+from framework.stats import RunningStats
+
+CATALOG_ENV = 'FRAMEWORK_CATALOG'
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    scenario TEXT,
+    backend TEXT,
+    params TEXT,
+    started_at REAL,
+    finished_at REAL,
+    status TEXT,
+    run_dir TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    run_id INTEGER REFERENCES runs(id) ON DELETE SET NULL,
+    scenario TEXT,
+    kind TEXT,
+    format TEXT,
+    source TEXT,
+    mtime REAL,
+    size INTEGER,
+    records INTEGER,
+    time_start REAL,
+    time_end REAL,
+    avg_rssi REAL,
+    min_rssi REAL,
+    max_rssi REAL,
+    connectivity_rate REAL,
+    aps TEXT,
+    columns TEXT,
+    stats TEXT
+);
+CREATE TABLE IF NOT EXISTS aps (
+    run_id INTEGER REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT,
+    ssid TEXT,
+    channel TEXT,
+    x REAL,
+    y REAL,
+    z REAL,
+    range REAL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_scenario ON runs(scenario, started_at);
+CREATE INDEX IF NOT EXISTS idx_files_kind ON files(kind, scenario, time_start);
+CREATE INDEX IF NOT EXISTS idx_files_run ON files(run_id);
+CREATE INDEX IF NOT EXISTS idx_aps_run ON aps(run_id);
+"""
+
+LOG_EXTENSIONS = ('.csv', '.json', '.jsonl', '.jsonl.gz')
+CHART_EXTENSIONS = ('.png',)
+# Arquivos auxiliares que não são logs de cenário
+IGNORED_FILES = ('params.json', 'index.json', 'index.csv', 'log_metadata.json')
+
+
+def default_catalog_path():
+    """Caminho absoluto do catálogo (FRAMEWORK_CATALOG ou cache do framework)"""
+    return os.path.abspath(os.environ.get(CATALOG_ENV) or os.path.join(CACHE_DIR, 'catalog.sqlite'))
+
+
+def file_format(path):
+    """Formato do arquivo pela extensão (csv, json, jsonl, jsonl.gz, png...)"""
+    name = os.path.basename(path)
+    if name.endswith('.jsonl.gz'):
+        return 'jsonl.gz'
+    return os.path.splitext(name)[1].lstrip('.').lower()
+
+
+def file_kind(path):
+    """Tipo do arquivo no catálogo: log, chart, report ou None (ignorado)"""
+    name = os.path.basename(path)
+    if name in IGNORED_FILES:
+        return None
+    if name.startswith('iperf_report') and name.endswith('.json'):
+        return 'report'
+    if name.endswith(CHART_EXTENSIONS):
+        return 'chart'
+    if name.endswith(LOG_EXTENSIONS) and 'log' in name:
+        return 'log'
+    return None
+
+
+def scenario_from_filename(path):
+    """Cenário deduzido do nome do log (ex.: mastering_scenario_1_log_2025... -> mastering_scenario_1)"""
+    name = os.path.basename(path)
+    match = re.match(r'(.+?)_log(?:_|\.|$)', name)
+    return match.group(1) if match else os.path.splitext(name)[0]
+
+
+def _rate(connected, total):
+    return round(connected / total * 100, 1) if total else None
+
+
+def summarize_csv(metadata):
+    """Resumo de catálogo a partir dos metadados incrementais de um CSV"""
+    rssi = RunningStats.from_dict(metadata['stats']['rssi']) if 'rssi' in metadata['stats'] else RunningStats()
+    connectivity = metadata['connectivity']
+    return {
+        'records': metadata['records'],
+        'time_start': metadata['time_start'],
+        'time_end': metadata['time_end'],
+        'avg_rssi': rssi.mean if rssi.count else None,
+        'min_rssi': rssi.minimum if rssi.count else None,
+        'max_rssi': rssi.maximum if rssi.count else None,
+        'connectivity_rate': _rate(connectivity['connected'], connectivity['total']),
+        'aps': metadata['aps'],
+        'columns': metadata['columns'],
+        'stats': metadata['stats'],
+    }
+
+
+def summarize_json_log(path):
+    """Resumo de um log JSON/JSONL em uma passada (melhor AP de cada iteração)"""
+    records = 0
+    time_start = time_end = None
+    rssi = RunningStats()
+    connected = 0
+    aps = set()
+    columns = []
+    for _, record in iter_json_log(path):
+        records += 1
+        if not columns:
+            columns = list(record.keys())
+        ts = record.get('timestamp')
+        if isinstance(ts, (int, float)):
+            time_start = ts if time_start is None else min(time_start, ts)
+            time_end = ts if time_end is None else max(time_end, ts)
+        best_ap = record.get('best_ap') or {}
+        if 'rssi' in best_ap:
+            rssi.add(best_ap['rssi'])
+        if best_ap.get('name'):
+            aps.add(best_ap['name'])
+        connected += bool(best_ap.get('connected'))
+    return {
+        'records': records,
+        'time_start': time_start,
+        'time_end': time_end,
+        'avg_rssi': rssi.mean if rssi.count else None,
+        'min_rssi': rssi.minimum if rssi.count else None,
+        'max_rssi': rssi.maximum if rssi.count else None,
+        'connectivity_rate': _rate(connected, records),
+        'aps': sorted(aps),
+        'columns': columns,
+        'stats': {'rssi': rssi.to_dict()} if rssi.count else {},
+    }
+
+
+def summarize_iperf_report(path):
+    """Resumo de um relatório do tools/iperf_test.py"""
+    with open(path) as f:
+        report = json.load(f)
+    bandwidth = RunningStats()
+    for result in report.get('results', []):
+        if isinstance(result.get('bandwidth'), (int, float)):
+            bandwidth.add(result['bandwidth'])
+    return {
+        'records': report.get('total_tests', len(report.get('results', []))),
+        'columns': list(report.keys()),
+        'stats': {'bandwidth': bandwidth.to_dict()} if bandwidth.count else {},
+    }
+
+
+def _node_row(node):
+    params = getattr(node, 'params', {}) or {}
+    position = getattr(node, 'position', None)
+    try:
+        x, y, z = (float(value) for value in position[:3])
+    except (TypeError, ValueError, IndexError):
+        x, y, z = (float(params.get(axis, 0) or 0) for axis in ('x', 'y', 'z'))
+    ap_range = params.get('range')
+    try:
+        ap_range = float(ap_range[0] if isinstance(ap_range, (list, tuple)) else ap_range)
+    except (TypeError, ValueError, IndexError):
+        ap_range = None
+    return (node.name, params.get('ssid'), str(params.get('channel', '')) or None, x, y, z, ap_range)
+
+
+class RunCatalog:
+    """Catálogo SQLite de execuções, logs, gráficos e relatórios"""
+
+    def __init__(self, db_path=None, metadata=None):
+        self.db_path = db_path or default_catalog_path()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.metadata = metadata or LogMetadataCache(os.path.join(os.path.dirname(self.db_path), 'log_metadata.json'))
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        # Esquema criado só uma vez por banco (aberturas seguintes só leem a versão)
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            with self.conn:
+                self.conn.executescript(SCHEMA)
+                self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self._fix_owner()
+
+    def _fix_owner(self):
+        """Cenários rodam com sudo: devolver o catálogo ao usuário normal"""
+        if 'SUDO_UID' not in os.environ:
+            return
+        try:
+            uid, gid = int(os.environ['SUDO_UID']), int(os.environ['SUDO_GID'])
+            for path in (os.path.dirname(self.db_path), self.db_path):
+                os.chown(path, uid, gid)
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Escrita
+    def index_file(self, path, kind=None, run_id=None, scenario=None, source=None):
+        """Cataloga (ou atualiza) um arquivo; não relê arquivos inalterados"""
+        path = os.path.abspath(path)
+        kind = kind or file_kind(path)
+        if kind is None or not os.path.isfile(path):
+            return None
+        stat = os.stat(path)
+        existing = self.conn.execute('SELECT * FROM files WHERE path = ?', (path,)).fetchone()
+        if existing and existing['mtime'] == stat.st_mtime and existing['size'] == stat.st_size:
+            if run_id is not None and existing['run_id'] != run_id:
+                with self.conn:
+                    self.conn.execute('UPDATE files SET run_id = ?, scenario = COALESCE(?, scenario) WHERE id = ?',
+                                      (run_id, scenario, existing['id']))
+            return existing['id']
+
+        fmt = file_format(path)
+        summary = {}
+        try:
+            if kind == 'log' and fmt == 'csv':
+                summary = summarize_csv(self.metadata.get(path))
+            elif kind == 'log' and is_json_log(path):
+                summary = summarize_json_log(path)
+            elif kind == 'report':
+                summary = summarize_iperf_report(path)
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            summary = {'records': None}
+            print(f"⚠️  Catálogo: não foi possível resumir {path}: {e}")
+
+        row = {
+            'path': path,
+            'run_id': run_id if run_id is not None else (existing['run_id'] if existing else None),
+            'scenario': scenario or (existing['scenario'] if existing else None) or
+                        (scenario_from_filename(path) if kind == 'log' else None),
+            'kind': kind,
+            'format': fmt,
+            'source': os.path.abspath(source) if source else (existing['source'] if existing else None),
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'records': summary.get('records'),
+            'time_start': summary.get('time_start'),
+            'time_end': summary.get('time_end'),
+            'avg_rssi': summary.get('avg_rssi'),
+            'min_rssi': summary.get('min_rssi'),
+            'max_rssi': summary.get('max_rssi'),
+            'connectivity_rate': summary.get('connectivity_rate'),
+            'aps': json.dumps(summary.get('aps', [])),
+            'columns': json.dumps(summary.get('columns', [])),
+            'stats': json.dumps(summary.get('stats', {})),
+        }
+        names = ', '.join(row)
+        placeholders = ', '.join(f':{name}' for name in row)
+        updates = ', '.join(f'{name} = excluded.{name}' for name in row if name != 'path')
+        with self.conn:
+            self.conn.execute(f'INSERT INTO files ({names}) VALUES ({placeholders}) '
+                              f'ON CONFLICT(path) DO UPDATE SET {updates}', row)
+        return self.conn.execute('SELECT id FROM files WHERE path = ?', (path,)).fetchone()['id']
+
+    def record_run(self, scenario, files, aps=(), params=None, backend=None,
+                   started_at=None, finished_at=None, status='ok', run_dir=None):
+        """Registra uma execução terminada, seus arquivos e seus APs"""
+        finished_at = finished_at or time.time()
+        with self.conn:
+            cursor = self.conn.execute(
+                'INSERT INTO runs (scenario, backend, params, started_at, finished_at, status, run_dir) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (scenario, backend, json.dumps(params or {}), started_at, finished_at, status,
+                 os.path.abspath(run_dir or os.getcwd())))
+            run_id = cursor.lastrowid
+            self.conn.executemany('INSERT INTO aps (run_id, name, ssid, channel, x, y, z, range) '
+                                  'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                  [(run_id,) + _node_row(ap) for ap in aps])
+        for path in files:
+            self.index_file(path, run_id=run_id, scenario=scenario)
+        return run_id
+
+    def index_paths(self, paths):
+        """Cataloga uma lista de arquivos e remove do catálogo os que sumiram"""
+        indexed = [self.index_file(path) for path in paths]
+        self.prune()
+        return [file_id for file_id in indexed if file_id is not None]
+
+    def backfill(self, root='.'):
+        """Cataloga arquivos existentes em root, root/logs e root/runs"""
+        patterns = ['*', os.path.join('logs', '*'), os.path.join('runs', '**', '*')]
+        paths = set()
+        for pattern in patterns:
+            paths.update(glob.glob(os.path.join(root, pattern), recursive=True))
+        return self.index_paths(sorted(path for path in paths if file_kind(path)))
+
+    def prune(self):
+        """Remove entradas de arquivos que não existem mais"""
+        missing = [row['id'] for row in self.conn.execute('SELECT id, path FROM files')
+                   if not os.path.exists(row['path'])]
+        if missing:
+            with self.conn:
+                self.conn.executemany('DELETE FROM files WHERE id = ?', [(file_id,) for file_id in missing])
+        return len(missing)
+
+    # Consultas
+    @staticmethod
+    def _file_dict(row):
+        entry = dict(row)
+        for name in ('aps', 'columns', 'stats'):
+            entry[name] = json.loads(entry[name]) if entry[name] else ([] if name != 'stats' else {})
+        return entry
+
+    def list_files(self, kind=None, scenario=None, formats=None, since=None, until=None, run_id=None, under=None):
+        """Arquivos catalogados com filtros opcionais, mais recentes primeiro"""
+        clauses, args = [], []
+        for column, value in (('kind', kind), ('scenario', scenario), ('run_id', run_id)):
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                args.append(value)
+        if formats:
+            clauses.append(f"format IN ({', '.join('?' for _ in formats)})")
+            args.extend(formats)
+        if since is not None:
+            clauses.append('time_end >= ?')
+            args.append(since)
+        if until is not None:
+            clauses.append('time_start <= ?')
+            args.append(until)
+        if under is not None:
+            prefix = os.path.join(os.path.abspath(under), '')
+            clauses.append("path LIKE ? ESCAPE '\\'")
+            args.append(re.sub(r'([\\%_])', r'\\\1', prefix) + '%')
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        rows = self.conn.execute(f'SELECT * FROM files {where} ORDER BY mtime DESC', args)
+        return [self._file_dict(row) for row in rows]
+
+    def get_file(self, path):
+        row = self.conn.execute('SELECT * FROM files WHERE path = ?', (os.path.abspath(path),)).fetchone()
+        return self._file_dict(row) if row else None
+
+    def list_runs(self, scenario=None, status=None, limit=None):
+        """Execuções registradas, mais recentes primeiro"""
+        clauses, args = [], []
+        for column, value in (('scenario', scenario), ('status', status)):
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                args.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        query = f'SELECT * FROM runs {where} ORDER BY finished_at DESC'
+        if limit:
+            query += f' LIMIT {int(limit)}'
+        runs = []
+        for row in self.conn.execute(query, args):
+            run = dict(row)
+            run['params'] = json.loads(run['params'] or '{}')
+            runs.append(run)
+        return runs
+
+    def get_run(self, run_id):
+        row = self.conn.execute('SELECT * FROM runs WHERE id = ?', (run_id,)).fetchone()
+        if row is None:
+            return None
+        run = dict(row)
+        run['params'] = json.loads(run['params'] or '{}')
+        return run
+
+    def run_aps(self, run_id):
+        """APs registrados para uma execução"""
+        rows = self.conn.execute('SELECT name, ssid, channel, x, y, z, range FROM aps WHERE run_id = ?', (run_id,))
+        return [dict(row) for row in rows]
+
+    def ap_positions(self, path):
+        """Posições {ap: (x, y, z)} da execução que gerou um log (ou None)"""
+        entry = self.get_file(path)
+        if not entry or entry['run_id'] is None:
+            return None
+        aps = self.run_aps(entry['run_id'])
+        return {ap['name']: (ap['x'], ap['y'], ap['z']) for ap in aps} or None
+
+
+def record_run(scenario, files, aps=(), started_at=None, status='ok'):
+    """Registra a execução atual no catálogo (nunca interrompe o cenário)
+
+    Parâmetros e backend vêm de FRAMEWORK_PARAMS / FRAMEWORK_BACKEND.
+    """
+    try:
+        with RunCatalog() as catalog:
+            return catalog.record_run(scenario, files, aps=aps, params=load_params(),
+                                      backend=os.environ.get('FRAMEWORK_BACKEND', 'mininet'),
+                                      started_at=started_at, status=status)
+    except (sqlite3.Error, OSError, ValueError) as e:
+        print(f"⚠️  Não foi possível registrar a execução no catálogo: {e}")
+        return None
@@ -0,0 +1,120 @@
+"""
+Cache de Gráficos Renderizados
+==============================
+
+Guarda em disco os PNGs gerados pela interface web, indexados por
+hash do conteúdo do arquivo de dados + parâmetros do gráfico:
+
+- o mesmo log com os mesmos parâmetros nunca é renderizado duas vezes
+- o hash do conteúdo é memorizado por (mtime, tamanho), então uma
+  visualização repetida não relê o arquivo
+- o diretório tem um limite de tamanho; ao excedê-lo, os gráficos
+  menos usados recentemente (mtime atualizado a cada acesso) são removidos
+- a chave também serve de ETag para respostas HTTP condicionais
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from framework.logmeta import CACHE_DIR
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+HASH_BLOCK = 1024 * 1024
+
+
+def file_digest(path):
+    """Hash SHA-1 do conteúdo de um arquivo, lido em blocos"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ChartCache:
+    """Cache LRU de gráficos em disco com limite de tamanho"""
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES, extension='png'):
+        self.cache_dir = cache_dir or os.path.join(CACHE_DIR, 'charts')
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    def content_digest(self, path):
+        """Hash do conteúdo, recalculado apenas quando mtime/tamanho mudam"""
+        st = os.stat(path)
+        signature = (st.st_mtime, st.st_size)
+        cached = self._digests.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        digest = file_digest(path)
+        self._digests[path] = (signature, digest)
+        return digest
+
+    def key(self, path, **params):
+        """Chave do gráfico: conteúdo do arquivo + parâmetros de renderização"""
+        payload = json.dumps({'content': self.content_digest(path), 'params': params}, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, f'{key}.{self.extension}')
+
+    def get(self, key):
+        """Caminho do gráfico em cache (marcando o uso) ou None"""
+        chart_path = self.path_for(key)
+        try:
+            os.utime(chart_path)  # mtime = último acesso, base da ordem LRU
+        except FileNotFoundError:
+            return None
+        return chart_path
+
+    def put(self, key, data):
+        """Grava o gráfico de forma atômica e aplica o limite de tamanho"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        chart_path = self.path_for(key)
+        tmp_path = f'{chart_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, chart_path)
+        self.evict(keep=os.path.basename(chart_path))
+        return chart_path
+
+    def get_or_render(self, key, render):
+        """Devolve o gráfico em cache ou o renderiza com render() -> bytes"""
+        chart_path = self.get(key)
+        if chart_path:
+            return chart_path
+        data = render()
+        if data is None:
+            return None
+        return self.put(key, data)
+
+    def evict(self, keep=None):
+        """Remove os gráficos menos usados até caber em max_bytes (exceto `keep`)"""
+        with self._lock:
+            charts = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(f'.{self.extension}'):
+                    continue
+                try:
+                    st = os.stat(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    continue
+                charts.append((st.st_mtime, st.st_size, name))
+            total = sum(size for _, size, _ in charts)
+            for _, size, name in sorted(charts):
+                if total <= self.max_bytes:
+                    break
+                if name == keep:
+                    continue
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    pass
+                total -= size
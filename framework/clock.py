@@ -0,0 +1,133 @@
+"""
+Relógio Simulado e Escalonador de Eventos Discretos
+===================================================
+
+Substitui as threads de escaneamento/mobilidade pausadas com time.sleep por
+processos (geradores) executados por um escalonador de eventos discretos.
+Cada processo faz `yield <segundos>` onde antes chamava time.sleep:
+
+    def move_rasp():
+        for pos in positions:
+            rasp.setPosition(...)
+            yield 3
+
+    scheduler = create_scheduler()
+    scheduler.process(scan_and_log())
+    scheduler.process(move_rasp())
+    scheduler.run()
+
+Modos:
+- realtime: o relógio simulado acompanha o relógio de parede
+- fast: executa o mais rápido possível, com timestamps determinísticos
+
+Eventos no mesmo instante são executados na ordem em que foram agendados,
+portanto a intercalação entre escaneamento e mobilidade é reprodutível.
+Se run() for interrompido (erro ou Ctrl+C), os processos pendentes são
+fechados, o que executa seus blocos `with`/`finally`.
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import heapq
+import itertools
+import os
+import time
+
+CLOCK_MODES = ('realtime', 'fast')
+
+
+class SimScheduler:
+    """Escalonador de eventos discretos com relógio simulado"""
+
+    def __init__(self, mode='fast', start_time=0.0):
+        if mode not in CLOCK_MODES:
+            raise ValueError(f"Modo de relógio desconhecido: {mode} (opções: {', '.join(CLOCK_MODES)})")
+        self.mode = mode
+        self.start_time = start_time
+        self._now = 0.0
+        self._queue = []
+        self._sequence = itertools.count()
+        self._processes = set()
+
+    def now(self):
+        """Segundos simulados desde o início da simulação"""
+        return self._now
+
+    def time(self):
+        """Timestamp (epoch) simulado, usado no lugar de time.time()"""
+        return self.start_time + self._now
+
+    def schedule(self, delay, callback, *args):
+        """Agenda callback(*args) para daqui a `delay` segundos simulados"""
+        if delay < 0:
+            raise ValueError("O atraso de um evento não pode ser negativo")
+        heapq.heappush(self._queue, (self._now + delay, next(self._sequence), callback, args))
+
+    def every(self, interval, callback, count, start=0.0):
+        """Agenda callback(i) a cada `interval` segundos, `count` vezes"""
+        def tick(i):
+            callback(i)
+            if i + 1 < count:
+                self.schedule(interval, tick, i + 1)
+        if count > 0:
+            self.schedule(start, tick, 0)
+
+    def process(self, generator, delay=0.0):
+        """Registra um processo: gerador que faz `yield` do próximo atraso"""
+        def step():
+            try:
+                wait = next(generator)
+            except StopIteration:
+                self._processes.discard(generator)
+                return
+            self.schedule(wait or 0.0, step)
+        self._processes.add(generator)
+        self.schedule(delay, step)
+
+    def close(self):
+        """Encerra os processos pendentes (executa seus blocos finally/with)"""
+        while self._processes:
+            self._processes.pop().close()
+        self._queue.clear()
+
+    def run(self, until=None):
+        """Executa os eventos até esvaziar a fila (ou até o instante `until`)"""
+        wall_start = time.monotonic() - self._now
+        try:
+            while self._queue:
+                event_time, sequence, callback, args = self._queue[0]
+                if until is not None and event_time > until:
+                    break
+                heapq.heappop(self._queue)
+                if self.mode == 'realtime':
+                    remaining = wall_start + event_time - time.monotonic()
+                    if remaining > 0:
+                        time.sleep(remaining)
+                self._now = event_time
+                callback(*args)
+        except BaseException:
+            # Erro ou KeyboardInterrupt: fechar os processos para que liberem
+            # seus recursos (ex.: descarregar logs) antes de propagar
+            self.close()
+            raise
+        if until is not None and until > self._now:
+            self._now = until
+
+
+def create_scheduler(mode=None, start_time=None):
+    """Cria o escalonador a partir de FRAMEWORK_CLOCK / FRAMEWORK_SIM_START
+
+    Sem configuração explícita, o backend analítico usa o modo fast e o
+    Mininet-WiFi real usa o modo realtime. No modo fast o timestamp inicial
+    é fixo (padrão 0.0), o que torna os logs reprodutíveis.
+    """
+    if mode is None:
+        default_mode = 'fast' if os.environ.get('FRAMEWORK_BACKEND') == 'analytic' else 'realtime'
+        mode = os.environ.get('FRAMEWORK_CLOCK', default_mode)
+    if start_time is None:
+        if 'FRAMEWORK_SIM_START' in os.environ:
+            start_time = float(os.environ['FRAMEWORK_SIM_START'])
+        else:
+            start_time = 0.0 if mode == 'fast' else time.time()
+    return SimScheduler(mode=mode, start_time=start_time)
@@ -0,0 +1,254 @@
+"""
+Comparação de Execuções (N-way)
+===============================
+
+Compara N execuções, ou N grupos de execuções (ex.: sementes de uma
+varredura com o mesmo parâmetro), contra uma linha de base:
+
+- distribuição de cada métrica por grupo (média, desvio, quantis)
+- deltas absolutos e relativos em relação à linha de base
+- significância pelo teste t de Welch: entre as médias por execução
+  quando os dois grupos têm 2+ execuções (sementes), senão entre registros
+- séries alinhadas (tempo decorrido ou índice do registro, ex.: RSSI ao
+  longo do mesmo percurso de waypoints), calculadas para todas as
+  execuções de uma vez com np.bincount
+
+    report = compare_runs({'A': ['a1_log.csv', 'a2_log.csv'], 'B': ['b1_log.csv', 'b2_log.csv']})
+    print(comparison_table(report))
+
+Métricas: rssi, distance, latency e connectivity (% de registros
+conectados); logs do mastering_scenario_1 usam os nomes alternativos de
+framework.apsummary.
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import numpy as np
+import pandas as pd
+
+from framework.apsummary import resolve_columns
+from framework.catalog import RunCatalog
+from framework.logstore import load_log
+from framework.stats import ColumnSummary, RunningStats, welch_t_test
+
+METRICS = ('rssi', 'distance', 'latency', 'connectivity')
+DISTRIBUTION_QUANTILES = (0.1, 0.5, 0.9)
+CONNECTIVITY_COLUMNS = ('connected', 'mesh_connected')
+ALIGN_MODES = ('time', 'index')
+DEFAULT_BINS = 50
+DEFAULT_ALPHA = 0.05
+
+
+def run_metrics(df):
+    """Arrays float por métrica de um log, mais o eixo de alinhamento"""
+    columns = resolve_columns(df)
+    metrics = {}
+    for metric in ('rssi', 'distance', 'latency'):
+        if metric in columns:
+            metrics[metric] = pd.to_numeric(df[columns[metric]], errors='coerce').to_numpy(dtype=float)
+    for column in CONNECTIVITY_COLUMNS:
+        if column in df.columns:
+            metrics['connectivity'] = (df[column] == 'YES').to_numpy(dtype=float) * 100
+            break
+    axes = {'index': np.arange(len(df), dtype=float)}
+    if 'timestamp' in df.columns and len(df):
+        timestamps = pd.to_numeric(df['timestamp'], errors='coerce').to_numpy(dtype=float)
+        axes['time'] = timestamps - np.nanmin(timestamps)
+    return metrics, axes
+
+
+def align_series(runs, metric, align, bins):
+    """Curvas (execuções x bins) de uma métrica, com um único bincount
+
+    runs: lista de (métricas, eixos) de run_metrics. Retorna (centros dos
+    bins, matriz de médias por bin com NaN onde a execução não tem dados).
+    """
+    indices, xs, values = [], [], []
+    for i, (metrics, axes) in enumerate(runs):
+        if metric not in metrics or align not in axes:
+            continue
+        x, value = axes[align], metrics[metric]
+        valid = ~(np.isnan(x) | np.isnan(value))
+        indices.append(np.full(valid.sum(), i))
+        xs.append(x[valid])
+        values.append(value[valid])
+    if not xs:
+        return None, None
+    run_index, x, value = np.concatenate(indices), np.concatenate(xs), np.concatenate(values)
+    x_max = x.max() if x.size and x.max() > 0 else 1.0
+    bin_index = np.minimum((x / x_max * bins).astype(int), bins - 1)
+    flat = run_index * bins + bin_index
+    size = len(runs) * bins
+    sums = np.bincount(flat, weights=value, minlength=size).reshape(len(runs), bins)
+    counts = np.bincount(flat, minlength=size).reshape(len(runs), bins)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        curves = sums / counts
+    centers = (np.arange(bins) + 0.5) * x_max / bins
+    return centers, curves
+
+
+def _nanmean_rows(curves):
+    valid = ~np.isnan(curves)
+    counts = valid.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, np.where(valid, curves, 0).sum(axis=0) / counts, np.nan)
+
+
+def _float_or_none(value):
+    return None if value is None or np.isnan(value) else float(value)
+
+
+def compare_runs(groups, baseline=None, align='time', bins=DEFAULT_BINS, alpha=DEFAULT_ALPHA, loader=load_log):
+    """Compara grupos {rótulo: [logs]} contra a linha de base (padrão: o primeiro)
+
+    Retorna o relatório (serializável em JSON) com distribuições, deltas,
+    testes de significância e séries alinhadas.
+    """
+    if align not in ALIGN_MODES:
+        raise ValueError(f"Alinhamento inválido: {align} (use {', '.join(ALIGN_MODES)})")
+    labels = list(groups)
+    if len(labels) < 2:
+        raise ValueError("São necessários pelo menos dois grupos/execuções para comparar")
+    baseline = baseline or labels[0]
+    if baseline not in groups:
+        raise ValueError(f"Linha de base desconhecida: {baseline}")
+    empty = [label for label in labels if not groups[label]]
+    if empty:
+        raise ValueError(f"Grupos sem logs: {', '.join(empty)}")
+
+    runs, run_groups = [], []
+    pooled = {label: {} for label in labels}
+    run_means = {label: {} for label in labels}
+    for label in labels:
+        for log_file in groups[label]:
+            metrics, axes = run_metrics(loader(log_file))
+            runs.append((metrics, axes))
+            run_groups.append(label)
+            for metric, values in metrics.items():
+                pooled[label].setdefault(metric, ColumnSummary()).add_many(values)
+                mean = np.nanmean(values) if np.any(~np.isnan(values)) else np.nan
+                if not np.isnan(mean):
+                    run_means[label].setdefault(metric, RunningStats()).add(float(mean))
+
+    report = {
+        'baseline': baseline,
+        'align': align,
+        'alpha': alpha,
+        'groups': {},
+        'deltas': {},
+        'series': {}
+    }
+    for label in labels:
+        report['groups'][label] = {
+            'runs': len(groups[label]),
+            'files': list(groups[label]),
+            'metrics': {metric: dict(summary.describe(DISTRIBUTION_QUANTILES),
+                                     run_mean_std=run_means[label][metric].std if metric in run_means[label] else None)
+                        for metric, summary in pooled[label].items()}
+        }
+
+    for label in labels:
+        if label == baseline:
+            continue
+        deltas = {}
+        for metric in METRICS:
+            if metric not in pooled[label] or metric not in pooled[baseline]:
+                continue
+            base, other = pooled[baseline][metric].stats, pooled[label][metric].stats
+            if not base.count or not other.count:
+                continue
+            delta = other.mean - base.mean
+            # Com sementes dos dois lados, a unidade amostral é a execução
+            base_runs, other_runs = run_means[baseline].get(metric), run_means[label].get(metric)
+            if base_runs and other_runs and base_runs.count >= 2 and other_runs.count >= 2:
+                test, level = welch_t_test(base_runs, other_runs), 'run'
+            else:
+                test, level = welch_t_test(base, other), 'record'
+            deltas[metric] = {
+                'baseline_mean': base.mean,
+                'mean': other.mean,
+                'delta': delta,
+                'relative': delta / abs(base.mean) * 100 if base.mean else None,
+                'test_level': level,
+                't': test['t'] if test else None,
+                'df': test['df'] if test else None,
+                'p_value': test['p_value'] if test else None,
+                'significant': bool(test and test['p_value'] < alpha)
+            }
+        report['deltas'][label] = deltas
+
+    group_rows = {label: [i for i, group in enumerate(run_groups) if group == label] for label in labels}
+    if align == 'index':
+        # Um bin por registro quando os logs são curtos
+        bins = max(1, min(bins, max(len(axes['index']) for _, axes in runs)))
+    for metric in METRICS:
+        centers, curves = align_series(runs, metric, align, bins)
+        if centers is None:
+            continue
+        group_curves = {label: _nanmean_rows(curves[rows]) for label, rows in group_rows.items() if rows}
+        series = {
+            'x': centers.tolist(),
+            'curves': {label: [_float_or_none(v) for v in curve] for label, curve in group_curves.items()},
+            'deltas': {}
+        }
+        base_curve = group_curves.get(baseline)
+        for label, curve in group_curves.items():
+            if label == baseline or base_curve is None:
+                continue
+            delta = curve - base_curve
+            valid = ~np.isnan(delta)
+            if not valid.any():
+                continue
+            worst = int(np.nanargmax(np.abs(delta)))
+            series['deltas'][label] = {
+                'mean_abs': float(np.abs(delta[valid]).mean()),
+                'max_abs': float(abs(delta[worst])),
+                'at': float(centers[worst]),
+                'curve': [_float_or_none(v) for v in delta]
+            }
+        report['series'][metric] = series
+    return report
+
+
+def comparison_table(report):
+    """Tabela (grupo x métrica) com média, quantis, delta e p-valor"""
+    rows = []
+    for label, group in report['groups'].items():
+        for metric in METRICS:
+            if metric not in group['metrics']:
+                continue
+            stats = group['metrics'][metric]
+            delta = report['deltas'].get(label, {}).get(metric, {})
+            series = report['series'].get(metric, {}).get('deltas', {}).get(label, {})
+            rows.append({
+                'grupo': label,
+                'métrica': metric,
+                'execuções': group['runs'],
+                'média': stats['mean'],
+                'p10': stats['p10'],
+                'p50': stats['p50'],
+                'p90': stats['p90'],
+                'delta': delta.get('delta'),
+                'delta_%': delta.get('relative'),
+                'p_valor': delta.get('p_value'),
+                'nível': delta.get('test_level'),
+                'significativo': '✔' if delta.get('significant') else '',
+                'série_|Δ|': series.get('mean_abs')
+            })
+    return pd.DataFrame(rows)
+
+
+def catalog_groups(param, scenario=None, under=None, catalog=None):
+    """Logs CSV do catálogo agrupados pelo valor de um parâmetro de execução"""
+    if catalog is None:
+        with RunCatalog() as catalog:
+            return catalog_groups(param, scenario, under, catalog)
+    groups = {}
+    for run in catalog.list_runs(scenario=scenario):
+        if param not in run['params']:
+            continue
+        files = [entry['path'] for entry in catalog.list_files(kind='log', formats=['csv'], run_id=run['id'], under=under)]
+        if files:
+            groups.setdefault(f"{param}={run['params'][param]}", []).extend(files)
+    return dict(sorted(groups.items()))
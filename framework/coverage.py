@@ -0,0 +1,297 @@
+"""
+Mapas de Cobertura Pré-calculados
+=================================
+
+Avalia o modelo de propagação uma única vez numa grade 2D (ou 3D, com
+várias alturas) sobre a área de uma topologia e guarda três rasters:
+
+- best_ap: índice do AP com maior RSSI em cada ponto
+- best_rssi: RSSI do melhor AP (dBm)
+- sinr: SINR do melhor AP (dB), com interferência dos APs no mesmo canal
+  somada em mW mais o piso de ruído
+
+A topologia (posições, canais, potência, frequência, perdas, `exp`,
+limites e resolução da grade) é descrita por um dicionário JSON; o hash
+dele é a chave do cache em disco (.framework_cache/coverage/<hash>.npz).
+Consultas durante os scans custam O(1) por posição: interpolação
+(bi/tri)linear do RSSI e do SINR e célula mais próxima para o AP.
+
+    topology = topology_from_nodes(ap_list, propagation, resolution=0.5)
+    grid = coverage_grid(topology)           # calcula ou carrega do cache
+    idx, rssi, sinr = grid.lookup(node_positions(stations))
+
+O sombreamento aleatório não entra na grade: ela guarda o valor médio
+do modelo. Posições fora dos limites usam a borda mais próxima.
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from framework.chartcache import ChartCache
+from framework.logmeta import CACHE_DIR
+from framework.propagation import DEFAULT_FREQ, MIN_DISTANCE, PropagationModel, node_positions, node_ranges
+
+COVERAGE_VERSION = 1
+DEFAULT_RESOLUTION = 1.0   # metros entre pontos da grade
+DEFAULT_MARGIN = 20.0      # metros ao redor dos APs quando não há alcance
+NOISE_FLOOR = -95.0        # dBm (20 MHz)
+CHUNK_POINTS = 65536       # pontos avaliados por bloco (memória limitada)
+LAYERS = ('best_rssi', 'sinr', 'best_ap')
+MAX_GRID_POINTS = 2_000_000          # pontos por grade (~40 MB de rasters)
+CACHE_MAX_BYTES = 256 * 1024 * 1024  # limite do diretório de grades (LRU)
+
+
+def _as_list(value, count):
+    """Escalar ou um valor por AP -> lista com um valor por AP"""
+    values = np.broadcast_to(np.asarray(value, dtype=float), (count,))
+    return [float(v) for v in values]
+
+
+def make_topology(aps, exp=2.0, additional_losses=10, bounds=None, resolution=DEFAULT_RESOLUTION,
+                  heights=(0.0,), noise_floor=NOISE_FLOOR, margin=DEFAULT_MARGIN):
+    """Descritor de topologia (dicionário serializável) a partir de uma lista de APs
+
+    aps: dicionários com name, x, y, z e, opcionalmente, channel, tx_power,
+    freq e range. bounds: (x_min, y_min, x_max, y_max); sem ele, a área dos
+    APs ampliada pelo maior alcance (ou por `margin`).
+    """
+    if not aps:
+        raise ValueError("A topologia precisa de pelo menos um AP")
+    entries = []
+    for ap in aps:
+        entries.append({
+            'name': str(ap['name']),
+            'x': float(ap['x']), 'y': float(ap['y']), 'z': float(ap.get('z') or 0.0),
+            'channel': str(ap.get('channel') or ''),
+            'tx_power': float(ap.get('tx_power', 20)),
+            'freq': float(ap.get('freq', DEFAULT_FREQ)),
+        })
+    if bounds is None:
+        ranges = [float(ap['range']) for ap in aps if ap.get('range')]
+        pad = max(ranges) if ranges else margin
+        xs, ys = [ap['x'] for ap in entries], [ap['y'] for ap in entries]
+        bounds = (min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad)
+    x_min, y_min, x_max, y_max = (float(v) for v in bounds)
+    if x_max <= x_min or y_max <= y_min or resolution <= 0:
+        raise ValueError(f"Grade inválida: limites {bounds}, resolução {resolution}")
+    points = ((int(np.floor((x_max - x_min) / resolution + 1e-9)) + 1) *
+              (int(np.floor((y_max - y_min) / resolution + 1e-9)) + 1) * len(heights))
+    if points > MAX_GRID_POINTS:
+        raise ValueError(f"Grade grande demais: {points} pontos com resolução {resolution} "
+                         f"(máximo {MAX_GRID_POINTS})")
+    return {
+        'version': COVERAGE_VERSION,
+        'aps': entries,
+        'exp': float(exp),
+        'additional_losses': float(additional_losses),
+        'noise_floor': float(noise_floor),
+        'bounds': [x_min, y_min, x_max, y_max],
+        'resolution': float(resolution),
+        'heights': sorted(float(z) for z in heights),
+    }
+
+
+def topology_from_nodes(nodes, propagation, **kwargs):
+    """Topologia dos APs Mininet-WiFi com os parâmetros de um PropagationModel"""
+    positions = node_positions(nodes)
+    ranges = node_ranges(nodes)
+    tx_power = _as_list(propagation.tx_power, len(nodes))
+    freq = _as_list(propagation.freq, len(nodes))
+    aps = []
+    for i, node in enumerate(nodes):
+        params = getattr(node, 'params', {}) or {}
+        ap_range = float(ranges[i]) if np.isfinite(ranges[i]) else None
+        aps.append({'name': node.name, 'x': positions[i, 0], 'y': positions[i, 1], 'z': positions[i, 2],
+                    'channel': params.get('channel'), 'tx_power': tx_power[i], 'freq': freq[i],
+                    'range': ap_range})
+    losses = np.asarray(propagation.additional_losses, dtype=float)
+    return make_topology(aps, exp=propagation.exp, additional_losses=float(losses.flat[0]), **kwargs)
+
+
+def topology_key(topology):
+    """Hash estável do descritor (chave do cache em disco)"""
+    payload = json.dumps(topology, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def grid_axes(topology):
+    """Coordenadas (xs, ys, zs) dos pontos da grade"""
+    x_min, y_min, x_max, y_max = topology['bounds']
+    step = topology['resolution']
+    xs = x_min + step * np.arange(int(np.floor((x_max - x_min) / step + 1e-9)) + 1)
+    ys = y_min + step * np.arange(int(np.floor((y_max - y_min) / step + 1e-9)) + 1)
+    return xs, ys, np.asarray(topology['heights'], dtype=float)
+
+
+def _interference_groups(aps):
+    """Código do canal por AP; APs sem canal só interferem consigo mesmos"""
+    codes, known = [], {}
+    for i, ap in enumerate(aps):
+        channel = ap['channel']
+        codes.append(known.setdefault(channel, len(known)) if channel else -1 - i)
+    return np.asarray(codes)
+
+
+def compute_rasters(topology):
+    """Rasters (nz, ny, nx) de best_ap, best_rssi e sinr, avaliados em blocos"""
+    aps = topology['aps']
+    model = PropagationModel(tx_power=[ap['tx_power'] for ap in aps], freq=[ap['freq'] for ap in aps],
+                             additional_losses=topology['additional_losses'], exp=topology['exp'],
+                             min_distance=MIN_DISTANCE)
+    ap_positions = np.array([(ap['x'], ap['y'], ap['z']) for ap in aps], dtype=float)
+    channels = _interference_groups(aps)
+    noise_mw = 10 ** (topology['noise_floor'] / 10)
+
+    xs, ys, zs = grid_axes(topology)
+    shape = (len(zs), len(ys), len(xs))
+    total = int(np.prod(shape))
+    best_ap = np.empty(total, dtype=np.int16)
+    best_rssi = np.empty(total, dtype=np.float32)
+    sinr = np.empty(total, dtype=np.float32)
+
+    for start in range(0, total, CHUNK_POINTS):
+        flat = np.arange(start, min(start + CHUNK_POINTS, total))
+        iz, iy, ix = np.unravel_index(flat, shape)
+        points = np.column_stack((xs[ix], ys[iy], zs[iz]))
+        rssi = model.rssi(points, ap_positions)
+        idx = np.argmax(rssi, axis=1)
+        rows = np.arange(len(idx))
+        signal = rssi[rows, idx]
+        power_mw = 10 ** (rssi / 10)
+        co_channel = channels[np.newaxis, :] == channels[idx][:, np.newaxis]
+        interference = np.where(co_channel, power_mw, 0.0).sum(axis=1) - power_mw[rows, idx]
+        best_ap[flat] = idx
+        best_rssi[flat] = signal
+        sinr[flat] = signal - 10 * np.log10(np.maximum(interference, 0.0) + noise_mw)
+
+    return {'best_ap': best_ap.reshape(shape), 'best_rssi': best_rssi.reshape(shape), 'sinr': sinr.reshape(shape)}
+
+
+class CoverageGrid:
+    """Rasters de cobertura de uma topologia com consultas O(1) por posição"""
+
+    def __init__(self, topology, best_ap, best_rssi, sinr, key=None):
+        self.topology = topology
+        self.key = key or topology_key(topology)
+        self.best_ap = best_ap
+        self.best_rssi = best_rssi
+        self.sinr = sinr
+        self.ap_names = [ap['name'] for ap in topology['aps']]
+        self.xs, self.ys, self.zs = grid_axes(topology)
+        self.origin = np.array([self.xs[0], self.ys[0]])
+        self.shape = np.array([len(self.xs), len(self.ys), len(self.zs)])
+
+    @property
+    def nbytes(self):
+        return self.best_ap.nbytes + self.best_rssi.nbytes + self.sinr.nbytes
+
+    def layer(self, name):
+        if name not in LAYERS:
+            raise ValueError(f"Camada inválida: {name} (use {', '.join(LAYERS)})")
+        return getattr(self, name)
+
+    def _fractional(self, positions):
+        """Índices fracionários (x, y, z) na grade, limitados às bordas"""
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        if len(self.zs) > 1:
+            # Alturas podem não ser uniformes: interpolar o índice
+            z = np.interp(positions[:, 2], self.zs, np.arange(len(self.zs)))
+        else:
+            z = np.zeros(len(positions))
+        xy = (positions[:, :2] - self.origin) / self.topology['resolution']
+        fractional = np.column_stack((xy, z))
+        return np.clip(fractional, 0, self.shape - 1)
+
+    def _interpolate(self, raster, fractional):
+        """Interpolação linear em cada eixo (8 vizinhos em 3D)"""
+        low = np.minimum(np.floor(fractional).astype(np.intp), np.maximum(self.shape - 2, 0))
+        weight = fractional - low
+        high = np.minimum(low + 1, self.shape - 1)
+        result = np.zeros(len(fractional))
+        for corner in range(8):
+            pick = [(corner >> axis) & 1 for axis in range(3)]
+            ix, iy, iz = (np.where(pick[axis], high[:, axis], low[:, axis]) for axis in range(3))
+            w = np.prod([np.where(pick[axis], weight[:, axis], 1 - weight[:, axis]) for axis in range(3)], axis=0)
+            result += w * raster[iz, iy, ix]
+        return result
+
+    def lookup(self, positions):
+        """(índice do melhor AP, RSSI, SINR) para um array (N, 3) de posições"""
+        fractional = self._fractional(positions)
+        nearest = np.rint(fractional).astype(np.intp)
+        idx = self.best_ap[nearest[:, 2], nearest[:, 1], nearest[:, 0]].astype(np.intp)
+        return idx, self._interpolate(self.best_rssi, fractional), self._interpolate(self.sinr, fractional)
+
+    def save(self, path):
+        """Grava os rasters e o descritor (.npz, gravação atômica)"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_file = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_file, 'wb') as f:
+            np.savez(f, topology=np.array(json.dumps(self.topology, sort_keys=True)),
+                     best_ap=self.best_ap, best_rssi=self.best_rssi, sinr=self.sinr)
+        os.replace(tmp_file, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            topology = json.loads(str(data['topology']))
+            return cls(topology, data['best_ap'], data['best_rssi'], data['sinr'])
+
+    @classmethod
+    def compute(cls, topology):
+        return cls(topology, **compute_rasters(topology))
+
+
+def grid_cache(cache_dir=None):
+    """Diretório de grades em cache, com limite de tamanho e remoção LRU"""
+    return ChartCache(cache_dir or os.path.join(CACHE_DIR, 'coverage'), max_bytes=CACHE_MAX_BYTES,
+                      extension='npz')
+
+
+def cache_path(topology, cache_dir=None):
+    """Arquivo .npz da grade em cache para uma topologia"""
+    return grid_cache(cache_dir).path_for(topology_key(topology))
+
+
+def coverage_grid(topology, cache_dir=None):
+    """Grade da topologia: carregada do cache em disco ou calculada e gravada"""
+    cache = grid_cache(cache_dir)
+    path = cache.get(topology_key(topology))  # marca o uso (ordem LRU)
+    if path:
+        try:
+            return CoverageGrid.load(path)
+        except (OSError, ValueError, KeyError):
+            pass  # arquivo corrompido ou de outra versão: recalcular
+    grid = CoverageGrid.compute(topology)
+    path = cache.path_for(topology_key(topology))
+    try:
+        grid.save(path)
+        cache.evict(keep=os.path.basename(path))
+    except OSError:
+        pass  # sem permissão de escrita: a grade continua válida em memória
+    return grid
+
+
+def topology_from_catalog(path, catalog, **kwargs):
+    """Topologia da execução que gerou um log, pelos APs do catálogo (ou None)
+
+    Potência e perdas seguem os padrões dos cenários (20 dBm, 10 dB); `exp`
+    vem dos parâmetros da execução quando presente.
+    """
+    entry = catalog.get_file(path)
+    if not entry or entry['run_id'] is None:
+        return None
+    aps = catalog.run_aps(entry['run_id'])
+    if not aps:
+        return None
+    run = catalog.get_run(entry['run_id'])
+    params = run['params'] if run else {}
+    kwargs.setdefault('exp', params.get('exp') or 2.0)
+    return make_topology(aps, **kwargs)
@@ -0,0 +1,99 @@
+"""
+Barramento de Eventos
+=====================
+
+Despacho de eventos para handlers registrados por tipo, no lugar de
+threads que acordam periodicamente para recalcular tudo:
+
+- publish() entrega o evento na hora (sem espera de polling); eventos
+  publicados por um handler entram numa fila FIFO e são despachados
+  depois dele, sem recursão
+- publicadores em threads diferentes são serializados: os handlers nunca
+  rodam em paralelo, então o estado do assinante dispensa locks próprios
+- handler '*' recebe todos os eventos
+- a latência de reação (publicação -> fim dos handlers) é acumulada em
+  RunningStats, por tipo de evento
+
+    bus = EventBus()
+    bus.subscribe('position', on_position)
+    bus.publish('position', node='sta1', position=(10, 20, 0))
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import threading
+import time
+from collections import deque
+
+from framework.stats import RunningStats
+
+
+class Event:
+    """Evento publicado no barramento"""
+
+    __slots__ = ('type', 'data', 'published_at')
+
+    def __init__(self, type, data, published_at):
+        self.type = type
+        self.data = data
+        self.published_at = published_at
+
+    def __getattr__(self, name):
+        try:
+            return self.data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self):
+        return f"Event({self.type!r}, {self.data!r})"
+
+
+class EventBus:
+    """Barramento de eventos síncrono com fila FIFO e métricas de latência"""
+
+    def __init__(self):
+        self._handlers = {}
+        self._pending = deque()
+        self._lock = threading.RLock()
+        self._dispatching = False
+        self.latency = {}  # tipo -> RunningStats (segundos)
+        self.errors = 0
+
+    def subscribe(self, event_type, handler):
+        """Registra handler(event) para um tipo de evento ('*' = todos)"""
+        self._handlers.setdefault(event_type, []).append(handler)
+        return handler
+
+    def unsubscribe(self, event_type, handler):
+        handlers = self._handlers.get(event_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def publish(self, event_type, **data):
+        """Publica um evento e despacha a fila, exceto se já estiver em despacho"""
+        with self._lock:
+            self._pending.append(Event(event_type, data, time.perf_counter()))
+            if self._dispatching:
+                return  # publicado por um handler: despachado em seguida
+            self._dispatching = True
+            try:
+                while self._pending:
+                    self._dispatch(self._pending.popleft())
+            finally:
+                self._dispatching = False
+
+    def _dispatch(self, event):
+        for handler in self._handlers.get(event.type, []) + self._handlers.get('*', []):
+            try:
+                handler(event)
+            except Exception as e:
+                # Um handler com erro não derruba o barramento nem os demais handlers
+                self.errors += 1
+                print(f"⚠️  Erro no handler de '{event.type}': {e}")
+        self.latency.setdefault(event.type, RunningStats()).add(time.perf_counter() - event.published_at)
+
+    def latency_summary(self):
+        """{tipo: (eventos, latência média ms, latência máxima ms)}"""
+        return {event_type: (stats.count, stats.mean * 1000, stats.maximum * 1000)
+                for event_type, stats in self.latency.items()}
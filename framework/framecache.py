@@ -0,0 +1,107 @@
+"""
+Cache de DataFrames de Logs (por sessão)
+========================================
+
+Mantém em memória os logs já carregados (via load_log, que prefere o
+.npz colunar) e os resumos calculados sobre eles, para que ferramentas
+interativas não releiam o mesmo arquivo a cada opção do menu.
+
+- validação por mtime/tamanho do log (e do .npz, se existir)
+- orçamento de memória (bytes do DataFrame, incluindo texto) com
+  descarte LRU dos frames menos usados
+- resumos guardados à parte: são pequenos e sobrevivem ao descarte do
+  frame enquanto o arquivo não mudar
+
+    frames = FrameCache(max_bytes=512 * 2**20)
+    df = frames.get('rasp_car_scan_log.csv')
+    stats = frames.summary('rasp_car_scan_log.csv', summarize)
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import os
+from collections import OrderedDict
+
+from framework.logstore import columnar_path, load_log
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def file_signature(path):
+    """Assinatura do log (mtime/tamanho do CSV e do .npz correspondente)"""
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    npz_file = columnar_path(path)
+    if npz_file != path and os.path.exists(npz_file):
+        npz_stat = os.stat(npz_file)
+        signature += (npz_stat.st_mtime_ns, npz_stat.st_size)
+    return signature
+
+
+class FrameCache:
+    """Cache LRU em memória de DataFrames de logs, limitado por bytes"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, loader=load_log):
+        self.max_bytes = max_bytes
+        self.loader = loader
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict()  # caminho -> (assinatura, DataFrame, bytes)
+        self._summaries = {}  # (caminho, nome) -> (assinatura, resumo)
+
+    def __contains__(self, path):
+        cached = self._frames.get(path)
+        return cached is not None and cached[0] == file_signature(path)
+
+    def get(self, path):
+        """DataFrame do log (recarregado só se o arquivo mudou)"""
+        signature = file_signature(path)
+        cached = self._frames.get(path)
+        if cached is not None and cached[0] == signature:
+            self._frames.move_to_end(path)
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        self._discard(path)
+        df = self.loader(path)
+        nbytes = int(df.memory_usage(deep=True).sum())
+        if nbytes <= self.max_bytes:
+            self._frames[path] = (signature, df, nbytes)
+            self.bytes += nbytes
+            self._evict()
+        return df
+
+    def summary(self, path, summarize, name=None):
+        """Resumo summarize(df) do log, calculado uma vez por versão do arquivo"""
+        key = (path, name or summarize.__name__)
+        signature = file_signature(path)
+        cached = self._summaries.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        value = summarize(self.get(path))
+        self._summaries[key] = (signature, value)
+        return value
+
+    def invalidate(self, path=None):
+        """Descarta um log (ou todos) do cache"""
+        if path is None:
+            self._frames.clear()
+            self._summaries.clear()
+            self.bytes = 0
+            return
+        self._discard(path)
+        for key in [key for key in self._summaries if key[0] == path]:
+            del self._summaries[key]
+
+    def _discard(self, path):
+        cached = self._frames.pop(path, None)
+        if cached is not None:
+            self.bytes -= cached[2]
+
+    def _evict(self):
+        while self.bytes > self.max_bytes and self._frames:
+            _, (_, _, nbytes) = self._frames.popitem(last=False)
+            self.bytes -= nbytes
@@ -0,0 +1,145 @@
+"""
+Motor de Interferência e SINR por Canal
+=======================================
+
+Calcula o SINR de todas as estações para todos os APs de uma vez:
+
+- transmissores agrupados por canal em uma matriz de sobreposição (A, A):
+  1 no mesmo canal, fator parcial para canais adjacentes de 2.4 GHz
+  (1-13, espaçamento de 5 MHz) e 0 para canais separados por 5+ canais
+  ou em bandas diferentes; em 5 GHz só o mesmo canal interfere
+- potência recebida (S, A) em mW; a interferência de cada par
+  estação x AP servidor é uma única multiplicação de matrizes:
+  I = P @ O.T - P
+- atualização incremental: estações que se moveram recalculam só suas
+  linhas; um AP que se moveu atualiza sua coluna e aplica uma correção
+  de posto 1 na interferência
+
+    engine = InterferenceEngine(propagation, node_positions(aps), ['1', '1', '6'])
+    engine.set_stations(node_positions(stations))
+    engine.update_stations(node_positions(stations))   # só as que mudaram
+    idx, rssi, sinr = engine.best()
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import numpy as np
+
+from framework.propagation import channel_to_freq
+
+NOISE_FLOOR = -95.0  # dBm (20 MHz)
+
+# Fator de sobreposição por separação entre canais de 2.4 GHz (0 a 4 canais);
+# a partir de 5 canais (ex.: 1 e 6) não há sobreposição
+ADJACENT_OVERLAP = (1.0, 0.7272, 0.2714, 0.0375, 0.0054)
+
+
+def channel_overlap(channels):
+    """Matriz (A, A) de sobreposição espectral entre os canais dos APs"""
+    freqs = np.array([channel_to_freq(channel) for channel in channels], dtype=float)
+    band_24 = freqs < 3e9
+    separation = np.rint(np.abs(freqs[:, np.newaxis] - freqs[np.newaxis, :]) / 5e6).astype(int)
+    table = np.zeros(separation.max() + 1 if separation.size else 1)
+    table[:min(len(table), len(ADJACENT_OVERLAP))] = ADJACENT_OVERLAP[:len(table)]
+    overlap = table[separation]
+    # Fora de 2.4 GHz (ou entre bandas) só o mesmo canal interfere
+    partial = band_24[:, np.newaxis] & band_24[np.newaxis, :]
+    return np.where(partial, overlap, (separation == 0).astype(float))
+
+
+class InterferenceEngine:
+    """SINR estação x AP com atualização incremental de posições"""
+
+    def __init__(self, propagation, ap_positions, channels, noise_floor=NOISE_FLOOR):
+        self.propagation = propagation
+        self.ap_positions = np.array(ap_positions, dtype=float).reshape(-1, 3)
+        self.channels = [str(channel) for channel in channels]
+        if len(self.channels) != len(self.ap_positions):
+            raise ValueError("É necessário um canal por AP")
+        self.overlap = channel_overlap(self.channels)
+        self.noise_mw = 10 ** (noise_floor / 10)
+        self.sta_positions = np.empty((0, 3))
+        self.rssi = np.empty((0, len(self.ap_positions)))
+        self.power = self.rssi.copy()         # mW recebidos (S, A)
+        self.interference = self.rssi.copy()  # mW interferentes por AP servidor (S, A)
+
+    def _rssi(self, sta_positions, ap_index=None):
+        aps = self.ap_positions if ap_index is None else self.ap_positions[ap_index]
+        distances = self.propagation.distances(sta_positions, aps)
+        return self.propagation.rssi_from_distance(distances, ap_index=ap_index)
+
+    def _interference_rows(self, power):
+        return power @ self.overlap.T - power * np.diag(self.overlap)
+
+    def set_stations(self, sta_positions):
+        """Recalcula tudo para um novo conjunto de estações"""
+        self.sta_positions = np.array(sta_positions, dtype=float).reshape(-1, 3)
+        self.rssi = self._rssi(self.sta_positions)
+        self.power = 10 ** (self.rssi / 10)
+        self.interference = self._interference_rows(self.power)
+
+    def update_stations(self, sta_positions):
+        """Atualiza só as estações cuja posição mudou; retorna quantas mudaram"""
+        sta_positions = np.asarray(sta_positions, dtype=float).reshape(-1, 3)
+        if sta_positions.shape != self.sta_positions.shape:
+            self.set_stations(sta_positions)
+            return len(sta_positions)
+        moved = np.flatnonzero(np.any(sta_positions != self.sta_positions, axis=1))
+        if moved.size:
+            self.sta_positions[moved] = sta_positions[moved]
+            self.rssi[moved] = self._rssi(sta_positions[moved])
+            self.power[moved] = 10 ** (self.rssi[moved] / 10)
+            self.interference[moved] = self._interference_rows(self.power[moved])
+        return int(moved.size)
+
+    def move_ap(self, i, position):
+        """Atualiza a coluna de um AP móvel e corrige a interferência (posto 1)"""
+        self.ap_positions[i] = np.asarray(position, dtype=float).reshape(3)
+        if not len(self.sta_positions):
+            return
+        column = np.array([i])
+        rssi = self._rssi(self.sta_positions, ap_index=column)[:, 0]
+        power = 10 ** (rssi / 10)
+        delta = power - self.power[:, i]
+        self.rssi[:, i] = rssi
+        self.power[:, i] = power
+        # I[s, a] += dP[s, i] * O[a, i] para a != i
+        weights = self.overlap[:, i].copy()
+        weights[i] = 0.0
+        self.interference += delta[:, np.newaxis] * weights[np.newaxis, :]
+
+    def set_channel(self, i, channel):
+        """Troca o canal de um AP (recalcula a sobreposição e a interferência)"""
+        self.channels[i] = str(channel)
+        self.overlap = channel_overlap(self.channels)
+        self.interference = self._interference_rows(self.power)
+
+    def sinr(self):
+        """Matriz (S, A) de SINR (dB) de cada estação servida por cada AP"""
+        return self.rssi - 10 * np.log10(np.maximum(self.interference, 0.0) + self.noise_mw)
+
+    def best(self):
+        """(AP servidor com maior RSSI, RSSI, SINR) por estação"""
+        idx = np.argmax(self.rssi, axis=1)
+        rows = np.arange(len(idx))
+        sinr = self.rssi[rows, idx] - 10 * np.log10(np.maximum(self.interference[rows, idx], 0.0) + self.noise_mw)
+        return idx, self.rssi[rows, idx], sinr
+
+    def channel_summary(self, threshold=0.0):
+        """Por canal: APs, estações servidas, SINR médio/mínimo e enlaces com SINR > threshold"""
+        idx, _, best_sinr = self.best()
+        sinr = self.sinr()
+        summary = {}
+        for channel in dict.fromkeys(self.channels):
+            aps = np.array([a for a, ch in enumerate(self.channels) if ch == channel])
+            served = np.isin(idx, aps)
+            summary[channel] = {
+                'aps': len(aps),
+                'stations': int(served.sum()),
+                'sinr_mean': float(best_sinr[served].mean()) if served.any() else None,
+                'sinr_min': float(best_sinr[served].min()) if served.any() else None,
+                'links_ok': int((sinr[:, aps] > threshold).sum()),
+                'links': int(sinr[:, aps].size)
+            }
+        return summary
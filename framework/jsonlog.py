@@ -0,0 +1,113 @@
+"""
+Logs JSON em Streaming (JSONL)
+==============================
+
+Formato de uma linha por iteração, gravado à medida que a simulação avança:
+
+    {"header": {"scenario": "...", "description": "..."}}
+    {"timestamp": ..., "iteration": 1, ...}
+    {"timestamp": ..., "iteration": 2, ...}
+
+- .jsonl: texto, um objeto JSON por linha
+- .jsonl.gz: o mesmo conteúdo comprimido com gzip (codificação compacta);
+  cada lote é descarregado com Z_SYNC_FLUSH, então um arquivo de uma
+  execução interrompida continua legível até o último lote gravado
+
+A leitura é incremental (um registro por vez) e tolera uma última linha
+truncada. O formato antigo (.json com um documento único e a lista `logs`)
+continua suportado pelos leitores.
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import gzip
+import json
+
+from framework.logwriter import AsyncLogWriter
+
+JSON_LOG_EXTENSIONS = ('.json', '.jsonl', '.jsonl.gz')
+
+
+def is_json_log(filename):
+    return filename.endswith(JSON_LOG_EXTENSIONS)
+
+
+def _open_text(filename, mode):
+    if filename.endswith('.gz'):
+        return gzip.open(filename, mode + 't', encoding='utf-8')
+    return open(filename, mode, encoding='utf-8')
+
+
+class JsonLinesWriter(AsyncLogWriter):
+    """Escritor JSONL (opcionalmente .jsonl.gz) com gravação em lote"""
+
+    def __init__(self, filename, header=None, **kwargs):
+        self.header = header or {}
+        super().__init__(filename, fieldnames=(), **kwargs)
+
+    def _open(self):
+        f = _open_text(self.filename, 'w')
+        f.write(json.dumps({'header': self.header}) + '\n')
+        return f
+
+    def _write_rows(self, rows):
+        # Em .gz, o flush() após cada lote é um Z_SYNC_FLUSH: o lote fica
+        # decodificável mesmo que o processo morra em seguida
+        self._file.write(''.join(json.dumps(row) + '\n' for row in rows))
+
+
+def _iter_lines(filename):
+    """Linhas de um arquivo JSONL, parando sem erro em um final truncado"""
+    with _open_text(filename, 'r') as f:
+        try:
+            for line in f:
+                yield line
+        except EOFError:
+            return  # .gz de uma execução interrompida: fim do último lote completo
+
+
+def iter_json_log(filename):
+    """Gera (header, registro) para cada iteração de um log JSON/JSONL
+
+    O header é o mesmo dicionário para todos os registros do arquivo.
+    """
+    if filename.endswith('.json'):
+        # Formato antigo: documento único carregado de uma vez
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        header = {key: value for key, value in data.items() if key != 'logs'}
+        for record in data.get('logs', []):
+            yield header, record
+        return
+
+    header = {}
+    for line in _iter_lines(filename):
+        if not line.endswith('\n'):
+            break  # linha parcial: escrita em andamento ou interrompida
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            break
+        if 'header' in record and len(record) == 1:
+            header = record['header']
+            continue
+        yield header, record
+
+
+def read_json_log_header(filename):
+    """Metadados do log (cenário, descrição...) sem ler os registros"""
+    if filename.endswith('.json'):
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        return {key: value for key, value in data.items() if key != 'logs'}
+    for line in _iter_lines(filename):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            break
+        return record.get('header', {}) if len(record) == 1 else {}
+    return {}
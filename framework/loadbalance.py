@@ -0,0 +1,244 @@
+"""
+Balanceamento de Carga entre APs
+================================
+
+Mantém a carga (Mbps demandados / capacidade) de cada AP em dois heaps
+com invalidação preguiçosa (min-heap: AP menos carregado; max-heap: AP
+mais carregado) e os clientes de cada AP em conjuntos (hash sets):
+
+- admit(): escolhe o AP de menor custo entre os que o cliente ouve acima
+  do piso de RSSI; custo = peso_sinal * penalidade de sinal +
+  peso_carga * utilização após a entrada, com pesos pela classe de QoS
+  (high, iot, normal, low). Os candidatos vêm do índice espacial (k APs
+  ao alcance), então a decisão custa O(k + log APs)
+- handoff(): novo AP quando o cliente se move (sinal abaixo do piso ou
+  custo melhor por uma margem de histerese)
+- rebalance(): enquanto a diferença de utilização entre o AP mais e o
+  menos carregado passar da tolerância, migra do AP mais carregado o
+  cliente de menor prioridade que tenha um destino ao alcance que reduza
+  a carga máxima; clientes 'high' não são migrados
+
+    balancer = LoadBalancer()
+    ap = balancer.admit('sta1', {'ap1': -52.0, 'ap2': -64.5}, qos_class='low', demand=2.0)
+    moves = balancer.rebalance(candidates_for)   # [(cliente, origem, destino)]
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import heapq
+import itertools
+
+DEFAULT_CAPACITY = 54.0   # Mbps (802.11g)
+DEFAULT_DEMAND = 5.0      # Mbps por cliente
+RSSI_FLOOR = -70.0        # dBm, abaixo disso o AP não é candidato
+GOOD_RSSI = -50.0         # dBm, sinal sem penalidade
+SIGNAL_SPAN = 20.0        # dB entre GOOD_RSSI e RSSI_FLOOR
+HANDOFF_MARGIN = 0.15     # melhora mínima de custo para um handoff
+DEFAULT_TOLERANCE = 0.1   # diferença de utilização aceita entre APs
+
+# Classe de QoS -> (peso do sinal, peso da carga, ordem de migração)
+QOS_CLASSES = {
+    'high': (1.0, 0.5, None),   # nunca migrado pelo balanceador
+    'iot': (1.0, 0.25, 2),
+    'normal': (0.75, 0.75, 1),
+    'low': (0.5, 1.0, 0),
+}
+DEFAULT_CLASS = 'normal'
+
+
+class LoadBalancer:
+    """Balanceador de carga com heaps de utilização e custo restrito por RSSI"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, rssi_floor=RSSI_FLOOR,
+                 handoff_margin=HANDOFF_MARGIN, tolerance=DEFAULT_TOLERANCE):
+        self.default_capacity = capacity
+        self.rssi_floor = rssi_floor
+        self.handoff_margin = handoff_margin
+        self.tolerance = tolerance
+        self.capacity = {}     # AP -> Mbps
+        self.load = {}         # AP -> Mbps demandados
+        self.clients = {}      # AP -> conjunto de clientes
+        self.client_ap = {}    # cliente -> AP
+        self.demand = {}       # cliente -> Mbps
+        self.qos_class = {}    # cliente -> classe
+        self._version = {}
+        self._excluded = set()  # APs fora dos heaps durante uma rodada de rebalance
+        self._min_heap = []
+        self._max_heap = []
+        self._sequence = itertools.count()
+
+    # Heaps com invalidação preguiçosa
+    def _push(self, ap):
+        version = next(self._sequence)
+        self._version[ap] = version
+        utilization = self.utilization(ap)
+        heapq.heappush(self._min_heap, (utilization, version, ap))
+        heapq.heappush(self._max_heap, (-utilization, version, ap))
+        if len(self._min_heap) > 4 * len(self._version) + 64:
+            self._compact()
+
+    def _compact(self):
+        self._min_heap = [(self.utilization(ap), version, ap) for ap, version in self._version.items()]
+        self._max_heap = [(-utilization, version, ap) for utilization, version, ap in self._min_heap]
+        heapq.heapify(self._min_heap)
+        heapq.heapify(self._max_heap)
+
+    def _top(self, heap):
+        while heap and (heap[0][1] != self._version.get(heap[0][2]) or heap[0][2] in self._excluded):
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    def least_loaded(self):
+        """AP com menor utilização (O(log APs) amortizado)"""
+        return self._top(self._min_heap)
+
+    def most_loaded(self):
+        """AP com maior utilização (O(log APs) amortizado)"""
+        return self._top(self._max_heap)
+
+    # Estado
+    def add_ap(self, ap, capacity=None):
+        self.capacity[ap] = float(capacity or self.default_capacity)
+        self.load.setdefault(ap, 0.0)
+        self.clients.setdefault(ap, set())
+        self._push(ap)
+
+    def utilization(self, ap):
+        return self.load[ap] / self.capacity[ap]
+
+    def assign(self, client, ap, demand=None, qos_class=None):
+        """Associa (ou move) um cliente a um AP; retorna o AP anterior"""
+        if demand is not None:
+            self.set_demand(client, demand, qos_class)
+        elif qos_class is not None:
+            self.qos_class[client] = qos_class
+        demand = self.demand.setdefault(client, DEFAULT_DEMAND)
+        old_ap = self.client_ap.get(client)
+        if old_ap == ap:
+            return old_ap
+        if old_ap is not None:
+            self.clients[old_ap].discard(client)
+            self.load[old_ap] -= demand
+            self._push(old_ap)
+        self.clients[ap].add(client)
+        self.load[ap] += demand
+        self.client_ap[client] = ap
+        self._push(ap)
+        return old_ap
+
+    def release(self, client):
+        """Remove o cliente do seu AP; retorna o AP (ou None)"""
+        ap = self.client_ap.pop(client, None)
+        if ap is not None:
+            self.clients[ap].discard(client)
+            self.load[ap] -= self.demand.get(client, DEFAULT_DEMAND)
+            self._push(ap)
+        return ap
+
+    def set_demand(self, client, demand, qos_class=None):
+        """Atualiza a demanda/classe de um cliente (e a carga do seu AP)"""
+        if qos_class is not None:
+            self.qos_class[client] = qos_class if qos_class in QOS_CLASSES else DEFAULT_CLASS
+        old = self.demand.get(client, DEFAULT_DEMAND)
+        self.demand[client] = float(demand)
+        ap = self.client_ap.get(client)
+        if ap is not None and old != self.demand[client]:
+            self.load[ap] += self.demand[client] - old
+            self._push(ap)
+
+    # Decisões
+    def cost(self, client, ap, rssi):
+        """Custo de servir o cliente pelo AP (menor é melhor)"""
+        signal_weight, load_weight, _ = QOS_CLASSES[self.qos_class.get(client, DEFAULT_CLASS)]
+        demand = self.demand.get(client, DEFAULT_DEMAND)
+        load = self.load[ap] + (0.0 if self.client_ap.get(client) == ap else demand)
+        signal_penalty = max(0.0, GOOD_RSSI - rssi) / SIGNAL_SPAN
+        return signal_weight * signal_penalty + load_weight * load / self.capacity[ap]
+
+    def _feasible(self, rssi_by_ap, fallback=True):
+        feasible = {ap: rssi for ap, rssi in rssi_by_ap.items() if ap in self.capacity and rssi >= self.rssi_floor}
+        if not feasible and fallback and rssi_by_ap:
+            # Nenhum AP acima do piso: o de sinal mais forte (conexão fraca)
+            ap = max(rssi_by_ap, key=rssi_by_ap.get)
+            feasible = {ap: rssi_by_ap[ap]} if ap in self.capacity else {}
+        return feasible
+
+    def choose(self, client, rssi_by_ap):
+        """(AP de menor custo, custo) entre os candidatos acima do piso de RSSI"""
+        best, best_cost = None, None
+        for ap, rssi in self._feasible(rssi_by_ap).items():
+            cost = self.cost(client, ap, rssi)
+            if best_cost is None or cost < best_cost:
+                best, best_cost = ap, cost
+        return best, best_cost
+
+    def admit(self, client, rssi_by_ap, qos_class=None, demand=None):
+        """Decide e aplica a associação de um cliente; retorna o AP (ou None)"""
+        self.set_demand(client, demand if demand is not None else self.demand.get(client, DEFAULT_DEMAND), qos_class)
+        ap, _ = self.choose(client, rssi_by_ap)
+        if ap is not None:
+            self.assign(client, ap)
+        return ap
+
+    def handoff(self, client, rssi_by_ap):
+        """AP para onde o cliente deve ir após mudança de sinal, ou None se o atual continua
+
+        Só decide; a troca é aplicada com assign().
+        """
+        current = self.client_ap.get(client)
+        best, best_cost = self.choose(client, rssi_by_ap)
+        if best is None or best == current:
+            return None
+        current_rssi = rssi_by_ap.get(current)
+        if current is not None and current_rssi is not None and current_rssi >= self.rssi_floor:
+            if best_cost > self.cost(client, current, current_rssi) - self.handoff_margin:
+                return None
+        return best
+
+    def _best_move(self, source, candidates_for):
+        """(cliente, destino) que reduz a carga do AP de origem, ou None
+
+        Clientes de menor prioridade primeiro; o destino deve ficar abaixo
+        da utilização atual da origem, o que garante convergência.
+        """
+        peak = self.utilization(source)
+        movable = sorted((order, client) for client in self.clients[source]
+                         for order in [QOS_CLASSES[self.qos_class.get(client, DEFAULT_CLASS)][2]]
+                         if order is not None)
+        for _, client in movable:
+            demand = self.demand.get(client, DEFAULT_DEMAND)
+            best, best_cost = None, None
+            for ap, rssi in self._feasible(candidates_for(client), fallback=False).items():
+                if ap == source or (self.load[ap] + demand) / self.capacity[ap] >= peak:
+                    continue
+                cost = self.cost(client, ap, rssi)
+                if best_cost is None or cost < best_cost:
+                    best, best_cost = ap, cost
+            if best is not None:
+                return client, best
+        return None
+
+    def rebalance(self, candidates_for, max_moves=None):
+        """Migra clientes até equilibrar a utilização; retorna [(cliente, origem, destino)]
+
+        candidates_for(cliente) -> {AP: RSSI} dos APs ao alcance do cliente.
+        """
+        moves = []
+        while max_moves is None or len(moves) < max_moves:
+            source, target = self.most_loaded(), self.least_loaded()
+            if source is None or target is None or \
+                    self.utilization(source) - self.utilization(target) <= self.tolerance:
+                break
+            move = self._best_move(source, candidates_for)
+            if move is None:
+                # Nenhum cliente do AP pode sair: fora dos heaps até o fim desta rodada
+                self._excluded.add(source)
+                continue
+            client, destination = move
+            self.assign(client, destination)
+            moves.append((client, source, destination))
+        excluded, self._excluded = self._excluded, set()
+        for ap in excluded:
+            self._push(ap)
+        return moves
@@ -0,0 +1,197 @@
+"""
+Cache Persistente de Metadados de Logs
+======================================
+
+Guarda, por arquivo CSV, o número de registros, as colunas, o intervalo de
+tempo (timestamp mínimo/máximo), o conjunto de APs, agregados incrementais
+por coluna numérica (count, sum, sum of squares, min, max) e contagens de
+conectividade. Cada entrada é validada pelo mtime e tamanho do arquivo:
+
+- arquivo inalterado: metadados lidos do cache, sem abrir o CSV
+- arquivo que cresceu (logs são só-anexação): apenas as linhas novas, a
+  partir do último byte processado, são lidas; um hash dos últimos bytes já
+  processados detecta arquivos reescritos com tamanho maior
+- arquivo novo ou reescrito: leitura única, linha a linha
+
+Assim a listagem de logs custa O(arquivos alterados) em vez de um
+pd.read_csv por arquivo a cada requisição.
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import copy
+import csv
+import hashlib
+import json
+import os
+import threading
+
+from framework.stats import RunningStats
+
+CACHE_VERSION = 2
+CACHE_DIR = os.environ.get('FRAMEWORK_CACHE_DIR', '.framework_cache')
+AP_COLUMNS = ('ap', 'best_ap')
+CONNECTIVITY_COLUMNS = ('connected', 'mesh_connected')
+CHECK_BYTES = 256  # bytes antes do offset usados para detectar arquivos reescritos
+
+
+def _tail_digest(f, offset):
+    """Hash dos últimos bytes já processados (antes de `offset`)"""
+    start = max(0, offset - CHECK_BYTES)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+def _decoded_lines(f):
+    """Gera (linha decodificada, bytes) apenas para linhas completas"""
+    for raw in f:
+        if not raw.endswith(b'\n'):
+            break  # linha parcial (escrita em andamento): fica para a próxima leitura
+        yield raw.decode('utf-8'), len(raw)
+
+
+class LogMetadataCache:
+    """Metadados de logs CSV invalidados por mtime/tamanho"""
+
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file or os.path.join(CACHE_DIR, 'log_metadata.json')
+        self.entries = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Carrega o cache do disco (ignora cache corrompido)"""
+        try:
+            with open(self.cache_file) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        # Formato antigo ou diferente: descartar e reconstruir
+        self.entries = data.get('entries', {}) if data.get('version') == CACHE_VERSION else {}
+
+    def save(self):
+        """Grava o cache no disco se houve alterações"""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'entries': self.entries}, f)
+        os.replace(tmp_file, self.cache_file)
+        self.dirty = False
+
+    def _parse(self, path, entry):
+        """Lê o arquivo a partir de entry['offset'] e atualiza os agregados"""
+        with open(path, 'rb') as f:
+            f.seek(entry['offset'])
+            lines = _decoded_lines(f)
+            
+            if entry['offset'] == 0:
+                header = next(lines, None)
+                if header is None:
+                    return entry
+                entry['columns'] = next(csv.reader([header[0]]))
+                entry['offset'] += header[1]
+            
+            columns = entry['columns']
+            ts_index = columns.index('timestamp') if 'timestamp' in columns else None
+            ap_column = next((c for c in AP_COLUMNS if c in columns), None)
+            ap_index = columns.index(ap_column) if ap_column else None
+            conn_column = next((c for c in CONNECTIVITY_COLUMNS if c in columns), None)
+            conn_index = columns.index(conn_column) if conn_column else None
+            aps = set(entry['aps'])
+            stats = {column: RunningStats.from_dict(data) for column, data in entry['stats'].items()}
+            # Colunas textuais conhecidas não entram nos agregados numéricos
+            text_columns = {ts_index, ap_index, conn_index}
+            
+            for line, size in lines:
+                entry['offset'] += size
+                if not line.strip():
+                    continue
+                row = next(csv.reader([line]))
+                entry['records'] += 1
+                if ts_index is not None and ts_index < len(row):
+                    try:
+                        ts = float(row[ts_index])
+                    except ValueError:
+                        ts = None
+                    if ts is not None:
+                        entry['time_start'] = ts if entry['time_start'] is None else min(entry['time_start'], ts)
+                        entry['time_end'] = ts if entry['time_end'] is None else max(entry['time_end'], ts)
+                if ap_index is not None and ap_index < len(row):
+                    aps.add(row[ap_index])
+                if conn_index is not None and conn_index < len(row):
+                    entry['connectivity']['total'] += 1
+                    entry['connectivity']['connected'] += row[conn_index] == 'YES'
+                for index, value in enumerate(row[:len(columns)]):
+                    if index in text_columns or not value:
+                        continue
+                    try:
+                        number = float(value)
+                    except ValueError:
+                        continue
+                    column = columns[index]
+                    if column not in stats:
+                        stats[column] = RunningStats()
+                    stats[column].add(number)
+            
+            entry['aps'] = sorted(aps)
+            entry['stats'] = {column: acc.to_dict() for column, acc in stats.items()}
+            entry['tail_digest'] = _tail_digest(f, entry['offset'])
+        return entry
+
+    def _is_append(self, path, entry, size):
+        """Verifica se o arquivo só recebeu linhas novas desde a última leitura"""
+        if size < entry['offset']:
+            return False
+        with open(path, 'rb') as f:
+            return _tail_digest(f, entry['offset']) == entry.get('tail_digest')
+
+    def get(self, path):
+        """Retorna os metadados de um CSV, atualizando-os se necessário"""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+                return entry
+            
+            if not entry or not self._is_append(path, entry, stat.st_size):
+                # Arquivo novo ou reescrito: processar do início
+                entry = {
+                    'records': 0,
+                    'columns': [],
+                    'time_start': None,
+                    'time_end': None,
+                    'aps': [],
+                    'stats': {},
+                    'connectivity': {'connected': 0, 'total': 0},
+                    'offset': 0
+                }
+            
+            entry = self._parse(path, copy.deepcopy(entry))
+            entry['mtime'] = stat.st_mtime
+            entry['size'] = stat.st_size
+            self.entries[key] = entry
+            self.dirty = True
+            return entry
+
+    def refresh(self, paths):
+        """Metadados de vários arquivos; remove do cache os que não existem mais"""
+        results = {}
+        for path in paths:
+            try:
+                results[path] = self.get(path)
+            except (OSError, UnicodeDecodeError, csv.Error):
+                continue
+        
+        with self.lock:
+            for key in list(self.entries):
+                if not os.path.exists(key):
+                    del self.entries[key]
+                    self.dirty = True
+            self.save()
+        return results
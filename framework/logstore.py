@@ -0,0 +1,143 @@
+"""
+Formato Colunar de Logs (.npz)
+==============================
+
+Versão binária e tipada dos logs CSV, gravada ao lado do original
+(`rasp_car_scan_log.csv` -> `rasp_car_scan_log.npz`):
+
+- colunas numéricas como arrays float64/int64
+- `position` ("x,y,z") também decomposta em colunas float `x`, `y`, `z`
+  (colunas derivadas, carregadas com load_log(..., xyz=True))
+- colunas de texto (ap, connected, position, ssid...) codificadas por
+  dicionário: códigos inteiros + tabela de categorias, carregadas como
+  pd.Categorical
+
+    df = load_log('rasp_car_scan_log.csv')   # usa o .npz se estiver atualizado
+
+Os leitores preferem o .npz quando ele existe e não é mais antigo que o CSV;
+caso contrário leem o CSV normalmente. Só NumPy/pandas são necessários.
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+COLUMNAR_VERSION = 1
+COLUMNAR_EXTENSION = '.npz'
+CONVERT_CHUNK_ROWS = 200000
+POSITION_COLUMNS = ('x', 'y', 'z')
+
+
+def columnar_path(log_file):
+    """Caminho do arquivo colunar correspondente a um log CSV"""
+    return os.path.splitext(log_file)[0] + COLUMNAR_EXTENSION
+
+
+def has_columnar(log_file):
+    """O .npz existe e está atualizado em relação ao CSV?"""
+    npz_file = columnar_path(log_file)
+    if not os.path.exists(npz_file):
+        return False
+    if not os.path.exists(log_file):
+        return True
+    return os.path.getmtime(npz_file) >= os.path.getmtime(log_file)
+
+
+def split_positions(positions):
+    """Decompõe uma série de strings "x,y,z" em um array (N,3) de floats
+
+    As posições se repetem (waypoints), então cada string distinta é
+    convertida uma única vez e o resultado é expandido pelos códigos.
+    """
+    categorical = pd.Categorical(positions)
+    parts = pd.Series(categorical.categories.astype(str)).str.split(',', n=2, expand=True)
+    parts = parts.reindex(columns=range(3))
+    unique_xyz = parts.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    unique_xyz = np.vstack([unique_xyz, np.full((1, 3), np.nan)])  # código -1 = ausente
+    return unique_xyz[categorical.codes]
+
+
+def _is_text(series):
+    return not (pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series))
+
+
+def write_columnar(df, npz_file):
+    """Grava um DataFrame no formato colunar (.npz, gravação atômica)"""
+    arrays = {
+        '__version__': np.array(COLUMNAR_VERSION),
+        '__columns__': np.array(list(df.columns), dtype=str),
+    }
+    for column in df.columns:
+        series = df[column]
+        if _is_text(series):
+            categorical = pd.Categorical(series)  # valores ausentes viram código -1
+            arrays[f'{column}.codes'] = categorical.codes  # int8/int16/int32 conforme o dicionário
+            arrays[f'{column}.categories'] = np.array(categorical.categories, dtype=str)
+        else:
+            arrays[column] = series.to_numpy()
+
+    # Colunas derivadas: só carregadas quando pedidas (load_log(..., xyz=True))
+    if 'position' in df.columns and not set(POSITION_COLUMNS) & set(df.columns):
+        xyz = split_positions(df['position'])
+        for i, name in enumerate(POSITION_COLUMNS):
+            arrays[name] = xyz[:, i]
+        arrays['__derived__'] = np.array(POSITION_COLUMNS, dtype=str)
+
+    tmp_file = f'{npz_file}.{os.getpid()}.tmp'
+    with open(tmp_file, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_file, npz_file)
+    return npz_file
+
+
+def convert_csv(log_file, npz_file=None):
+    """Converte um log CSV para o formato colunar, lendo em blocos"""
+    npz_file = npz_file or columnar_path(log_file)
+    chunks = []
+    with pd.read_csv(log_file, chunksize=CONVERT_CHUNK_ROWS) as reader:
+        for chunk in reader:
+            # Texto repetido vira categoria já na leitura do bloco
+            for column in chunk.columns:
+                if _is_text(chunk[column]):
+                    chunk[column] = chunk[column].astype('category')
+            chunks.append(chunk)
+    if chunks:
+        df = pd.concat(chunks, ignore_index=True)
+    else:
+        df = pd.read_csv(log_file)
+    return write_columnar(df, npz_file)
+
+
+def read_columnar(npz_file, columns=None, xyz=False):
+    """Carrega um .npz colunar como DataFrame (texto como pd.Categorical)"""
+    with np.load(npz_file) as data:
+        names = [str(name) for name in data['__columns__']]
+        if (xyz or columns is not None) and '__derived__' in data:
+            names += [str(name) for name in data['__derived__']]
+        if columns is not None:
+            names = [name for name in names if name in columns]
+        frame = {}
+        for name in names:
+            if f'{name}.codes' in data:
+                frame[name] = pd.Categorical.from_codes(data[f'{name}.codes'], data[f'{name}.categories'])
+            else:
+                frame[name] = data[name]
+    return pd.DataFrame(frame)
+
+
+def load_log(log_file, columns=None, xyz=False):
+    """Carrega um log, preferindo o formato colunar quando atualizado
+
+    Com xyz=True, logs com a coluna `position` ganham as colunas float
+    x, y, z (lidas prontas do .npz ou decompostas uma única vez do CSV).
+    """
+    if has_columnar(log_file):
+        return read_columnar(columnar_path(log_file), columns, xyz)
+    df = pd.read_csv(log_file, usecols=columns)
+    if xyz and 'position' in df.columns and not set(POSITION_COLUMNS) & set(df.columns):
+        df[list(POSITION_COLUMNS)] = split_positions(df['position'])
+    return df
@@ -0,0 +1,134 @@
+"""
+Escrita Assíncrona de Logs
+==========================
+
+Substitui o par `writer.writerow(...)` + `csvfile.flush()` no laço de
+escaneamento: as linhas entram numa fila limitada e uma thread de fundo
+as grava em lote.
+
+    with AsyncLogWriter('scan_log.csv', fieldnames) as writer:
+        for ...:
+            writer.writerow({...})
+
+Políticas de descarga (o que ocorrer primeiro):
+- flush_rows: quantidade de linhas acumuladas no lote
+- flush_interval: segundos desde a última descarga
+
+A fila é limitada (max_queue): se o disco não acompanhar, writerow bloqueia
+em vez de acumular memória sem limite. close() (chamado ao sair do `with`,
+por exceção/KeyboardInterrupt ou no encerramento do interpretador) grava
+todas as linhas pendentes antes de fechar o arquivo. Com columnar=True, o
+CSV finalizado também é convertido para o formato colunar (.npz, ver
+framework.logstore).
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import atexit
+import csv
+import queue
+import threading
+import time
+
+_CLOSE = object()
+
+
+class AsyncLogWriter:
+    """Escritor de log CSV com fila limitada e thread de gravação em lote"""
+
+    def __init__(self, filename, fieldnames, max_queue=10000, flush_rows=500, flush_interval=1.0,
+                 columnar=False):
+        self.filename = filename
+        self.columnar = columnar
+        self.fieldnames = list(fieldnames)
+        self.flush_rows = max(1, flush_rows)
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self.error = None
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._file = self._open()
+        self._thread = threading.Thread(target=self._run, name=f'log-writer:{filename}', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # Formato do arquivo (subclasses podem trocar o formato de saída)
+    def _open(self):
+        f = open(self.filename, 'w', newline='')
+        self._writer = csv.DictWriter(f, fieldnames=self.fieldnames)
+        self._writer.writeheader()
+        return f
+
+    def _write_rows(self, rows):
+        self._writer.writerows(rows)
+
+    def writerow(self, row):
+        """Enfileira uma linha (bloqueia apenas se a fila estiver cheia)"""
+        if self._closed:
+            raise ValueError(f"Log já fechado: {self.filename}")
+        self._queue.put(row)
+
+    def writerows(self, rows):
+        for row in rows:
+            self.writerow(row)
+
+    def _drain(self, batch):
+        if not batch:
+            return
+        try:
+            self._write_rows(batch)
+            self._file.flush()
+            self.rows_written += len(batch)
+        except Exception as e:
+            self.error = e  # não derruba a simulação; reportado em close()
+        batch.clear()
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                row = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                row = None
+            if row is _CLOSE:
+                self._drain(batch)
+                return
+            if row is not None:
+                batch.append(row)
+            if len(batch) >= self.flush_rows or time.monotonic() >= deadline:
+                self._drain(batch)
+                deadline = time.monotonic() + self.flush_interval
+
+    def close(self):
+        """Grava as linhas pendentes, encerra a thread e fecha o arquivo"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        self._file.close()
+        atexit.unregister(self.close)
+        if self.error is not None:
+            raise IOError(f"Erro ao gravar {self.filename}: {self.error}")
+        if self.columnar:
+            from framework.logstore import convert_csv
+            convert_csv(self.filename)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return False
+        try:
+            self.close()
+        except Exception as e:
+            # Saída por exceção/interrupção: um erro de gravação não pode substituir a causa original
+            print(f"⚠️  Erro ao fechar {self.filename}: {e}")
+        return False
@@ -0,0 +1,70 @@
+"""
+Parâmetros de Execução dos Cenários
+===================================
+
+Os cenários leem parâmetros opcionais (expoente de propagação, alcance dos
+APs, plano de canais, waypoints, número de scans, seed...) da variável de
+ambiente FRAMEWORK_PARAMS, um objeto JSON definido pelo run_scenario.py
+(por exemplo, em uma varredura de parâmetros). Sem a variável, cada cenário
+usa seus valores padrão.
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import json
+import os
+
+PARAMS_ENV = 'FRAMEWORK_PARAMS'
+
+
+def load_params():
+    """Retorna o dicionário de parâmetros da execução atual"""
+    raw = os.environ.get(PARAMS_ENV)
+    if not raw:
+        return {}
+    params = json.loads(raw)
+    if not isinstance(params, dict):
+        raise ValueError(f"{PARAMS_ENV} deve conter um objeto JSON")
+    return params
+
+
+def get_param(name, default=None):
+    """Retorna um parâmetro da execução atual ou o valor padrão"""
+    return load_params().get(name, default)
+
+
+DEFAULT_CHANNELS = ('1', '6', '11')
+# Canais aceitos: 1-14 (2.4 GHz) e os canais de 20 MHz de 5 GHz
+VALID_CHANNELS = frozenset(list(range(1, 15)) + list(range(36, 65, 4)) +
+                           list(range(100, 145, 4)) + list(range(149, 178, 4)))
+
+
+def parse_channels(value, count=len(DEFAULT_CHANNELS)):
+    """Normaliza um plano de canais (lista ou texto '1,6,11') em lista de str
+
+    Levanta ValueError se o tipo, a quantidade ou algum canal for inválido.
+    """
+    if isinstance(value, str):
+        items = [item.strip() for item in value.split(',')]
+    elif isinstance(value, (list, tuple)):
+        items = list(value)
+    else:
+        raise ValueError(f"plano de canais inválido: {value!r} (use uma lista ou um texto como '1,6,11')")
+    if len(items) != count:
+        raise ValueError(f"plano de canais {value!r} tem {len(items)} canais, o cenário precisa de {count}")
+    channels = []
+    for item in items:
+        try:
+            channel = int(item)
+        except (TypeError, ValueError):
+            channel = None
+        if isinstance(item, bool) or channel is None or str(channel) != str(item).strip() or channel not in VALID_CHANNELS:
+            raise ValueError(f"canal inválido {item!r} no plano {value!r} (use 1-14 ou um canal de 5 GHz)")
+        channels.append(str(channel))
+    return channels
+
+
+def get_channels(default=DEFAULT_CHANNELS, count=len(DEFAULT_CHANNELS)):
+    """Plano de canais da execução atual (parâmetro 'channels'), validado"""
+    return parse_channels(get_param('channels', list(default)), count)
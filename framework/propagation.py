@@ -0,0 +1,151 @@
+"""
+Modelo de Propagação Vetorizado
+===============================
+
+Calcula distâncias e RSSI para todas as combinações estação x AP de uma vez,
+usando arrays NumPy. Os termos constantes do FSPL (frequência e 4*pi/c) são
+pré-calculados uma única vez na criação do modelo.
+
+Com exp=2.0 (padrão) o resultado é idêntico à fórmula usada originalmente
+nos cenários:
+
+    rssi = tx_power - (20*log10(d) + 20*log10(f) + 20*log10(4*pi/c)) - perdas
+
+Abaixo de 1 m (distância de referência) vale sempre a perda de espaço livre
+(expoente 2); o expoente configurado só se aplica a log10(d / 1 m). O RSSI
+nunca passa de tx_power - perdas.
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import math
+
+import numpy as np
+
+SPEED_OF_LIGHT = 3e8   # velocidade da luz (m/s)
+DEFAULT_FREQ = 2.4e9   # 2.4 GHz
+MIN_DISTANCE = 0.01    # evitar log(0)
+REFERENCE_DISTANCE = 1.0  # distância de referência do modelo log-distância (m)
+
+
+def channel_to_freq(channel):
+    """Converte canal 2.4 GHz (1-14) ou 5 GHz para frequência em Hz"""
+    channel = int(channel)
+    if channel == 14:
+        return 2.484e9
+    if 1 <= channel <= 13:
+        return (2407 + 5 * channel) * 1e6
+    return (5000 + 5 * channel) * 1e6
+
+
+def node_positions(nodes, default=(0.0, 0.0, 0.0)):
+    """Retorna array (N, 3) com as posições dos nós Mininet-WiFi"""
+    positions = np.empty((len(nodes), 3), dtype=float)
+    for i, node in enumerate(nodes):
+        try:
+            position = node.position
+            positions[i] = (float(position[0]), float(position[1]), float(position[2]))
+        except Exception:
+            try:
+                positions[i] = (float(node.params.get('x', default[0])),
+                                float(node.params.get('y', default[1])),
+                                float(node.params.get('z', default[2])))
+            except Exception:
+                positions[i] = default
+    return positions
+
+
+def node_ranges(nodes, default=np.inf):
+    """Retorna array (N,) com o alcance (range) configurado de cada nó"""
+    ranges = np.full(len(nodes), default, dtype=float)
+    for i, node in enumerate(nodes):
+        value = (getattr(node, 'params', None) or {}).get('range')
+        if isinstance(value, (list, tuple)):
+            value = value[0] if value else None
+        try:
+            ranges[i] = float(value)
+        except (TypeError, ValueError):
+            pass
+    return ranges
+
+
+class PropagationModel:
+    """Modelo log-distância com referência FSPL a 1 m, vetorizado por NumPy"""
+
+    def __init__(self, tx_power=20, freq=DEFAULT_FREQ, additional_losses=10,
+                 exp=2.0, min_distance=MIN_DISTANCE, shadowing=0.0, seed=None):
+        self.exp = float(exp)
+        self.min_distance = min_distance
+        # Sombreamento log-normal opcional (desvio padrão em dB); o seed só tem efeito com shadowing > 0
+        self.shadowing = float(shadowing)
+        self.rng = np.random.default_rng(seed)
+        # tx_power e freq podem ser escalares ou um valor por AP
+        self.tx_power = np.asarray(tx_power, dtype=float)
+        self.freq = np.asarray(freq, dtype=float)
+        self.additional_losses = np.asarray(additional_losses, dtype=float)
+        # Termo constante do FSPL, calculado uma única vez
+        self.fspl_const = 20 * np.log10(self.freq) + 20 * math.log10(4 * math.pi / SPEED_OF_LIGHT)
+        self.offset = self.tx_power - self.fspl_const - self.additional_losses
+        # Teto físico do RSSI: sem perda de percurso, só as perdas adicionais
+        self.ceiling = np.broadcast_to(self.tx_power - self.additional_losses, np.shape(self.offset)).copy()
+
+    def distances(self, sta_positions, ap_positions):
+        """Matriz (S, A) de distâncias euclidianas, limitada a min_distance"""
+        sta = np.asarray(sta_positions, dtype=float).reshape(-1, 3)
+        aps = np.asarray(ap_positions, dtype=float).reshape(-1, 3)
+        diff = sta[:, np.newaxis, :] - aps[np.newaxis, :, :]
+        dist = np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+        return np.maximum(dist, self.min_distance)
+
+    def rssi_from_distance(self, distances, ap_index=None):
+        """Converte distâncias (qualquer formato) em RSSI (dBm)
+
+        ap_index: índices dos APs das colunas de `distances` quando elas são
+        um subconjunto dos APs (potência/frequência por AP).
+        """
+        offset, ceiling = self.offset, self.ceiling
+        if ap_index is not None and np.ndim(offset):
+            offset, ceiling = offset[ap_index], ceiling[ap_index]
+        log_d = np.log10(np.asarray(distances, dtype=float) / REFERENCE_DISTANCE)
+        # Campo próximo (d < 1 m): espaço livre, para o expoente não virar ganho
+        exponent = np.where(log_d < 0, 2.0, self.exp)
+        rssi = offset - 10 * exponent * log_d
+        if self.shadowing > 0:
+            rssi = rssi + self.rng.normal(0.0, self.shadowing, np.shape(rssi))
+        return np.minimum(rssi, ceiling)
+
+    def rssi(self, sta_positions, ap_positions):
+        """Matriz (S, A) de RSSI (dBm) para todas as estações e APs"""
+        return self.rssi_from_distance(self.distances(sta_positions, ap_positions))
+
+    def best_ap(self, sta_positions, ap_positions):
+        """Retorna (índice do melhor AP, RSSI, distância) por estação"""
+        dist = self.distances(sta_positions, ap_positions)
+        rssi = self.rssi_from_distance(dist)
+        idx = np.argmax(rssi, axis=1)
+        rows = np.arange(rssi.shape[0])
+        return idx, rssi[rows, idx], dist[rows, idx]
+
+
+def check_path_loss(exps=(1.6, 2.0, 2.7, 3.5, 4.5), distances=None, **model_kwargs):
+    """Verifica o modelo sem sombreamento: o RSSI nunca aumenta com o expoente
+    nem passa de tx_power - perdas. Levanta AssertionError se falhar."""
+    if distances is None:
+        distances = np.concatenate(([MIN_DISTANCE], np.logspace(-2, 3, 200)))
+    model_kwargs['shadowing'] = 0.0
+    previous = None
+    for exp in sorted(exps):
+        model = PropagationModel(exp=exp, **model_kwargs)
+        rssi = model.rssi_from_distance(distances)
+        if np.any(rssi > model.ceiling + 1e-9):
+            raise AssertionError(f"RSSI acima de tx_power - perdas com exp={exp}: {rssi.max():.2f} dBm")
+        if previous is not None and np.any(rssi > previous + 1e-9):
+            raise AssertionError(f"RSSI aumentou ao subir o expoente para {exp}")
+        previous = rssi
+    return True
+
+
+if __name__ == '__main__':
+    check_path_loss()
+    print("✅ Modelo de propagação consistente")
@@ -0,0 +1,345 @@
+"""
+Aplicação de Políticas QoS (Token Bucket / HTB)
+===============================================
+
+Compila as políticas do controlador SDN ({'priority': 'high',
+'bandwidth': '10Mbps'}) em limites de taxa e filas de prioridade:
+
+- Mininet: HTB na interface do AP (downlink), uma classe por cliente com
+  rate = banda da política e prioridade pela classe de QoS, filtro u32
+  pelo IP do cliente; TBF na interface da estação (uplink). Classes
+  prioritárias (ou com 'latency': 'low') emprestam banda ociosa até a
+  capacidade do enlace (ceil); 'low' fica limitada à sua banda.
+  HTBShaper mantém um classid estável por cliente e altera a árvore com
+  `tc class add/change/del`, então os contadores de `tc -s class show`
+  sobrevivem a handoffs de outros clientes
+- analítico: o mesmo plano simulado no enlace do AP com token buckets
+  (rate e ceil) por cliente e escalonador de prioridade estrita (eventos
+  discretos), com vazão, descartes e latência por classe de QoS
+
+    shaper = HTBShaper('ap1-wlan1', capacity=54)
+    plan = compile_plan(policies, {'sta1': '10.0.0.1'}, capacity=54)
+    for command in shaper.setup() + shaper.update(plan):
+        ap.cmd(command)
+    result = simulate_link(plan, {'sta1': 10, 'sta3': 54}, capacity=54)
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import itertools
+import re
+from collections import deque
+
+import numpy as np
+
+from framework.stats import ColumnSummary
+
+DEFAULT_RATE = 5.0          # Mbps por cliente sem banda na política
+RATE_UNITS = {'k': 1e-3, 'm': 1.0, 'g': 1e3}
+PACKET_SIZE = 1500          # bytes
+QUEUE_LIMIT = 1000          # pacotes por fila (txqueuelen padrão)
+BURST_PACKETS = 4           # rajada mínima do token bucket, em pacotes
+HZ = 1000                   # rajada padrão do HTB: MTU + rate/HZ
+
+# Classe de QoS -> prioridade HTB (0 = maior)
+PRIORITIES = {'high': 0, 'iot': 1, 'normal': 2, 'low': 3}
+DEFAULT_PRIORITY = 7        # tráfego sem política (classe padrão 1:99)
+DEFAULT_CLASSID = '1:99'
+UNCLASSIFIED = 'unclassified'
+BORROWING_CLASSES = ('high', 'iot', 'normal')  # ceil = capacidade do enlace
+
+
+def parse_rate(text, default=None):
+    """Taxa em Mbps a partir de '10Mbps', '512Kbps', '1Gbps'"""
+    match = re.fullmatch(r'\s*([\d.]+)\s*([kmg])?bps\s*', str(text or ''), re.IGNORECASE)
+    if not match:
+        return default
+    return float(match.group(1)) * RATE_UNITS[(match.group(2) or 'm').lower()]
+
+
+def policy_bandwidth(policy, default=DEFAULT_RATE):
+    """Banda da política QoS em Mbps (ausente, inválida ou zero: `default`)"""
+    rate = parse_rate((policy or {}).get('bandwidth'))
+    return rate if rate and rate > 0 else default
+
+
+def bucket_burst(rate, packet_size=PACKET_SIZE):
+    """Rajada (bytes) do token bucket de uma taxa em Mbps: MTU + rate/HZ, no mínimo BURST_PACKETS pacotes"""
+    return int(max(BURST_PACKETS * packet_size, packet_size + rate * 1e6 / 8 / HZ))
+
+
+def compile_plan(policies, addresses, capacity, packet_size=PACKET_SIZE):
+    """Plano de classes de um AP: uma entrada por cliente com política
+
+    policies: {cliente: política}; addresses: {cliente: IP}.
+    Entradas ordenadas por prioridade; o classid é dado pelo HTBShaper.
+    """
+    plan = []
+    for client, policy in policies.items():
+        policy = policy or {}
+        qos_class = policy.get('priority', 'normal')
+        rate = min(policy_bandwidth(policy), capacity)
+        borrows = qos_class in BORROWING_CLASSES or policy.get('latency') == 'low'
+        ceil = capacity if borrows else rate
+        plan.append({
+            'client': client,
+            'qos_class': qos_class,
+            'prio': PRIORITIES.get(qos_class, PRIORITIES['normal']),
+            'rate': rate,
+            'ceil': ceil,
+            'burst': bucket_burst(rate, packet_size),
+            'cburst': bucket_burst(ceil, packet_size),
+            'ip': addresses.get(client)
+        })
+    plan.sort(key=lambda entry: (entry['prio'], entry['client']))
+    return plan
+
+
+class HTBShaper:
+    """Árvore HTB de uma interface, atualizada de forma incremental
+
+    Cada cliente recebe um classid (e prioridade de filtro) estável
+    enquanto estiver no plano; update() devolve só os comandos tc da
+    diferença. `serial` identifica cada criação de classe, para que
+    contadores de classes recriadas não sejam subtraídos dos antigos.
+    """
+
+    def __init__(self, intf, capacity):
+        self.intf = intf
+        self.capacity = capacity
+        self.entries = {}  # cliente -> entrada instalada (com classid e serial)
+        self.generation = 0
+        self._minors = itertools.count(10)
+        self._serials = itertools.count(1)
+
+    def setup(self):
+        """Comandos que criam a raiz HTB e a classe padrão"""
+        intf, capacity = self.intf, self.capacity
+        return [
+            f'tc qdisc del dev {intf} root 2>/dev/null',
+            f'tc qdisc add dev {intf} root handle 1: htb default 99',
+            f'tc class add dev {intf} parent 1: classid 1:1 htb rate {capacity:g}mbit ceil {capacity:g}mbit',
+            self._default_class('add')
+        ]
+
+    def _default_class(self, verb):
+        # Tráfego sem política: o que sobra do enlace, emprestando até a capacidade
+        reserved = sum(entry['rate'] for entry in self.entries.values())
+        return (f'tc class {verb} dev {self.intf} parent 1:1 classid {DEFAULT_CLASSID} htb '
+                f'rate {max(self.capacity - reserved, 0.1):g}mbit ceil {self.capacity:g}mbit prio {DEFAULT_PRIORITY}')
+
+    def _class(self, verb, entry):
+        return (f"tc class {verb} dev {self.intf} parent 1:1 classid {entry['classid']} htb "
+                f"rate {entry['rate']:g}mbit ceil {entry['ceil']:g}mbit "
+                f"burst {entry['burst']}b cburst {entry['cburst']}b prio {entry['prio']}")
+
+    def _filter_add(self, entry):
+        return (f"tc filter add dev {self.intf} parent 1: protocol ip prio {entry['pref']} "
+                f"u32 match ip dst {entry['ip']}/32 flowid {entry['classid']}")
+
+    def _filter_del(self, entry):
+        return f"tc filter del dev {self.intf} parent 1: protocol ip prio {entry['pref']}"
+
+    def update(self, plan):
+        """Aplica um novo plano; retorna os comandos tc (vazio se nada mudou)"""
+        commands = []
+        wanted = {entry['client']: entry for entry in plan}
+        for client in [client for client in self.entries if client not in wanted]:
+            old = self.entries.pop(client)
+            if old['ip']:
+                commands.append(self._filter_del(old))
+            commands.append(f"tc class del dev {self.intf} classid {old['classid']}")
+        for client, entry in wanted.items():
+            old = self.entries.get(client)
+            if old is None:
+                minor = next(self._minors)
+                entry = dict(entry, classid=f'1:{minor}', pref=minor, serial=next(self._serials))
+                commands.append(self._class('add', entry))
+                if entry['ip']:
+                    commands.append(self._filter_add(entry))
+            else:
+                entry = dict(entry, classid=old['classid'], pref=old['pref'], serial=old['serial'])
+                if any(entry[key] != old[key] for key in ('rate', 'ceil', 'burst', 'cburst', 'prio')):
+                    commands.append(self._class('change', entry))
+                if entry['ip'] != old['ip']:
+                    if old['ip']:
+                        commands.append(self._filter_del(old))
+                    if entry['ip']:
+                        commands.append(self._filter_add(entry))
+            self.entries[client] = entry
+        if commands:
+            commands.append(self._default_class('change'))
+            self.generation += 1
+        return commands
+
+    def plan(self):
+        """Entradas instaladas, em ordem de prioridade"""
+        return sorted(self.entries.values(), key=lambda entry: (entry['prio'], entry['client']))
+
+    def counters(self, output):
+        """{(classid, serial): (classe, bytes)} a partir de `tc -s class show`"""
+        stats = parse_tc_class_stats(output)
+        classes = {entry['classid']: (entry['serial'], entry['qos_class']) for entry in self.entries.values()}
+        classes[DEFAULT_CLASSID] = (0, UNCLASSIFIED)
+        return {(classid, serial): (qos_class, stats[classid]['bytes'])
+                for classid, (serial, qos_class) in classes.items() if classid in stats}
+
+
+def tbf_commands(intf, rate, burst):
+    """Comandos tc que limitam o uplink de uma estação (TBF)"""
+    return [
+        f'tc qdisc del dev {intf} root 2>/dev/null',
+        f'tc qdisc add dev {intf} root tbf rate {rate:g}mbit burst {burst}b latency 50ms'
+    ]
+
+
+def parse_tc_class_stats(output):
+    """{classid: {'bytes', 'packets', 'dropped'}} a partir de `tc -s class show`"""
+    stats = {}
+    classid = None
+    for line in output.splitlines():
+        header = re.match(r'\s*class \w+ (\d+:\d+)', line)
+        if header:
+            classid = header.group(1)
+            continue
+        sent = re.match(r'\s*Sent (\d+) bytes (\d+) pkt \(dropped (\d+)', line)
+        if sent and classid is not None:
+            stats[classid] = {'bytes': int(sent.group(1)), 'packets': int(sent.group(2)),
+                              'dropped': int(sent.group(3))}
+            classid = None
+    return stats
+
+
+class TokenBucket:
+    """Token bucket em bytes: `rate` Mbps, rajada de `burst` bytes"""
+
+    def __init__(self, rate, burst, now=0.0):
+        if rate <= 0:
+            raise ValueError(f"Taxa inválida para o token bucket: {rate}")
+        self.rate = rate * 1e6 / 8  # bytes/s
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = now
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def ready_at(self, size, now):
+        """Instante em que haverá tokens para `size` bytes"""
+        self._refill(now)
+        return now if self.tokens >= size else now + (size - self.tokens) / self.rate
+
+    def consume(self, size, now):
+        # Pode ficar negativo (tráfego emprestado), limitado a uma rajada
+        self._refill(now)
+        self.tokens = max(self.tokens - size, -self.burst)
+
+
+def _arrivals(offered, duration, packet_size, rng):
+    # Chegadas de Poisson por cliente, intercaladas em ordem de tempo
+    times, owners = [], []
+    clients = list(offered)
+    for i, client in enumerate(clients):
+        rate = offered[client] * 1e6 / 8 / packet_size  # pacotes/s
+        if rate <= 0:
+            continue
+        gaps = rng.exponential(1 / rate, size=int(rate * duration * 1.2) + 16)
+        arrivals = np.cumsum(gaps)
+        arrivals = arrivals[arrivals < duration]
+        times.append(arrivals)
+        owners.append(np.full(len(arrivals), i))
+    if not times:
+        return clients, np.empty(0), np.empty(0, dtype=int)
+    times, owners = np.concatenate(times), np.concatenate(owners)
+    order = np.argsort(times, kind='stable')
+    return clients, times[order], owners[order]
+
+
+def simulate_link(plan, offered, capacity, duration=5.0, enforce=True,
+                  packet_size=PACKET_SIZE, queue_limit=QUEUE_LIMIT, seed=None):
+    """Simula o enlace de um AP e retorna métricas por classe de QoS
+
+    offered: {cliente: Mbps oferecidos}. enforce=True aplica o plano
+    como o HTB: cada cliente tem buckets de rate e ceil; filas dentro do
+    rate são servidas antes das que emprestam (só ceil), e em cada nível
+    por prioridade estrita. enforce=False é a referência sem QoS (uma
+    fila FIFO única).
+    Retorna {classe: {'offered_mbps', 'throughput_mbps', 'dropped',
+    'latency_ms': {'count', 'mean', ..., 'p99'}}}.
+    """
+    by_client = {entry['client']: entry for entry in plan}
+    clients, times, owners = _arrivals(offered, duration, packet_size, np.random.default_rng(seed))
+    classes = [by_client[c]['qos_class'] if c in by_client else UNCLASSIFIED for c in clients]
+    link_rate = capacity * 1e6 / 8  # bytes/s
+    tx_time = packet_size / link_rate
+
+    if enforce:
+        queue_of = list(range(len(clients)))
+        prio = [by_client[c]['prio'] if c in by_client else DEFAULT_PRIORITY for c in clients]
+        buckets = [TokenBucket(by_client[c]['rate'], by_client[c]['burst']) if c in by_client else None
+                   for c in clients]
+        ceil_buckets = [TokenBucket(by_client[c]['ceil'], by_client[c]['cburst']) if c in by_client else None
+                        for c in clients]
+    else:
+        queue_of = [0] * len(clients)
+        prio, buckets, ceil_buckets = [0], [None], [None]
+    queues = [deque() for _ in range(len(buckets))]
+
+    offered_bytes = dict.fromkeys(dict.fromkeys(classes), 0)
+    sent_bytes = dict.fromkeys(offered_bytes, 0)
+    dropped = dict.fromkeys(offered_bytes, 0)
+    latencies = {qos_class: [] for qos_class in offered_bytes}
+
+    now, i, count = 0.0, 0, len(times)
+    while now < duration:
+        while i < count and times[i] <= now:
+            owner = owners[i]
+            offered_bytes[classes[owner]] += packet_size
+            queue = queues[queue_of[owner]]
+            if len(queue) >= queue_limit:
+                dropped[classes[owner]] += 1
+            else:
+                queue.append((times[i], owner))
+            i += 1
+        # Filas dentro do rate antes das que emprestam; depois prioridade e pacote mais antigo
+        chosen, best, wake = None, None, times[i] if i < count else None
+        for q, queue in enumerate(queues):
+            if not queue:
+                continue
+            if ceil_buckets[q] is not None:
+                ready = ceil_buckets[q].ready_at(packet_size, now)
+                if ready > now:
+                    wake = ready if wake is None else min(wake, ready)
+                    continue
+            borrowing = buckets[q] is not None and buckets[q].ready_at(packet_size, now) > now
+            rank = (borrowing, prio[q], queue[0][0])
+            if best is None or rank < best:
+                chosen, best = q, rank
+        if chosen is None:
+            if wake is None:
+                break
+            now = wake
+            continue
+        arrival, owner = queues[chosen].popleft()
+        if buckets[chosen] is not None:
+            buckets[chosen].consume(packet_size, now)
+            ceil_buckets[chosen].consume(packet_size, now)
+        now += tx_time
+        if now <= duration:
+            sent_bytes[classes[owner]] += packet_size
+            latencies[classes[owner]].append((now - arrival) * 1000)
+
+    result = {}
+    for qos_class in offered_bytes:
+        latency = ColumnSummary()
+        latency.add_many(latencies[qos_class])
+        result[qos_class] = {
+            'offered_mbps': offered_bytes[qos_class] * 8 / duration / 1e6,
+            'throughput_mbps': sent_bytes[qos_class] * 8 / duration / 1e6,
+            'dropped': dropped[qos_class],
+            'latency_ms': latency.describe()
+        }
+    return result
@@ -0,0 +1,198 @@
+"""
+Índice Espacial de Access Points
+================================
+
+Grade uniforme (hash de células 2D) sobre as posições dos APs para que a
+escolha do melhor AP e as listas de vizinhos não avaliem todos os APs:
+
+- cada AP fica na célula de sua posição (x, y); com células do tamanho do
+  maior alcance, os APs que alcançam uma estação estão nas 3x3 células ao
+  redor dela (APs sem alcance definido são candidatos em toda a área)
+- candidatos são podados pelo alcance de cada AP (`range` do
+  addAccessPoint) antes de calcular o RSSI
+- estações na mesma célula compartilham a lista de candidatos e são
+  avaliadas juntas em uma única operação matricial
+- APs móveis (ex.: router3 do mastering_scenario_1) são atualizados com
+  move(), que só troca o AP de célula quando ela muda: O(1)
+
+    index = APIndex.from_nodes(ap_list)
+    index.move(2, (x, y, z))                       # AP móvel
+    idx, rssi, dist = index.best_ap(node_positions(stations), propagation)
+    nearby = index.neighbors((x, y, z), radius=30)
+
+O resultado é o mesmo de PropagationModel.best_ap quando o melhor AP está
+dentro do alcance; estações fora do alcance de todos os APs são avaliadas
+contra todos (fallback=True, registradas como desconectadas pelos cenários)
+ou recebem índice -1.
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import math
+
+import numpy as np
+
+from framework.propagation import node_positions, node_ranges
+
+DEFAULT_CELL_SIZE = 50.0  # metros, quando nenhum AP tem alcance finito
+
+
+class APIndex:
+    """Grade uniforme de APs com atualização incremental de posição"""
+
+    def __init__(self, positions, ranges=None, names=None, cell_size=None):
+        self.positions = np.array(positions, dtype=float).reshape(-1, 3)
+        count = len(self.positions)
+        self.ranges = np.full(count, np.inf) if ranges is None else np.array(ranges, dtype=float).reshape(count)
+        self.names = list(names) if names is not None else [str(i) for i in range(count)]
+        self.index_of = {name: i for i, name in enumerate(self.names)}  # nome -> índice
+        if cell_size is None:
+            finite = self.ranges[np.isfinite(self.ranges)]
+            cell_size = float(finite.max()) if finite.size else DEFAULT_CELL_SIZE
+        if cell_size <= 0:
+            raise ValueError(f"Tamanho de célula inválido: {cell_size}")
+        self.cell_size = float(cell_size)
+        self._update_reach()
+        self.cells = {}
+        self._cell_of = []
+        self._candidates = {}  # célula -> índices dos APs nas células vizinhas
+        for i in range(count):
+            cell = self._cell(self.positions[i])
+            self.cells.setdefault(cell, []).append(i)
+            self._cell_of.append(cell)
+
+    @classmethod
+    def from_nodes(cls, nodes, cell_size=None):
+        """Índice dos APs Mininet-WiFi (posição e `range` de cada nó)"""
+        return cls(node_positions(nodes), node_ranges(nodes), [node.name for node in nodes], cell_size)
+
+    def _update_reach(self):
+        # Anéis de células cobertos pelo maior alcance finito; APs sem alcance são sempre candidatos
+        finite = self.ranges[np.isfinite(self.ranges)]
+        self.rings = max(1, math.ceil(finite.max() / self.cell_size)) if finite.size else 1
+        self.unbounded = np.flatnonzero(~np.isfinite(self.ranges))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _cell(self, position):
+        return (math.floor(position[0] / self.cell_size), math.floor(position[1] / self.cell_size))
+
+    # Atualização
+    def add(self, position, ap_range=np.inf, name=None):
+        """Insere um AP e retorna seu índice"""
+        i = len(self.positions)
+        self.positions = np.vstack([self.positions, np.asarray(position, dtype=float).reshape(1, 3)])
+        self.ranges = np.append(self.ranges, float(ap_range))
+        self.names.append(name if name is not None else str(i))
+        self.index_of[self.names[i]] = i
+        rings = self.rings
+        self._update_reach()
+        cell = self._cell(self.positions[i])
+        self.cells.setdefault(cell, []).append(i)
+        self._cell_of.append(cell)
+        if rings != self.rings or not np.isfinite(ap_range):
+            self._candidates.clear()
+        else:
+            self._invalidate(cell)
+        return i
+
+    def move(self, i, position):
+        """Atualiza a posição de um AP (troca de célula só quando necessário)"""
+        self.positions[i] = np.asarray(position, dtype=float).reshape(3)
+        old, new = self._cell_of[i], self._cell(self.positions[i])
+        if old == new:
+            return
+        members = self.cells[old]
+        members.remove(i)
+        if not members:
+            del self.cells[old]
+        self.cells.setdefault(new, []).append(i)
+        self._cell_of[i] = new
+        self._invalidate(old)
+        self._invalidate(new)
+
+    def _invalidate(self, cell):
+        cx, cy = cell
+        for dx in range(-self.rings, self.rings + 1):
+            for dy in range(-self.rings, self.rings + 1):
+                self._candidates.pop((cx + dx, cy + dy), None)
+
+    # Consultas
+    def _ring(self, cell, rings):
+        cx, cy = cell
+        found = []
+        for dx in range(-rings, rings + 1):
+            for dy in range(-rings, rings + 1):
+                found.extend(self.cells.get((cx + dx, cy + dy), ()))
+        return found
+
+    def candidates(self, cell):
+        """Índices dos APs que podem alcançar estações na célula"""
+        cached = self._candidates.get(cell)
+        if cached is None:
+            found = set(self._ring(cell, self.rings)) | set(self.unbounded.tolist())
+            cached = np.array(sorted(found), dtype=np.intp)
+            self._candidates[cell] = cached
+        return cached
+
+    def neighbors(self, position, radius=None):
+        """APs a até `radius` metros (padrão: dentro do alcance de cada AP), do mais próximo ao mais distante
+
+        Retorna (índices, distâncias).
+        """
+        position = np.asarray(position, dtype=float).reshape(3)
+        cell = self._cell(position)
+        if radius is None:
+            found = self.candidates(cell)
+        else:
+            found = np.array(self._ring(cell, max(1, math.ceil(radius / self.cell_size))), dtype=np.intp)
+        if not found.size:
+            return found, np.empty(0)
+        dist = np.linalg.norm(self.positions[found] - position, axis=1)
+        keep = dist <= (self.ranges[found] if radius is None else radius)
+        found, dist = found[keep], dist[keep]
+        order = np.argsort(dist, kind='stable')
+        return found[order], dist[order]
+
+    def best_ap(self, sta_positions, propagation, fallback=True):
+        """(índice do melhor AP, RSSI, distância) por estação, avaliando só os APs ao alcance
+
+        Estações sem AP ao alcance: avaliadas contra todos os APs com
+        fallback=True, senão índice -1, RSSI -inf e distância inf.
+        """
+        sta = np.asarray(sta_positions, dtype=float).reshape(-1, 3)
+        count = len(sta)
+        idx = np.full(count, -1, dtype=np.intp)
+        best_rssi = np.full(count, -np.inf)
+        best_dist = np.full(count, np.inf)
+        if not count or not len(self.positions):
+            return idx, best_rssi, best_dist
+
+        # Estações agrupadas por célula: um cálculo matricial por célula ocupada
+        cells = np.floor(sta[:, :2] / self.cell_size).astype(np.int64)
+        unique_cells, inverse = np.unique(cells, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.searchsorted(inverse[order], np.arange(len(unique_cells) + 1))
+        for c, cell in enumerate(unique_cells):
+            rows = order[bounds[c]:bounds[c + 1]]
+            found = self.candidates((int(cell[0]), int(cell[1])))
+            if not found.size:
+                continue
+            dist = propagation.distances(sta[rows], self.positions[found])
+            rssi = propagation.rssi_from_distance(dist, ap_index=found)
+            rssi = np.where(dist <= self.ranges[found], rssi, -np.inf)
+            column = np.argmax(rssi, axis=1)
+            picked = np.arange(len(rows))
+            reachable = np.isfinite(rssi[picked, column])
+            rows, column, picked = rows[reachable], column[reachable], picked[reachable]
+            idx[rows] = found[column]
+            best_rssi[rows] = rssi[picked, column]
+            best_dist[rows] = dist[picked, column]
+
+        missing = np.flatnonzero(idx < 0)
+        if fallback and missing.size:
+            idx[missing], best_rssi[missing], best_dist[missing] = propagation.best_ap(sta[missing], self.positions)
+        return idx, best_rssi, best_dist
@@ -0,0 +1,285 @@
+"""
+Acumuladores Estatísticos Incrementais
+======================================
+
+Agregados de passagem única e mescláveis (count, sum, sum of squares, min,
+max), usados para manter estatísticas globais sem guardar os valores.
+
+- RunningStats: contagem, soma, soma dos quadrados, mínimo e máximo
+- QuantileSketch: quantis aproximados com memória limitada (centróides)
+- ColumnSummary: os dois juntos, alimentados por blocos (arrays NumPy)
+- welch_t_test: teste t de Welch a partir de dois RunningStats (sem SciPy)
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import math
+
+import numpy as np
+
+QUANTILE_COMPRESSION = 200
+
+
+class RunningStats:
+    """Agregado incremental e mesclável de uma série numérica"""
+
+    __slots__ = ('count', 'total', 'total_sq', 'minimum', 'maximum')
+
+    def __init__(self, count=0, total=0.0, total_sq=0.0, minimum=None, maximum=None):
+        self.count = count
+        self.total = total
+        self.total_sq = total_sq
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def add(self, value):
+        """Inclui um valor"""
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def add_many(self, values):
+        """Inclui um bloco de valores (array NumPy, NaN ignorado)"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.merge(RunningStats(int(values.size), float(values.sum()), float(np.dot(values, values)),
+                                    float(values.min()), float(values.max())))
+
+    def merge(self, other):
+        """Mescla outro agregado neste (O(1))"""
+        if other.count == 0:
+            return self
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    @property
+    def variance(self):
+        """Variância amostral (n-1), como pandas.Series.std"""
+        if self.count < 2:
+            return None
+        return max(0.0, (self.total_sq - self.total * self.total / self.count) / (self.count - 1))
+
+    @property
+    def std(self):
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'sum_sq': self.total_sq,
+            'min': self.minimum,
+            'max': self.maximum
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['count'], data['sum'], data['sum_sq'], data['min'], data['max'])
+
+
+class QuantileSketch:
+    """Quantis aproximados e mescláveis com memória limitada
+
+    Os valores são resumidos em centróides (média, peso) no estilo
+    t-digest: centróides pequenos nas caudas e grandes no centro, no máximo
+    ~compression centróides. Mesclar dois resumos é concatenar e comprimir.
+    """
+
+    def __init__(self, compression=QUANTILE_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.minimum = None
+        self.maximum = None
+        self._buffer = []
+
+    @property
+    def count(self):
+        self._flush()
+        return int(self.weights.sum())
+
+    def add(self, value):
+        """Inclui um valor (comprimido em lote)"""
+        self._buffer.append(value)
+        if len(self._buffer) >= 10 * self.compression:
+            self._flush()
+
+    def add_many(self, values):
+        """Inclui um bloco de valores (array NumPy, NaN ignorado)"""
+        self._flush()
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size:
+            self._compress(np.concatenate([self.means, values]),
+                           np.concatenate([self.weights, np.ones(values.size)]),
+                           values.min(), values.max())
+
+    def merge(self, other):
+        """Mescla outro resumo neste"""
+        self._flush()
+        other._flush()
+        if other.weights.size:
+            self._compress(np.concatenate([self.means, other.means]),
+                           np.concatenate([self.weights, other.weights]),
+                           other.minimum, other.maximum)
+        return self
+
+    def _flush(self):
+        if self._buffer:
+            buffer, self._buffer = self._buffer, []
+            self.add_many(buffer)
+
+    def _compress(self, means, weights, minimum, maximum):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        # Escala k1 do t-digest: cada inteiro de k agrupa um centróide
+        k = np.floor(self.compression * (np.arcsin(2 * q - 1) / np.pi + 0.5))
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+        self.minimum = float(minimum) if self.minimum is None else min(self.minimum, float(minimum))
+        self.maximum = float(maximum) if self.maximum is None else max(self.maximum, float(maximum))
+
+    def quantile(self, q):
+        """Quantil aproximado (0 <= q <= 1), interpolado entre centróides"""
+        self._flush()
+        if not self.weights.size:
+            return None
+        cumulative = np.cumsum(self.weights)
+        centers = cumulative - self.weights / 2
+        return float(np.interp(q * cumulative[-1],
+                               np.r_[0.0, centers, cumulative[-1]],
+                               np.r_[self.minimum, self.means, self.maximum]))
+
+    def to_dict(self):
+        self._flush()
+        return {
+            'compression': self.compression,
+            'means': self.means.tolist(),
+            'weights': self.weights.tolist(),
+            'min': self.minimum,
+            'max': self.maximum
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['compression'])
+        sketch.means = np.asarray(data['means'], dtype=float)
+        sketch.weights = np.asarray(data['weights'], dtype=float)
+        sketch.minimum = data['min']
+        sketch.maximum = data['max']
+        return sketch
+
+
+class ColumnSummary:
+    """Agregados exatos (RunningStats) e quantis aproximados de uma coluna"""
+
+    __slots__ = ('stats', 'sketch')
+
+    def __init__(self, stats=None, sketch=None):
+        self.stats = stats or RunningStats()
+        self.sketch = sketch or QuantileSketch()
+
+    def add_many(self, values):
+        values = np.asarray(values, dtype=float)
+        self.stats.add_many(values)
+        self.sketch.add_many(values)
+
+    def merge(self, other):
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def quantile(self, q):
+        return self.sketch.quantile(q)
+
+    def describe(self, quantiles=(0.5, 0.9, 0.99)):
+        """Estatísticas como dicionário simples (count, mean, std, min, max, pNN)"""
+        description = {
+            'count': self.stats.count,
+            'mean': self.stats.mean,
+            'std': self.stats.std,
+            'min': self.stats.minimum,
+            'max': self.stats.maximum
+        }
+        for q in quantiles:
+            description[f'p{int(q * 100)}'] = self.quantile(q)
+        return description
+
+    def to_dict(self):
+        return {'stats': self.stats.to_dict(), 'sketch': self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(RunningStats.from_dict(data['stats']), QuantileSketch.from_dict(data['sketch']))
+
+
+def regularized_beta(a, b, x, max_iter=200, eps=3e-14):
+    """Função beta incompleta regularizada I_x(a, b) (fração contínua de Lentz)"""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        # Simetria I_x(a, b) = 1 - I_{1-x}(b, a): fração converge rápido
+        return 1.0 - regularized_beta(b, a, 1.0 - x, max_iter, eps)
+    log_front = (math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                 + a * math.log(x) + b * math.log1p(-x))
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    fraction = d
+    for m in range(1, max_iter + 1):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            fraction *= c * d
+        if abs(c * d - 1.0) < eps:
+            break
+    return math.exp(log_front) * fraction / a
+
+
+def student_t_pvalue(t, df):
+    """p-valor bilateral da distribuição t de Student"""
+    if math.isinf(t):
+        return 0.0
+    return regularized_beta(df / 2, 0.5, df / (df + t * t))
+
+
+def welch_t_test(a, b):
+    """Teste t de Welch (variâncias diferentes) entre dois RunningStats
+
+    Retorna {'t', 'df', 'p_value'} ou None se algum lado tiver menos de
+    duas amostras.
+    """
+    if a.count < 2 or b.count < 2:
+        return None
+    va, vb = a.variance / a.count, b.variance / b.count
+    diff = b.mean - a.mean
+    if va + vb == 0:
+        p_value = 1.0 if diff == 0 else 0.0
+        return {'t': 0.0 if diff == 0 else math.copysign(math.inf, diff), 'df': a.count + b.count - 2,
+                'p_value': p_value}
+    t = diff / math.sqrt(va + vb)
+    df = (va + vb) ** 2 / (va * va / (a.count - 1) + vb * vb / (b.count - 1))
+    return {'t': t, 'df': df, 'p_value': student_t_pvalue(t, df)}
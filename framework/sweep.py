@@ -0,0 +1,195 @@
+"""
+Varredura de Parâmetros em Paralelo
+===================================
+
+Expande uma grade de parâmetros (produto cartesiano) e executa uma simulação
+por combinação em um pool de processos do tamanho dos núcleos disponíveis.
+Cada execução roda no backend analítico, dentro do seu próprio diretório
+(run_0000/, run_0001/, ...), onde ficam params.json, output.log e os logs
+gerados pelo cenário. Ao final, index.json e index.csv reúnem parâmetros,
+status, duração e um resumo dos logs de todas as execuções.
+
+Exemplo de grade (JSON):
+
+    {
+        "exp": [2.0, 2.5, 3.0],
+        "range": [58, 80],
+        "channels": [["1", "6", "11"], ["1", "1", "1"]],
+        "scans": [30],
+        "shadowing": [4.0],
+        "seed": [1, 2, 3]
+    }
+
+`seed` só alimenta o sombreamento log-normal: sem `shadowing` > 0 as
+execuções com seeds diferentes são idênticas (grid_warnings avisa).
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import csv
+import glob
+import itertools
+import json
+import os
+import runpy
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
+
+from framework.catalog import CATALOG_ENV, default_catalog_path
+from framework.params import PARAMS_ENV
+
+CONNECTIVITY_COLUMNS = ('connected', 'mesh_connected')
+
+
+def expand_grid(grid):
+    """Produto cartesiano da grade {parâmetro: [valores]} em lista de dicts"""
+    names = list(grid.keys())
+    values = [grid[name] if isinstance(grid[name], list) else [grid[name]] for name in names]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def summarize_logs(run_dir):
+    """Resumo (registros, RSSI médio, conectividade) dos CSVs de uma execução"""
+    summary = {'records': 0, 'avg_rssi': None, 'connectivity_rate': None, 'log_files': []}
+    rssi_sum = 0.0
+    rssi_count = 0
+    connected = 0
+    connectivity_total = 0
+    
+    for path in sorted(glob.glob(os.path.join(run_dir, '**', '*.csv'), recursive=True)):
+        summary['log_files'].append(os.path.relpath(path, run_dir))
+        with open(path, newline='') as f:
+            reader = csv.DictReader(f)
+            conn_column = next((c for c in CONNECTIVITY_COLUMNS if c in (reader.fieldnames or [])), None)
+            for row in reader:
+                summary['records'] += 1
+                if row.get('rssi'):
+                    rssi_sum += float(row['rssi'])
+                    rssi_count += 1
+                if conn_column:
+                    connectivity_total += 1
+                    connected += row[conn_column] == 'YES'
+    
+    for path in sorted(glob.glob(os.path.join(run_dir, '**', '*.json'), recursive=True)):
+        if os.path.basename(path) != 'params.json':
+            summary['log_files'].append(os.path.relpath(path, run_dir))
+    
+    if rssi_count:
+        summary['avg_rssi'] = round(rssi_sum / rssi_count, 2)
+    if connectivity_total:
+        summary['connectivity_rate'] = round(connected / connectivity_total * 100, 1)
+    return summary
+
+
+def _init_worker(clock, catalog_path):
+    """Configura o backend analítico e o catálogo (caminho absoluto) no processo do pool"""
+    os.environ['FRAMEWORK_BACKEND'] = 'analytic'
+    os.environ['FRAMEWORK_CLOCK'] = clock
+    os.environ[CATALOG_ENV] = catalog_path
+
+
+def _run_one(run_id, script_file, run_dir, params):
+    """Executa um cenário no processo atual, dentro do diretório da execução"""
+    os.makedirs(run_dir, exist_ok=True)
+    with open(os.path.join(run_dir, 'params.json'), 'w') as f:
+        json.dump(params, f, indent=2)
+    
+    os.environ[PARAMS_ENV] = json.dumps(params)
+    previous_dir = os.getcwd()
+    status = 'ok'
+    error = None
+    started = time.perf_counter()
+    
+    try:
+        os.chdir(run_dir)
+        with open('output.log', 'w') as out, redirect_stdout(out), redirect_stderr(out):
+            runpy.run_path(script_file, run_name='__main__')
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            status, error = 'error', f"exit code {e.code}"
+    except Exception as e:
+        status, error = 'error', f"{type(e).__name__}: {e}"
+    finally:
+        os.chdir(previous_dir)
+        os.environ.pop(PARAMS_ENV, None)
+    
+    result = {
+        'run_id': run_id,
+        'run_dir': run_dir,
+        'status': status,
+        'error': error,
+        'duration_s': round(time.perf_counter() - started, 3),
+        'params': params
+    }
+    result.update(summarize_logs(run_dir))
+    return result
+
+
+def write_index(results, output_dir):
+    """Grava o índice consolidado em index.json e index.csv"""
+    with open(os.path.join(output_dir, 'index.json'), 'w') as f:
+        json.dump(results, f, indent=2)
+    
+    param_names = sorted({name for result in results for name in result['params']})
+    fieldnames = (['run_id', 'status', 'duration_s'] + param_names +
+                  ['records', 'avg_rssi', 'connectivity_rate', 'run_dir', 'log_files', 'error'])
+    with open(os.path.join(output_dir, 'index.csv'), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for result in results:
+            row = {name: result.get(name) for name in fieldnames}
+            for name in param_names:
+                value = result['params'].get(name)
+                # Parâmetros compostos (canais, waypoints) são gravados como JSON
+                row[name] = json.dumps(value) if isinstance(value, (list, dict)) else value
+            row['log_files'] = ';'.join(result['log_files'])
+            writer.writerow(row)
+
+
+def _as_values(value):
+    return value if isinstance(value, list) else [value]
+
+
+def grid_warnings(grid):
+    """Combinações da grade que não produzem variação (mensagens de aviso)"""
+    warnings = []
+    seeds = _as_values(grid.get('seed', []))
+    shadowing = [value for value in _as_values(grid.get('shadowing', 0.0)) if value]
+    if len(seeds) > 1 and not shadowing:
+        warnings.append("'seed' varia mas 'shadowing' é 0: o seed só afeta o sombreamento, "
+                        "as execuções serão idênticas (use --set shadowing <dB>)")
+    return warnings
+
+
+def run_sweep(script_file, grid, output_dir, jobs=None, clock='fast', progress=print):
+    """Executa todas as combinações da grade em paralelo e retorna os resultados"""
+    script_file = os.path.abspath(script_file)
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    
+    for warning in grid_warnings(grid):
+        progress(f"⚠️  {warning}")
+    combinations = expand_grid(grid)
+    jobs = jobs or os.cpu_count() or 1
+    results = []
+    
+    # Cada execução muda de diretório: o catálogo precisa de um caminho absoluto
+    initargs = (clock, default_catalog_path())
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as pool:
+        futures = [
+            pool.submit(_run_one, run_id, script_file,
+                        os.path.join(output_dir, f'run_{run_id:04d}'), params)
+            for run_id, params in enumerate(combinations)
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            icon = "✅" if result['status'] == 'ok' else "❌"
+            progress(f"{icon} [{done}/{len(futures)}] run_{result['run_id']:04d} "
+                     f"({result['duration_s']:.2f}s) {json.dumps(result['params'])}")
+    
+    results.sort(key=lambda result: result['run_id'])
+    write_index(results, output_dir)
+    return results
@@ -11,11 +11,15 @@ Data: Dezembro 2024
 
 import os
 import sys
+import json
 import subprocess
 import argparse
 import time
 from datetime import datetime
 
+from framework.params import parse_channels
+from framework.sweep import run_sweep
+
 # Configurar PYTHONPATH automaticamente
 def setup_pythonpath():
     """Configura o PYTHONPATH para incluir Mininet-WiFi"""
@@ -82,7 +86,7 @@ def print_scenarios():
         print(f"  {key:20} - {scenario['description']}")
     print("-" * 60)
 
-def run_scenario(scenario_name, verbose=False):
+def run_scenario(scenario_name, verbose=False, backend='mininet', clock=None):
     """Executa um cenário específico"""
     if scenario_name not in get_scenarios():
         print(f"❌ Cenário '{scenario_name}' não encontrado!")
@@ -100,12 +104,28 @@ def run_scenario(scenario_name, verbose=False):
     print_banner()
     print(f"🚀 Executando cenário: {scenario_name}")
     print(f"📁 Arquivo: {script_file}")
-    print(f"🔧 PYTHONPATH configurado: {setup_pythonpath()}")
+    print(f"🧩 Backend: {backend}")
+    if clock:
+        print(f"⏱️  Relógio: {clock}")
+    if backend != 'analytic':
+        print(f"🔧 PYTHONPATH configurado: {setup_pythonpath()}")
     print("=" * 60)
     
+    env = os.environ.copy()
+    env['FRAMEWORK_BACKEND'] = backend
+    if clock:
+        env['FRAMEWORK_CLOCK'] = clock
+    
     try:
-        # Executar com sudo
-        cmd = ['sudo', 'python3', script_file]
+        if backend == 'analytic':
+            # Backend analítico: sem sudo, sem interfaces do kernel e sem wmediumd
+            cmd = [sys.executable, script_file]
+        else:
+            # Executar com sudo (as variáveis são repassadas explicitamente ao sudo)
+            cmd = ['sudo', f'FRAMEWORK_BACKEND={backend}']
+            if clock:
+                cmd.append(f'FRAMEWORK_CLOCK={clock}')
+            cmd += ['python3', script_file]
         
         if verbose:
             print(f"🔍 Comando: {' '.join(cmd)}")
@@ -113,7 +133,7 @@ def run_scenario(scenario_name, verbose=False):
         print(f"ℹ️  🚀 Iniciando simulação {scenario_name}...")
         
         # Executar o cenário
-        result = subprocess.run(cmd, capture_output=False, text=True)
+        result = subprocess.run(cmd, capture_output=False, text=True, env=env)
         
         if result.returncode == 0:
             print("✅ Cenário executado com sucesso!")
@@ -130,6 +150,75 @@ def run_scenario(scenario_name, verbose=False):
         print(f"❌ Erro inesperado: {e}")
         return False
 
+def parse_param_value(value):
+    """Interpreta o valor de um parâmetro como JSON (número, lista...) ou texto"""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+def build_sweep_grid(grid_file=None, param_sets=None):
+    """Monta a grade de parâmetros a partir de um arquivo JSON e/ou de --set"""
+    grid = {}
+    if grid_file:
+        with open(grid_file) as f:
+            grid.update(json.load(f))
+    for name, *values in param_sets or []:
+        grid[name] = [parse_param_value(value) for value in values]
+    validate_sweep_grid(grid)
+    return grid
+
+def validate_sweep_grid(grid):
+    """Valida os valores da grade antes de disparar qualquer execução (ValueError)"""
+    plans = grid.get('channels', [])
+    # Cada valor de 'channels' é um plano completo: [[1,6,11],[1,1,1]] ou ["1,6,11","1,1,1"]
+    for plan in plans if isinstance(plans, list) else [plans]:
+        try:
+            parse_channels(plan)
+        except ValueError as e:
+            raise ValueError(f"{e}; na grade, cada valor de 'channels' é um plano completo, "
+                             f"ex.: --set channels 1,6,11 1,1,1") from None
+
+def run_parameter_sweep(scenario_name, grid, jobs=None, output_dir=None, clock='fast'):
+    """Executa uma varredura de parâmetros em paralelo (backend analítico)"""
+    if scenario_name not in get_scenarios():
+        print(f"❌ Cenário '{scenario_name}' não encontrado!")
+        print_scenarios()
+        return False
+    
+    script_file = get_scenarios()[scenario_name]['file']
+    if not os.path.exists(script_file):
+        print(f"❌ Arquivo do cenário não encontrado: {script_file}")
+        return False
+    
+    if not grid:
+        print("❌ Grade de parâmetros vazia! Use --grid <arquivo.json> ou --set <parâmetro> <valores...>")
+        return False
+    
+    if output_dir is None:
+        output_dir = os.path.join('runs', f"sweep_{scenario_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    jobs = jobs or os.cpu_count() or 1
+    
+    print_banner()
+    print(f"🧪 Varredura de parâmetros: {scenario_name}")
+    print(f"📁 Arquivo: {script_file}")
+    print(f"📋 Grade: {json.dumps(grid)}")
+    print(f"⚙️  Processos: {jobs} | Relógio: {clock}")
+    print(f"💾 Saída: {output_dir}")
+    print("=" * 60)
+    
+    try:
+        results = run_sweep(script_file, grid, output_dir, jobs=jobs, clock=clock)
+    except KeyboardInterrupt:
+        print("\n🛑 Varredura interrompida pelo usuário")
+        return False
+    
+    failed = [result for result in results if result['status'] != 'ok']
+    print("=" * 60)
+    print(f"✅ {len(results) - len(failed)}/{len(results)} execuções concluídas")
+    print(f"📊 Índice consolidado: {os.path.join(output_dir, 'index.csv')}")
+    return not failed
+
 def main():
     """Função principal"""
     parser = argparse.ArgumentParser(
@@ -139,6 +228,9 @@ def main():
 Exemplos de uso:
   python3 run_scenario.py rasp-car
   python3 run_scenario.py mastering-scenario-1
+  python3 run_scenario.py mastering-1 --backend analytic
+  python3 run_scenario.py mastering-1 --sweep --set exp 2.0 2.5 3.0 --set shadowing 4 --set seed 1 2 3
+  python3 run_scenario.py rasp-car --sweep --grid grade.json --jobs 16
   python3 run_scenario.py --list
   python3 run_scenario.py --help
         """
@@ -162,6 +254,49 @@ Exemplos de uso:
         help='Modo verboso com mais informações'
     )
     
+    parser.add_argument(
+        '--backend', '-b',
+        choices=['mininet', 'analytic'],
+        help='Backend de execução: mininet (padrão, requer root) ou analytic (headless, sem root)'
+    )
+    
+    parser.add_argument(
+        '--clock', '-c',
+        choices=['realtime', 'fast'],
+        help='Relógio da simulação: realtime (padrão no mininet) ou fast (padrão no analytic)'
+    )
+    
+    parser.add_argument(
+        '--sweep',
+        action='store_true',
+        help='Varredura de parâmetros em paralelo (backend analítico)'
+    )
+    
+    parser.add_argument(
+        '--grid',
+        help='Arquivo JSON com a grade {parâmetro: [valores]} da varredura'
+    )
+    
+    parser.add_argument(
+        '--set',
+        dest='param_sets',
+        nargs='+',
+        action='append',
+        metavar=('PARAM', 'VALOR'),
+        help='Valores de um parâmetro da varredura (exp, range, channels, waypoints, scans, seed...)'
+    )
+    
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        help='Número de processos da varredura (padrão: núcleos disponíveis)'
+    )
+    
+    parser.add_argument(
+        '--output', '-o',
+        help='Diretório de saída da varredura (padrão: runs/sweep_<cenário>_<data>)'
+    )
+    
     args = parser.parse_args()
     
     # Listar cenários se solicitado
@@ -179,8 +314,22 @@ Exemplos de uso:
         print("💡 Use: python3 run_scenario.py --list para ver opções")
         return
     
+    # Varredura de parâmetros
+    if args.sweep:
+        if args.backend == 'mininet':
+            print("⚠️  A varredura usa sempre o backend analítico")
+        try:
+            grid = build_sweep_grid(args.grid, args.param_sets)
+        except ValueError as e:
+            print(f"❌ Grade de parâmetros inválida: {e}")
+            sys.exit(1)
+        success = run_parameter_sweep(args.scenario, grid, args.jobs, args.output, args.clock or 'fast')
+        if not success:
+            sys.exit(1)
+        return
+    
     # Executar cenário
-    success = run_scenario(args.scenario, args.verbose)
+    success = run_scenario(args.scenario, args.verbose, args.backend or 'mininet', args.clock)
     
     if not success:
         sys.exit(1)
@@ -13,17 +13,20 @@ Data: Dezembro 2024
 """
 
 import time
-import csv
-import threading
 import math
 import os
+import sys
 from datetime import datetime
-from mininet.node import Controller
-from mininet.log import setLogLevel, info
-from mn_wifi.node import OVSKernelAP
-from mn_wifi.link import wmediumd
-from mn_wifi.cli import CLI
-from mn_wifi.net import Mininet_wifi
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from framework.backend import (Controller, setLogLevel, info, OVSKernelAP,
+                               wmediumd, CLI, Mininet_wifi, is_analytic)
+from framework.catalog import record_run
+from framework.clock import create_scheduler
+from framework.logwriter import AsyncLogWriter
+from framework.params import get_channels, get_param
+from framework.propagation import PropagationModel
+from framework.spatial import APIndex
 
 def print_progress(message, step=None, total=None):
     """Função para imprimir progresso de forma clara"""
@@ -35,8 +38,14 @@ def print_progress(message, step=None, total=None):
 
 def topology():
     print_progress("🎯 Iniciando Mastering Scenario 1...")
+    run_started = time.time()
     print_progress("=" * 60)
     
+    # Parâmetros da execução (FRAMEWORK_PARAMS); sem eles, valores padrão do cenário
+    ap_range = get_param('range', 80)
+    channels = get_channels()
+    path_loss_exp = get_param('exp')
+    
     # Configurar rede Mininet-WiFi
     net = Mininet_wifi(controller=Controller, link=wmediumd, accessPoint=OVSKernelAP)
     
@@ -49,9 +58,9 @@ def topology():
         'router1', 
         ssid='Mesh-Backbone',
         mode='g',
-        channel='1',
+        channel=channels[0],
         position='0,0,0',
-        range=80,
+        range=ap_range,
         dpid='1'
     )
     
@@ -61,9 +70,9 @@ def topology():
         'router2',
         ssid='Mesh-Repeater',
         mode='g', 
-        channel='6',
+        channel=channels[1],
         position='50,50,0',
-        range=80,
+        range=ap_range,
         dpid='2'
     )
     
@@ -73,9 +82,9 @@ def topology():
         'router3',
         ssid='Mesh-Mobile',
         mode='g',
-        channel='11', 
+        channel=channels[2],
         position='25,25,0',
-        range=80,
+        range=ap_range,
         dpid='3'
     )
     
@@ -88,7 +97,7 @@ def topology():
     )
     
     print_progress("⚙️  Configurando modelo de propagação...")
-    net.setPropagationModel(model="logDistance", exp=2.5)
+    net.setPropagationModel(model="logDistance", exp=path_loss_exp or 2.5)
     net.configureWifiNodes()
     
     print_progress("🔨 Construindo rede...")
@@ -112,27 +121,30 @@ def topology():
     # Configurar roteamento
     raspberry.cmd('route add default gw 192.168.1.1')
     
+    # Modelo de propagação: 20 dBm de potência, 5 dB de perdas (ambiente aberto)
+    propagation = PropagationModel(tx_power=20, additional_losses=5, exp=path_loss_exp or 2.0,
+                                   shadowing=get_param('shadowing', 0.0), seed=get_param('seed'))
+    # Índice espacial dos APs: candidatos podados pelo alcance, router3 atualizado ao mover
+    ap_index = APIndex.from_nodes([router1, router2, router3])
+    scheduler = create_scheduler()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_filename = f'logs/mastering_scenario_1_log_{timestamp}.csv'
+    
     # Função de escaneamento e log em CSV
     def scan_and_log():
         print_progress("📊 Iniciando sistema de escaneamento e log...")
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_filename = f'logs/mastering_scenario_1_log_{timestamp}.csv'
-        
         # Criar diretório de logs se não existir
         os.makedirs('logs', exist_ok=True)
         
-        with open(log_filename, 'w', newline='') as csvfile:
-            fieldnames = [
-                'timestamp', 'raspberry_x', 'raspberry_y', 'raspberry_z',
-                'router3_x', 'router3_y', 'router3_z', 'best_ap', 'ssid',
-                'rssi', 'distance_to_ap', 'latency_ms', 'throughput_mbps',
-                'packet_loss_percent', 'handover_detected', 'mesh_connected'
-            ]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            total_scans = 30  # Mais scans para melhor análise
+        fieldnames = [
+            'timestamp', 'raspberry_x', 'raspberry_y', 'raspberry_z',
+            'router3_x', 'router3_y', 'router3_z', 'best_ap', 'ssid',
+            'rssi', 'distance_to_ap', 'latency_ms', 'throughput_mbps',
+            'packet_loss_percent', 'handover_detected', 'mesh_connected'
+        ]
+        with AsyncLogWriter(log_filename, fieldnames, columnar=get_param('columnar', False)) as writer:
+            total_scans = get_param('scans', 30)  # Mais scans para melhor análise
             last_ap = None
             
             for i in range(total_scans):
@@ -166,29 +178,17 @@ def topology():
                     (router3, 'Mesh-Mobile', router3_x, router3_y, router3_z)
                 ]
                 
-                for ap, ssid, ap_x, ap_y, ap_z in aps:
-                    try:
-                        # Calcular distância
-                        distance = math.sqrt((rasp_x - ap_x)**2 + (rasp_y - ap_y)**2 + (rasp_z - ap_z)**2)
-                        if distance < 0.01:
-                            distance = 0.01
-                        
-                        # Calcular RSSI realista
-                        tx_power = 20  # dBm
-                        freq = 2.4e9   # 2.4 GHz
-                        c = 3e8        # velocidade da luz
-                        fspl = 20 * math.log10(distance) + 20 * math.log10(freq) + 20 * math.log10(4 * math.pi / c)
-                        additional_losses = 5  # dB (ambiente aberto)
-                        rssi = tx_power - fspl - additional_losses
-                        
-                        if rssi > best_rssi:
-                            best_rssi = rssi
-                            best_ap = ap.name
-                            best_distance = distance
-                            best_ssid = ssid
-                    except Exception as e:
-                        info(f"⚠️  Erro ao calcular RSSI para {ap.name}: {e}\n")
-                        continue
+                try:
+                    # RSSI só dos APs ao alcance (índice espacial, vetorizado)
+                    ap_index.move(2, (router3_x, router3_y, router3_z))
+                    idx, rssi, dist = ap_index.best_ap([(rasp_x, rasp_y, rasp_z)], propagation)
+                    best_index = int(idx[0])
+                    best_ap = aps[best_index][0].name
+                    best_ssid = aps[best_index][1]
+                    best_rssi = float(rssi[0])
+                    best_distance = float(dist[0])
+                except Exception as e:
+                    info(f"⚠️  Erro ao calcular RSSI: {e}\n")
                 
                 # Detectar handover
                 handover_detected = "YES" if last_ap and last_ap != best_ap else "NO"
@@ -215,7 +215,7 @@ def topology():
                 
                 if best_ap:
                     writer.writerow({
-                        'timestamp': time.time(),
+                        'timestamp': scheduler.time(),
                         'raspberry_x': round(rasp_x, 2),
                         'raspberry_y': round(rasp_y, 2),
                         'raspberry_z': round(rasp_z, 2),
@@ -232,14 +232,13 @@ def topology():
                         'handover_detected': handover_detected,
                         'mesh_connected': mesh_connected
                     })
-                    csvfile.flush()
                     
                     # Mostrar resultado do scan
                     status_icon = "🟢" if mesh_connected == "YES" else "🔴"
                     handover_icon = "🔄" if handover_detected == "YES" else "➡️"
                     print_progress(f"{status_icon} Posição: ({rasp_x:.1f},{rasp_y:.1f}) | AP: {best_ap} | RSSI: {best_rssi:.1f} dBm | Dist: {best_distance:.1f}m | Lat: {latency:.1f}ms | {handover_icon}")
                 
-                time.sleep(2)
+                yield 2
         
         print_progress(f"💾 Log salvo em: {log_filename}")
         
@@ -255,18 +254,18 @@ def topology():
         print_progress("🚗 Iniciando mobilidade do carrinho...")
         
         # Waypoints para testar conectividade
-        waypoints = [
+        waypoints = get_param('waypoints', [
             (0, 0, 0),      # Próximo ao roteador backbone
             (25, 0, 0),     # Meio caminho entre backbone e repetidor
             (50, 50, 0),    # Próximo ao roteador repetidor
             (25, 50, 0),    # Meio caminho de volta
             (0, 25, 0),     # Outro ponto intermediário
             (25, 25, 0),    # Centro da área
-        ]
+        ])
         
         current_waypoint = 0
         waypoint_radius = 5
-        total_moves = 30
+        total_moves = get_param('scans', 30)
         
         for i in range(total_moves):
             # Obter waypoint atual
@@ -321,20 +320,16 @@ def topology():
             
             print_progress(f"🚗 Carrinho movido para: ({new_x:.1f}, {new_y:.1f}) | Próximo ao: {closest_router} ({closest_distance:.1f}m)", i+1, total_moves)
             
-            time.sleep(2)
+            yield 2
         
         print_progress("🏁 Mobilidade do carrinho concluída!")
 
-    print_progress("🔄 Iniciando threads de mobilidade e escaneamento...")
-    scan_thread = threading.Thread(target=scan_and_log, daemon=True)
-    move_thread = threading.Thread(target=move_cart, daemon=True)
-    
-    scan_thread.start()
-    move_thread.start()
+    print_progress("🔄 Iniciando processos de mobilidade e escaneamento...")
+    scheduler.process(scan_and_log())
+    scheduler.process(move_cart())
     
-    # Esperar as threads terminarem
-    scan_thread.join()
-    move_thread.join()
+    # Executar a simulação até os processos terminarem
+    scheduler.run()
     
     print_progress("🌐 Configurando conectividade de rede...")
     
@@ -345,7 +340,8 @@ def topology():
     try:
         # Iniciar servidor iperf no roteador principal
         router1.cmd('iperf -s -t 5 &')
-        time.sleep(1)
+        if not is_analytic():
+            time.sleep(1)  # aguardar servidor iperf (apenas Mininet-WiFi real)
         
         # Cliente iperf no Raspberry Pi
         result = raspberry.cmd('iperf -c 192.168.1.1 -t 3')
@@ -353,6 +349,7 @@ def topology():
     except Exception as e:
         print_progress(f"⚠️  Erro no teste de throughput: {e}")
     
+    record_run('mastering_scenario_1', [log_filename], aps=[router1, router2, router3], started_at=run_started)
     print_progress("✅ Simulação Mastering Scenario 1 concluída com sucesso!")
     
     return net
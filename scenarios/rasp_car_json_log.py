@@ -5,33 +5,68 @@ Cenário: Rasp-Car Scanner (Log JSON)
 - 1 modem principal (AP fixo, recebe internet)
 - 2 roteadores mesh (APs mesh, interconectados)
 - 1 Raspberry Pi móvel (station) que escaneia e loga sinais Wi-Fi em JSON
-- Demonstração de formato de log alternativo
+- Demonstração de formato de log alternativo (JSONL em streaming, .jsonl.gz ou .json)
 """
-from mininet.node import Controller
-from mininet.log import setLogLevel, info
-from mn_wifi.node import OVSKernelAP
-from mn_wifi.link import wmediumd
-from mn_wifi.cli import CLI
-from mn_wifi.net import Mininet_wifi
 import time
-import threading
 import json
-import math
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from framework.backend import (Controller, setLogLevel, info, OVSKernelAP,
+                               wmediumd, CLI, Mininet_wifi)
+from framework.catalog import record_run
+from framework.clock import create_scheduler
+from framework.jsonlog import JSON_LOG_EXTENSIONS, JsonLinesWriter
+from framework.params import get_channels, get_param
+from framework.propagation import PropagationModel, node_positions
+
+
+class LegacyJsonLog:
+    """Formato antigo: acumula as iterações e grava um único documento JSON"""
+
+    def __init__(self, filename, header):
+        self.filename = filename
+        self.header = header
+        self.logs = []
+
+    def writerow(self, log_entry):
+        self.logs.append(log_entry)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with open(self.filename, 'w') as jsonfile:
+            json.dump(dict(self.header, total_iterations=len(self.logs), logs=self.logs), jsonfile, indent=2)
+        return False
 
 
 def topology():
+    run_started = time.time()
+    
+    # Parâmetros da execução (FRAMEWORK_PARAMS); sem eles, valores padrão do cenário
+    ap_range = get_param('range', 58)
+    channels = get_channels()
+    path_loss_exp = get_param('exp')
+    # jsonl (padrão): uma linha por iteração, gravada durante a execução
+    # jsonl.gz: o mesmo, comprimido; json: documento único ao final (formato antigo)
+    log_format = get_param('log_format', 'jsonl')
+    log_formats = [extension.lstrip('.') for extension in JSON_LOG_EXTENSIONS]
+    if log_format not in log_formats:
+        raise ValueError(f"log_format inválido: {log_format!r} (opções: {', '.join(log_formats)})")
+    
     net = Mininet_wifi(controller=Controller, link=wmediumd, accessPoint=OVSKernelAP)
     info("*** Criando nós\n")
     c0 = net.addController('c0', controller=Controller)
     # Modem principal (AP fixo)
-    modem = net.addAccessPoint('modem', ssid='Internet', mode='g', channel='1', position='10,30,0', range=58, dpid='1')
+    modem = net.addAccessPoint('modem', ssid='Internet', mode='g', channel=channels[0], position='10,30,0', range=ap_range, dpid='1')
     # Mesh routers
-    mesh1 = net.addAccessPoint('mesh1', ssid='MeshNet', mode='g', channel='6', position='40,30,0', range=58, dpid='2')
-    mesh2 = net.addAccessPoint('mesh2', ssid='MeshNet', mode='g', channel='11', position='70,30,0', range=58, dpid='3')
+    mesh1 = net.addAccessPoint('mesh1', ssid='MeshNet', mode='g', channel=channels[1], position='40,30,0', range=ap_range, dpid='2')
+    mesh2 = net.addAccessPoint('mesh2', ssid='MeshNet', mode='g', channel=channels[2], position='70,30,0', range=ap_range, dpid='3')
     # Raspberry Pi móvel
     rasp = net.addStation('rasp', ip='10.0.0.10/24', position='20,20,0')
-    net.setPropagationModel(model="logDistance", exp=3.5)
+    net.setPropagationModel(model="logDistance", exp=path_loss_exp or 3.5)
     net.configureWifiNodes()
     net.build()
     c0.start()
@@ -39,52 +74,55 @@ def topology():
     mesh1.start([c0])
     mesh2.start([c0])
 
+    # Modelo de propagação (20 dBm de potência, 10 dB de perdas adicionais)
+    propagation = PropagationModel(tx_power=20, additional_losses=10, exp=path_loss_exp or 2.0,
+                                   shadowing=get_param('shadowing', 0.0), seed=get_param('seed'))
+    scheduler = create_scheduler()
+    ap_list = [modem, mesh1, mesh2]
+    log_filename = f'rasp_car_json_log.{log_format}'
+
     # Função de escaneamento e log em JSON
     def scan_and_log():
-        log_filename = 'rasp_car_json_log.json'
-        logs = []
-        for i in range(15):  # 15 iterações
-            # Obter posição
-            try:
-                pos = {
-                    'x': float(rasp.params.get('x', 0)),
-                    'y': float(rasp.params.get('y', 0)),
-                    'z': float(rasp.params.get('z', 0))
-                }
-            except:
-                pos = {'x': 0, 'y': 0, 'z': 0}
-            
-            ap_data = []
-            
-            for ap in [modem, mesh1, mesh2]:
+        header = {
+            'scenario': 'rasp_car_json_log',
+            'description': 'Raspberry Pi mobile scanning with JSON logging'
+        }
+        if log_format == 'json':
+            writer = LegacyJsonLog(log_filename, header)
+        else:
+            writer = JsonLinesWriter(log_filename, header=header)
+        with writer:
+            for i in range(get_param('scans', 15)):  # 15 iterações por padrão
+                # Obter posição
+                try:
+                    pos = {
+                        'x': float(rasp.params.get('x', 0)),
+                        'y': float(rasp.params.get('y', 0)),
+                        'z': float(rasp.params.get('z', 0))
+                    }
+                except:
+                    pos = {'x': 0, 'y': 0, 'z': 0}
+                
+                ap_data = []
+                
                 try:
-                    # Calcular distância
-                    rasp_x = float(rasp.params.get('x', 0))
-                    rasp_y = float(rasp.params.get('y', 0))
-                    rasp_z = float(rasp.params.get('z', 0))
-                    
-                    ap_x = float(ap.params.get('x', 0))
-                    ap_y = float(ap.params.get('y', 0))
-                    ap_z = float(ap.params.get('z', 0))
-                    
-                    distance = math.sqrt((rasp_x - ap_x)**2 + (rasp_y - ap_y)**2 + (rasp_z - ap_z)**2)
-                    if distance < 0.01:
-                        distance = 0.01
-                    
-                    # RSSI realista
-                    tx_power = 20
-                    freq = 2.4e9
-                    c = 3e8
-                    fspl = 20 * math.log10(distance) + 20 * math.log10(freq) + 20 * math.log10(4 * math.pi / c)
-                    additional_losses = 10
-                    rssi = tx_power - fspl - additional_losses
-                    
+                    # Distância e RSSI de todos os APs calculados de uma vez
+                    distances = propagation.distances(node_positions([rasp]), node_positions(ap_list))[0]
+                    rssi_values = propagation.rssi_from_distance(distances)
+                except Exception as e:
+                    info(f"Erro ao calcular dados dos APs: {e}\n")
+                    distances, rssi_values = [], []
+                
+                for ap, distance, rssi in zip(ap_list, distances, rssi_values):
+                    distance = float(distance)
+                    rssi = float(rssi)
+                
                     # Latência
                     latency = 5 + (distance * 0.1)
-                    
+                
                     # Conectividade
                     connected = rssi > -70
-                    
+                
                     ap_data.append({
                         'name': ap.name,
                         'ssid': ap.params.get('ssid', 'Unknown'),
@@ -95,40 +133,27 @@ def topology():
                         'connected': connected,
                         'signal_strength': 'strong' if rssi > -50 else 'medium' if rssi > -60 else 'weak'
                     })
-                    
-                except Exception as e:
-                    info(f"Erro ao calcular dados para {ap.name}: {e}\n")
-                    continue
-            
-            # Encontrar melhor AP
-            best_ap = max(ap_data, key=lambda x: x['rssi']) if ap_data else None
-            
-            log_entry = {
-                'timestamp': time.time(),
-                'timestamp_readable': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'iteration': i + 1,
-                'position': pos,
-                'available_aps': ap_data,
-                'best_ap': best_ap,
-                'network_status': {
-                    'total_aps': len(ap_data),
-                    'connected_aps': len([ap for ap in ap_data if ap['connected']]),
-                    'best_signal': best_ap['rssi'] if best_ap else -999
+                
+                # Encontrar melhor AP
+                best_ap = max(ap_data, key=lambda x: x['rssi']) if ap_data else None
+                
+                log_entry = {
+                    'timestamp': scheduler.time(),
+                    'timestamp_readable': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(scheduler.time())),
+                    'iteration': i + 1,
+                    'position': pos,
+                    'available_aps': ap_data,
+                    'best_ap': best_ap,
+                    'network_status': {
+                        'total_aps': len(ap_data),
+                        'connected_aps': len([ap for ap in ap_data if ap['connected']]),
+                        'best_signal': best_ap['rssi'] if best_ap else -999
+                    }
                 }
-            }
-            
-            logs.append(log_entry)
-            info(f"Log JSON: Iteração {i+1}, Melhor AP: {best_ap['name'] if best_ap else 'None'} (RSSI: {best_ap['rssi'] if best_ap else 'N/A'})\n")
-            time.sleep(1.5)
-        
-        # Salvar logs em JSON
-        with open(log_filename, 'w') as jsonfile:
-            json.dump({
-                'scenario': 'rasp_car_json_log',
-                'description': 'Raspberry Pi mobile scanning with JSON logging',
-                'total_iterations': len(logs),
-                'logs': logs
-            }, jsonfile, indent=2)
+                
+                writer.writerow(log_entry)
+                info(f"Log JSON: Iteração {i+1}, Melhor AP: {best_ap['name'] if best_ap else 'None'} (RSSI: {best_ap['rssi'] if best_ap else 'N/A'})\n")
+                yield 1.5
         
         # Corrigir permissão
         try:
@@ -138,27 +163,23 @@ def topology():
 
     # Função de mobilidade
     def move_rasp():
-        positions = [
+        positions = get_param('waypoints', [
             (20,20,0), (30,25,0), (40,25,0), (50,25,0), (60,25,0),
             (50,25,0), (40,25,0), (30,25,0), (20,20,0), (10,20,0),
             (20,20,0), (30,25,0), (40,25,0), (50,25,0), (60,25,0)
-        ]
-        for i in range(15):
+        ])
+        for i in range(get_param('scans', 15)):
             pos = positions[i % len(positions)]
             rasp.setPosition(f'{pos[0]},{pos[1]},{pos[2]}')
             info(f"Raspberry movido para: {pos}\n")
-            time.sleep(2)
+            yield 2
 
-    info("*** Iniciando threads de mobilidade e escaneamento\n")
-    scan_thread = threading.Thread(target=scan_and_log, daemon=True)
-    move_thread = threading.Thread(target=move_rasp, daemon=True)
-    
-    scan_thread.start()
-    move_thread.start()
+    info("*** Iniciando processos de mobilidade e escaneamento\n")
+    scheduler.process(scan_and_log())
+    scheduler.process(move_rasp())
     
-    # Esperar as threads terminarem
-    scan_thread.join()
-    move_thread.join()
+    # Executar a simulação até os processos terminarem
+    scheduler.run()
     
     info("*** Configurando conectividade\n")
     modem.cmd('ifconfig modem-wlan1 10.0.0.1/24')
@@ -171,6 +192,7 @@ def topology():
     
     info("*** Parando rede\n")
     net.stop()
+    record_run('rasp_car_json_log', [log_filename], aps=ap_list, started_at=run_started)
 
 if __name__ == '__main__':
     setLogLevel('info')
@@ -6,17 +6,20 @@ Cenário: Rasp-Car Scanner
 - 2 roteadores mesh (APs mesh, interconectados)
 - 1 Raspberry Pi móvel (station) que escaneia e loga sinais Wi-Fi em CSV
 """
-from mininet.node import Controller
-from mininet.log import setLogLevel, info
-from mn_wifi.node import OVSKernelAP
-from mn_wifi.link import wmediumd
-from mn_wifi.cli import CLI
-from mn_wifi.net import Mininet_wifi
 import time
-import threading
-import csv
-import math
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from framework.backend import (Controller, setLogLevel, info, OVSKernelAP,
+                               wmediumd, CLI, Mininet_wifi, is_analytic)
+from framework.catalog import record_run
+from framework.clock import create_scheduler
+from framework.coverage import coverage_grid, topology_from_nodes
+from framework.logwriter import AsyncLogWriter
+from framework.params import get_channels, get_param
+from framework.propagation import PropagationModel, node_positions
+from framework.spatial import APIndex
 
 
 def print_progress(message, step=None, total=None):
@@ -30,6 +33,12 @@ def print_progress(message, step=None, total=None):
 
 def topology():
     print_progress("🚀 Iniciando simulação Rasp-Car Scanner...")
+    run_started = time.time()
+    
+    # Parâmetros da execução (FRAMEWORK_PARAMS); sem eles, valores padrão do cenário
+    ap_range = get_param('range', 58)
+    channels = get_channels()
+    path_loss_exp = get_param('exp')
     
     net = Mininet_wifi(controller=Controller, link=wmediumd, accessPoint=OVSKernelAP)
     
@@ -38,19 +47,19 @@ def topology():
     
     # Modem principal (AP fixo)
     print_progress("🔌 Configurando modem principal...")
-    modem = net.addAccessPoint('modem', ssid='Internet', mode='g', channel='1', position='10,30,0', range=58, dpid='1')
+    modem = net.addAccessPoint('modem', ssid='Internet', mode='g', channel=channels[0], position='10,30,0', range=ap_range, dpid='1')
     
     # Mesh routers
     print_progress("🌐 Configurando roteadores mesh...")
-    mesh1 = net.addAccessPoint('mesh1', ssid='MeshNet', mode='g', channel='6', position='40,30,0', range=58, dpid='2')
-    mesh2 = net.addAccessPoint('mesh2', ssid='MeshNet', mode='g', channel='11', position='70,30,0', range=58, dpid='3')
+    mesh1 = net.addAccessPoint('mesh1', ssid='MeshNet', mode='g', channel=channels[1], position='40,30,0', range=ap_range, dpid='2')
+    mesh2 = net.addAccessPoint('mesh2', ssid='MeshNet', mode='g', channel=channels[2], position='70,30,0', range=ap_range, dpid='3')
     
     # Raspberry Pi móvel
     print_progress("📱 Configurando Raspberry Pi móvel...")
     rasp = net.addStation('rasp', ip='10.0.0.10/24', position='15,25,0')
     
     print_progress("⚙️  Configurando modelo de propagação...")
-    net.setPropagationModel(model="logDistance", exp=3.5)
+    net.setPropagationModel(model="logDistance", exp=path_loss_exp or 3.5)
     net.configureWifiNodes()
     
     print_progress("🔨 Construindo rede...")
@@ -66,17 +75,30 @@ def topology():
     
     print_progress("✅ Rede Wi-Fi mesh ativada com sucesso!")
 
+    # Modelo de propagação: RSSI = Potência_transmissão - FSPL - Perdas_adicionais
+    # 20 dBm de potência típica, 10 dB de perdas (paredes, obstáculos, etc.)
+    propagation = PropagationModel(tx_power=20, additional_losses=10, exp=path_loss_exp or 2.0,
+                                   shadowing=get_param('shadowing', 0.0), seed=get_param('seed'))
+    scheduler = create_scheduler()
+    ap_list = [modem, mesh1, mesh2]
+    ap_positions = node_positions(ap_list)
+    ap_index = APIndex.from_nodes(ap_list)
+    
+    # Mapa de cobertura opcional: RSSI lido da grade pré-calculada (cache em disco)
+    coverage = None
+    coverage_resolution = get_param('coverage_resolution')
+    if coverage_resolution:
+        print_progress("🗺️  Carregando mapa de cobertura...")
+        coverage = coverage_grid(topology_from_nodes(ap_list, propagation, resolution=coverage_resolution))
+    log_filename = 'rasp_car_scan_log.csv'
+
     # Função de escaneamento e log em CSV
     def scan_and_log():
         print_progress("📊 Iniciando sistema de escaneamento e log...")
-        log_filename = 'rasp_car_scan_log.csv'
         
-        with open(log_filename, 'w', newline='') as csvfile:
-            fieldnames = ['timestamp', 'position', 'ap', 'rssi', 'distance', 'latency', 'connected']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            total_scans = 10
+        fieldnames = ['timestamp', 'position', 'ap', 'rssi', 'distance', 'latency', 'connected']
+        with AsyncLogWriter(log_filename, fieldnames, columnar=get_param('columnar', False)) as writer:
+            total_scans = get_param('scans', 10)
             for i in range(total_scans):
                 print_progress(f"🔍 Escaneando rede (ciclo {i+1}/{total_scans})...", i+1, total_scans)
                 
@@ -92,39 +114,22 @@ def topology():
                 best_rssi = -999
                 best_distance = 999
                 
-                for ap in [modem, mesh1, mesh2]:
-                    try:
-                        # Calcular distância manualmente usando coordenadas
-                        rasp_pos = rasp.position
-                        rasp_x = rasp_pos[0]
-                        rasp_y = rasp_pos[1]
-                        rasp_z = rasp_pos[2]
-                        
-                        ap_pos = ap.position
-                        ap_x = ap_pos[0]
-                        ap_y = ap_pos[1]
-                        ap_z = ap_pos[2]
-                        
-                        distance = math.sqrt((rasp_x - ap_x)**2 + (rasp_y - ap_y)**2 + (rasp_z - ap_z)**2)
-                        if distance < 0.01:
-                            distance = 0.01  # evitar log(0)
-                        
-                        # RSSI mais realista baseado em modelo de propagação
-                        # RSSI = Potência_transmissão - Perdas_espaço_livre - Perdas_adicionais
-                        tx_power = 20  # dBm (potência de transmissão típica)
-                        freq = 2.4e9   # 2.4 GHz
-                        c = 3e8        # velocidade da luz
-                        fspl = 20 * math.log10(distance) + 20 * math.log10(freq) + 20 * math.log10(4 * math.pi / c)
-                        additional_losses = 10  # dB (paredes, obstáculos, etc.)
-                        rssi = tx_power - fspl - additional_losses
-                        
-                        if rssi > best_rssi:
-                            best_rssi = rssi
-                            best_ap = ap.name
-                            best_distance = distance
-                    except Exception as e:
-                        info(f"⚠️  Erro ao calcular RSSI para {ap.name}: {e}\n")
-                        continue
+                try:
+                    station = node_positions([rasp])
+                    if coverage is not None:
+                        # Consulta O(1) na grade; sombreamento aplicado por cima do valor médio
+                        idx, rssi, _ = coverage.lookup(station)
+                        if propagation.shadowing > 0:
+                            rssi = rssi + propagation.rng.normal(0.0, propagation.shadowing, rssi.shape)
+                        dist = propagation.distances(station, ap_positions[idx])[0]
+                    else:
+                        # RSSI só dos APs ao alcance (índice espacial, vetorizado)
+                        idx, rssi, dist = ap_index.best_ap(station, propagation)
+                    best_ap = ap_list[idx[0]].name
+                    best_rssi = float(rssi[0])
+                    best_distance = float(dist[0])
+                except Exception as e:
+                    info(f"⚠️  Erro ao calcular RSSI: {e}\n")
                 
                 # Calcular latência simulada baseada na distância
                 latency = 5 + (best_distance * 0.1) if best_distance < 999 else 999
@@ -134,7 +139,7 @@ def topology():
                 
                 if best_ap:
                     writer.writerow({
-                        'timestamp': time.time(), 
+                        'timestamp': scheduler.time(), 
                         'position': pos, 
                         'ap': best_ap, 
                         'rssi': round(best_rssi, 2),
@@ -142,13 +147,12 @@ def topology():
                         'latency': round(latency, 2),
                         'connected': connected
                     })
-                    csvfile.flush()
                     
                     # Mostrar resultado do scan de forma clara
                     status_icon = "🟢" if connected == "YES" else "🔴"
                     print_progress(f"{status_icon} Posição: {pos} | AP: {best_ap} | RSSI: {best_rssi:.1f} dBm | Dist: {best_distance:.1f}m | Lat: {latency:.1f}ms")
                 
-                time.sleep(2)
+                yield 2
         
         print_progress(f"💾 Log salvo em: {log_filename}")
         
@@ -162,27 +166,23 @@ def topology():
     # Função de mobilidade do rasp-car
     def move_rasp():
         print_progress("🚗 Iniciando mobilidade do Raspberry Pi...")
-        positions = [(15,25,0), (35,30,0), (55,30,0), (75,30,0), (35,30,0), (15,25,0)]
-        total_moves = 10
+        positions = get_param('waypoints', [(15,25,0), (35,30,0), (55,30,0), (75,30,0), (35,30,0), (15,25,0)])
+        total_moves = get_param('scans', 10)
         
         for i in range(total_moves):
             pos = positions[i % len(positions)]
             rasp.setPosition(f'{pos[0]},{pos[1]},{pos[2]}')
             print_progress(f"📍 Raspberry movido para: ({pos[0]}, {pos[1]}, {pos[2]})", i+1, total_moves)
-            time.sleep(3)
+            yield 3
         
         print_progress("🏁 Mobilidade concluída!")
 
-    print_progress("🔄 Iniciando threads de mobilidade e escaneamento...")
-    scan_thread = threading.Thread(target=scan_and_log, daemon=True)
-    move_thread = threading.Thread(target=move_rasp, daemon=True)
-    
-    scan_thread.start()
-    move_thread.start()
+    print_progress("🔄 Iniciando processos de mobilidade e escaneamento...")
+    scheduler.process(scan_and_log())
+    scheduler.process(move_rasp())
     
-    # Esperar as threads terminarem
-    scan_thread.join()
-    move_thread.join()
+    # Executar a simulação até os processos terminarem
+    scheduler.run()
     
     print_progress("🌐 Configurando conectividade de rede...")
     # Configurar IPs dos APs
@@ -201,7 +201,8 @@ def topology():
     try:
         # Iniciar servidor iperf no modem
         modem.cmd('iperf -s -t 5 &')
-        time.sleep(1)
+        if not is_analytic():
+            time.sleep(1)  # aguardar servidor iperf (apenas Mininet-WiFi real)
         # Teste de throughput do raspberry para o modem
         result = rasp.cmd('iperf -c 10.0.0.1 -t 3')
         print_progress(f"📊 Resultado do throughput: {result}")
@@ -210,6 +211,7 @@ def topology():
     
     print_progress("🛑 Finalizando simulação...")
     net.stop()
+    record_run('rasp_car_scan', [log_filename], aps=ap_list, started_at=run_started)
     print_progress("✅ Simulação Rasp-Car Scanner concluída com sucesso!")
 
 if __name__ == '__main__':
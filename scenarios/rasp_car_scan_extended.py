@@ -7,31 +7,39 @@ Cenário: Rasp-Car Scanner (Versão Estendida)
 - 1 Raspberry Pi móvel (station) que escaneia e loga sinais Wi-Fi em CSV
 - Versão com mais dados e posições variadas
 """
-from mininet.node import Controller
-from mininet.log import setLogLevel, info
-from mn_wifi.node import OVSKernelAP
-from mn_wifi.link import wmediumd
-from mn_wifi.cli import CLI
-from mn_wifi.net import Mininet_wifi
 import time
-import threading
-import csv
-import math
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from framework.backend import (Controller, setLogLevel, info, OVSKernelAP,
+                               wmediumd, CLI, Mininet_wifi)
+from framework.catalog import record_run
+from framework.clock import create_scheduler
+from framework.logwriter import AsyncLogWriter
+from framework.params import get_channels, get_param
+from framework.propagation import PropagationModel, node_positions
 
 
 def topology():
+    run_started = time.time()
+    
+    # Parâmetros da execução (FRAMEWORK_PARAMS); sem eles, valores padrão do cenário
+    ap_range = get_param('range', 58)
+    channels = get_channels()
+    path_loss_exp = get_param('exp')
+    
     net = Mininet_wifi(controller=Controller, link=wmediumd, accessPoint=OVSKernelAP)
     info("*** Criando nós\n")
     c0 = net.addController('c0', controller=Controller)
     # Modem principal (AP fixo)
-    modem = net.addAccessPoint('modem', ssid='Internet', mode='g', channel='1', position='10,30,0', range=58, dpid='1')
+    modem = net.addAccessPoint('modem', ssid='Internet', mode='g', channel=channels[0], position='10,30,0', range=ap_range, dpid='1')
     # Mesh routers
-    mesh1 = net.addAccessPoint('mesh1', ssid='MeshNet', mode='g', channel='6', position='40,30,0', range=58, dpid='2')
-    mesh2 = net.addAccessPoint('mesh2', ssid='MeshNet', mode='g', channel='11', position='70,30,0', range=58, dpid='3')
+    mesh1 = net.addAccessPoint('mesh1', ssid='MeshNet', mode='g', channel=channels[1], position='40,30,0', range=ap_range, dpid='2')
+    mesh2 = net.addAccessPoint('mesh2', ssid='MeshNet', mode='g', channel=channels[2], position='70,30,0', range=ap_range, dpid='3')
     # Raspberry Pi móvel - posição inicial diferente
     rasp = net.addStation('rasp', ip='10.0.0.10/24', position='25,25,0')
-    net.setPropagationModel(model="logDistance", exp=3.5)
+    net.setPropagationModel(model="logDistance", exp=path_loss_exp or 3.5)
     net.configureWifiNodes()
     net.build()
     c0.start()
@@ -39,14 +47,18 @@ def topology():
     mesh1.start([c0])
     mesh2.start([c0])
 
+    # Modelo de propagação (20 dBm de potência, 10 dB de perdas adicionais)
+    propagation = PropagationModel(tx_power=20, additional_losses=10, exp=path_loss_exp or 2.0,
+                                   shadowing=get_param('shadowing', 0.0), seed=get_param('seed'))
+    scheduler = create_scheduler()
+    ap_list = [modem, mesh1, mesh2]
+    log_filename = 'rasp_car_scan_extended_log.csv'
+
     # Função de escaneamento e log em CSV
     def scan_and_log():
-        log_filename = 'rasp_car_scan_extended_log.csv'
-        with open(log_filename, 'w', newline='') as csvfile:
-            fieldnames = ['timestamp', 'position', 'ap', 'rssi', 'distance', 'latency', 'connected', 'signal_quality']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for i in range(20):  # Mais iterações
+        fieldnames = ['timestamp', 'position', 'ap', 'rssi', 'distance', 'latency', 'connected', 'signal_quality']
+        with AsyncLogWriter(log_filename, fieldnames, columnar=get_param('columnar', False)) as writer:
+            for i in range(get_param('scans', 20)):  # 20 iterações por padrão
                 # Obter posição de forma mais segura
                 try:
                     pos = f"{rasp.params.get('x', 0)},{rasp.params.get('y', 0)},{rasp.params.get('z', 0)}"
@@ -57,36 +69,14 @@ def topology():
                 best_rssi = -999
                 best_distance = 999
                 
-                for ap in [modem, mesh1, mesh2]:
-                    try:
-                        # Calcular distância manualmente usando coordenadas
-                        rasp_x = float(rasp.params.get('x', 0))
-                        rasp_y = float(rasp.params.get('y', 0))
-                        rasp_z = float(rasp.params.get('z', 0))
-                        
-                        ap_x = float(ap.params.get('x', 0))
-                        ap_y = float(ap.params.get('y', 0))
-                        ap_z = float(ap.params.get('z', 0))
-                        
-                        distance = math.sqrt((rasp_x - ap_x)**2 + (rasp_y - ap_y)**2 + (rasp_z - ap_z)**2)
-                        if distance < 0.01:
-                            distance = 0.01  # evitar log(0)
-                        
-                        # RSSI mais realista baseado em modelo de propagação
-                        tx_power = 20  # dBm (potência de transmissão típica)
-                        freq = 2.4e9   # 2.4 GHz
-                        c = 3e8        # velocidade da luz
-                        fspl = 20 * math.log10(distance) + 20 * math.log10(freq) + 20 * math.log10(4 * math.pi / c)
-                        additional_losses = 10  # dB (paredes, obstáculos, etc.)
-                        rssi = tx_power - fspl - additional_losses
-                        
-                        if rssi > best_rssi:
-                            best_rssi = rssi
-                            best_ap = ap.name
-                            best_distance = distance
-                    except Exception as e:
-                        info(f"Erro ao calcular RSSI para {ap.name}: {e}\n")
-                        continue
+                try:
+                    # RSSI de todos os APs calculado de uma vez (modelo vetorizado)
+                    idx, rssi, dist = propagation.best_ap(node_positions([rasp]), node_positions(ap_list))
+                    best_ap = ap_list[idx[0]].name
+                    best_rssi = float(rssi[0])
+                    best_distance = float(dist[0])
+                except Exception as e:
+                    info(f"Erro ao calcular RSSI: {e}\n")
                 
                 # Calcular latência simulada baseada na distância
                 latency = 5 + (best_distance * 0.1) if best_distance < 999 else 999
@@ -106,7 +96,7 @@ def topology():
                 
                 if best_ap:
                     writer.writerow({
-                        'timestamp': time.time(), 
+                        'timestamp': scheduler.time(), 
                         'position': pos, 
                         'ap': best_ap, 
                         'rssi': round(best_rssi, 2),
@@ -115,9 +105,8 @@ def topology():
                         'connected': connected,
                         'signal_quality': signal_quality
                     })
-                    csvfile.flush()
                     info(f"Log: {pos} -> {best_ap} (RSSI: {best_rssi:.1f} dBm, Dist: {best_distance:.1f}m, Lat: {latency:.1f}ms, Conn: {connected}, Quality: {signal_quality})\n")
-                time.sleep(1)  # Mais rápido
+                yield 1  # Mais rápido
         # Corrigir permissão do arquivo para o usuário normal
         try:
             os.system(f'chown $SUDO_USER:$SUDO_USER {log_filename}')
@@ -126,28 +115,24 @@ def topology():
 
     # Função de mobilidade do rasp-car com mais posições
     def move_rasp():
-        positions = [
+        positions = get_param('waypoints', [
             (25,25,0), (35,30,0), (45,30,0), (55,30,0), (65,30,0), (75,30,0),
             (65,30,0), (55,30,0), (45,30,0), (35,30,0), (25,25,0), (15,25,0),
             (25,25,0), (35,30,0), (45,30,0), (55,30,0), (65,30,0), (75,30,0),
             (65,30,0), (55,30,0)
-        ]
-        for i in range(20):  # Mais iterações
+        ])
+        for i in range(get_param('scans', 20)):
             pos = positions[i % len(positions)]
             rasp.setPosition(f'{pos[0]},{pos[1]},{pos[2]}')
             info(f"Raspberry movido para: {pos}\n")
-            time.sleep(1.5)  # Mais rápido
+            yield 1.5  # Mais rápido
 
-    info("*** Iniciando threads de mobilidade e escaneamento\n")
-    scan_thread = threading.Thread(target=scan_and_log, daemon=True)
-    move_thread = threading.Thread(target=move_rasp, daemon=True)
-    
-    scan_thread.start()
-    move_thread.start()
+    info("*** Iniciando processos de mobilidade e escaneamento\n")
+    scheduler.process(scan_and_log())
+    scheduler.process(move_rasp())
     
-    # Esperar as threads terminarem
-    scan_thread.join()
-    move_thread.join()
+    # Executar a simulação até os processos terminarem
+    scheduler.run()
     
     info("*** Configurando conectividade\n")
     # Configurar IPs dos APs
@@ -163,6 +148,7 @@ def topology():
     
     info("*** Parando rede\n")
     net.stop()
+    record_run('rasp_car_scan_extended', [log_filename], aps=ap_list, started_at=run_started)
 
 if __name__ == '__main__':
     setLogLevel('info')
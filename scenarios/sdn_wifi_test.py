@@ -9,76 +9,297 @@ Este script demonstra validação de soluções SDN em redes Wi-Fi:
 - Balanceamento de carga entre APs
 - Monitoramento centralizado de performance
 
+O controlador é dirigido por eventos (framework.events): associação,
+desassociação, mudança de posição e de QoS são despachadas na hora para
+handlers que recalculam só os APs/clientes afetados e emitem métricas
+apenas quando elas mudam.
+
+A escolha de AP é feita pelo balanceador de carga (framework.loadbalance):
+admissão pelo menor custo sinal x carga entre os APs ao alcance (índice
+espacial), handoff com histerese quando uma estação se move e
+rebalanceamento quando um AP passa de OVERLOAD_UTILIZATION.
+
+As políticas QoS são compiladas (framework.qos) em HTB por cliente na
+interface de cada AP e TBF no uplink das estações; no backend analítico
+o mesmo plano é simulado com token buckets e a latência por classe é
+comparada com uma fila FIFO sem QoS, sob carga da classe de baixa
+prioridade.
+
 Autor: Framework Mininet-WiFi
 Data: 2024
 """
 
-from mininet.node import Controller
-from mininet.log import setLogLevel, info
-from mininet.wifi.node import OVSKernelAP
-from mininet.wifi.link import wmediumd, _4address
-from mininet.wifi.cli import CLI_wifi
-from mininet.wifi.net import Mininet_wifi
-from mininet.wifi.wmediumdConnector import interference
-import time
-import threading
-import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from framework.backend import (Controller, setLogLevel, info, OVSKernelAP,
+                               wmediumd, CLI, Mininet_wifi, is_analytic)
+from framework.clock import create_scheduler
+from framework.events import EventBus
+from framework.loadbalance import LoadBalancer
+from framework.params import get_param
+from framework.propagation import PropagationModel, node_positions, node_ranges
+from framework.qos import (HTBShaper, bucket_burst, compile_plan, policy_bandwidth,
+                           simulate_link, tbf_commands)
+from framework.spatial import APIndex
+
+OVERLOAD_UTILIZATION = 0.8      # utilização que dispara o rebalanceamento
+CONTRACT_LOAD = 0.8             # fração da banda contratada oferecida no teste de QoS
 
 
 class SDNController(Controller):
-    """Controlador SDN personalizado para redes Wi-Fi"""
+    """Controlador SDN personalizado para redes Wi-Fi (dirigido por eventos)"""
     
     def __init__(self, name, **kwargs):
         super().__init__(name, **kwargs)
-        self.ap_loads = {}
-        self.client_connections = {}
+        self.bus = EventBus()
+        self.balancer = LoadBalancer(capacity=get_param('ap_capacity', 54.0))
+        self.propagation = PropagationModel(tx_power=20, additional_losses=10)
+        self.ap_index = APIndex(np.empty((0, 3)))
+        self.ap_loads = {}            # AP -> nó
+        self.stations = {}            # estação -> nó
+        self.client_connections = self.balancer.clients  # AP -> conjunto de clientes
+        self.client_ap = self.balancer.client_ap         # cliente -> AP
         self.qos_policies = {}
+        self.qos_shapers = {}         # AP -> árvore HTB instalada (HTBShaper)
+        self.positions = {}           # nó -> (x, y, z)
+        self.ap_metrics = {}          # AP -> métricas emitidas por último
+        self.client_metrics = {}      # cliente -> métricas emitidas por último
+
+        self.bus.subscribe('associate', self.on_associate)
+        self.bus.subscribe('disassociate', self.on_disassociate)
+        self.bus.subscribe('position', self.on_position)
+        self.bus.subscribe('qos', self.on_qos)
+        self.bus.subscribe('ap_metrics', self.log_ap_metrics)
+        self.bus.subscribe('ap_metrics', self.on_ap_metrics)
+        self.bus.subscribe('client_metrics', self.log_client_metrics)
     
     def start(self):
         """Inicia o controlador SDN"""
         info(f"*** Iniciando controlador SDN: {self.name}\n")
         super().start()
-        self.start_sdn_monitoring()
-    
-    def start_sdn_monitoring(self):
-        """Inicia monitoramento SDN"""
-        info("*** Iniciando monitoramento SDN\n")
-        
-        # Thread para monitorar carga dos APs
-        def monitor_ap_loads():
-            while True:
-                for ap_name, ap in self.ap_loads.items():
-                    load = len(self.client_connections.get(ap_name, []))
-                    info(f"*** {ap_name}: {load} clientes conectados\n")
-                time.sleep(10)
-        
-        # Thread para aplicar políticas QoS
-        def apply_qos_policies():
-            while True:
-                for client, policy in self.qos_policies.items():
-                    info(f"*** Aplicando QoS para {client}: {policy}\n")
-                time.sleep(15)
-        
-        # Iniciar threads de monitoramento
-        threading.Thread(target=monitor_ap_loads, daemon=True).start()
-        threading.Thread(target=apply_qos_policies, daemon=True).start()
     
+    # Registro e publicação de eventos
     def register_ap(self, ap_name, ap):
         """Registra um AP no controlador"""
         self.ap_loads[ap_name] = ap
-        self.client_connections[ap_name] = []
+        self.balancer.add_ap(ap_name)
+        self.positions[ap_name] = tuple(node_positions([ap])[0])
+        self.ap_index.add(self.positions[ap_name], node_ranges([ap])[0], ap_name)
+        self.qos_shapers[ap_name] = HTBShaper(f'{ap_name}-wlan1', self.balancer.capacity[ap_name])
+        for command in self.qos_shapers[ap_name].setup():
+            ap.cmd(command)
         info(f"*** AP {ap_name} registrado no controlador SDN\n")
+        self._update_ap(ap_name)
+
+    def register_station(self, station):
+        """Registra a posição inicial de uma estação"""
+        self.stations[station.name] = station
+        self.positions[station.name] = tuple(node_positions([station])[0])
     
     def register_client(self, ap_name, client_name):
         """Registra um cliente conectado a um AP"""
         if ap_name in self.client_connections:
-            self.client_connections[ap_name].append(client_name)
-            info(f"*** Cliente {client_name} conectado ao {ap_name}\n")
+            self.bus.publish('associate', client=client_name, ap=ap_name)
+
+    def admit(self, client_name):
+        """Associa o cliente ao AP de menor custo sinal x carga; retorna o AP"""
+        ap_name, _ = self.balancer.choose(client_name, self.rssi_map(client_name))
+        if ap_name is not None:
+            self.register_client(ap_name, client_name)
+        return ap_name
+
+    def rssi_map(self, client_name):
+        """{AP: RSSI} dos APs ao alcance do cliente (consulta ao índice espacial)"""
+        idx, dist = self.ap_index.neighbors(self.positions[client_name])
+        if not idx.size:
+            return {}
+        rssi = self.propagation.rssi_from_distance(np.maximum(dist, self.propagation.min_distance)[np.newaxis, :],
+                                                   ap_index=idx)[0]
+        return {self.ap_index.names[i]: float(value) for i, value in zip(idx, rssi)}
+
+    def unregister_client(self, client_name):
+        """Remove a associação de um cliente"""
+        self.bus.publish('disassociate', client=client_name)
+
+    def move(self, node, position):
+        """Move um nó na rede e publica a nova posição"""
+        node.setPosition(','.join(str(value) for value in position))
+        self.bus.publish('position', node=node.name, position=tuple(float(value) for value in position))
     
     def set_qos_policy(self, client, policy):
         """Define política QoS para um cliente"""
-        self.qos_policies[client] = policy
-        info(f"*** Política QoS definida para {client}: {policy}\n")
+        self.bus.publish('qos', client=client, policy=policy)
+
+    # Handlers
+    def on_associate(self, event):
+        old_ap = self.balancer.assign(event.client, event.ap)
+        if old_ap != event.ap:
+            self._associated(event.client, old_ap, event.ap)
+
+    def _associated(self, client, old_ap, ap_name):
+        # Estado do balanceador já atualizado: aplica na rede e recalcula métricas
+        station = self.stations.get(client)
+        if station is not None:
+            try:
+                station.setAssociation(self.ap_loads[ap_name], intf=f'{client}-wlan0')
+            except Exception as e:
+                info(f"*** Falha ao reassociar {client} ao {ap_name}: {e}\n")
+        info(f"*** Cliente {client} conectado ao {ap_name}\n")
+        if old_ap is not None:
+            self._update_ap(old_ap)
+        self._update_ap(ap_name)
+        self._update_client(client)
+
+    def on_disassociate(self, event):
+        ap_name = self.balancer.release(event.client)
+        if ap_name is None:
+            return
+        info(f"*** Cliente {event.client} desconectado do {ap_name}\n")
+        self._update_ap(ap_name)
+        self._update_client(event.client)
+
+    def on_position(self, event):
+        self.positions[event.node] = event.position
+        if event.node in self.client_connections:
+            # AP móvel: reindexa e reavalia só os seus clientes
+            self.ap_index.move(self.ap_index.index_of[event.node], event.position)
+            clients = list(self.client_connections[event.node])
+        elif event.node in self.client_ap:
+            clients = [event.node]
+        else:
+            return
+        for client in clients:
+            target = self.balancer.handoff(client, self.rssi_map(client))
+            if target is not None:
+                info(f"*** Handoff SDN: {client} {self.client_ap[client]} -> {target}\n")
+                self.bus.publish('associate', client=client, ap=target)
+            else:
+                self._update_client(client)
+
+    def on_qos(self, event):
+        self.qos_policies[event.client] = event.policy
+        rate = policy_bandwidth(event.policy)
+        self.balancer.set_demand(event.client, rate, event.policy.get('priority'))
+        info(f"*** Política QoS definida para {event.client}: {event.policy}\n")
+        station = self.stations.get(event.client)
+        if station is not None:
+            # Uplink da estação limitado à banda contratada
+            for command in tbf_commands(f'{event.client}-wlan0', rate, bucket_burst(rate)):
+                station.cmd(command)
+        if event.client in self.client_ap:
+            self._update_ap(self.client_ap[event.client])
+
+    def on_ap_metrics(self, event):
+        # AP sobrecarregado: migra clientes de menor prioridade para APs ao alcance
+        if self.balancer.utilization(event.ap) < OVERLOAD_UTILIZATION:
+            return
+        for client, source, destination in self.balancer.rebalance(self.rssi_map):
+            info(f"*** Rebalanceamento: {client} {source} -> {destination}\n")
+            self._associated(client, source, destination)
+
+    # Métricas recalculadas só para o AP/cliente afetado
+    def _update_ap(self, ap_name):
+        clients = self.client_connections[ap_name]
+        self._apply_qos(ap_name)
+        metrics = {
+            'clients': len(clients),
+            'bandwidth_mbps': round(self.balancer.load[ap_name], 3),
+            'utilization': round(self.balancer.utilization(ap_name), 3)
+        }
+        if self.ap_metrics.get(ap_name) != metrics:
+            self.ap_metrics[ap_name] = metrics
+            self.bus.publish('ap_metrics', ap=ap_name, **metrics)
+
+    def _update_client(self, client):
+        ap_name = self.client_ap.get(client)
+        metrics = {'ap': ap_name, 'latency_ms': None}
+        if ap_name is not None and client in self.positions:
+            distance = sum((a - b) ** 2 for a, b in zip(self.positions[client], self.positions[ap_name])) ** 0.5
+            # Latência simulada baseada na distância até o AP associado
+            metrics['latency_ms'] = round(5 + distance * 0.1, 1)
+        if self.client_metrics.get(client) != metrics:
+            self.client_metrics[client] = metrics
+            self.bus.publish('client_metrics', client=client, **metrics)
+
+    # Aplicação de QoS (HTB no downlink de cada AP)
+    def _apply_qos(self, ap_name):
+        policies = {client: self.qos_policies[client]
+                    for client in sorted(self.client_connections[ap_name]) if client in self.qos_policies}
+        addresses = {client: str(self.stations[client].params.get('ip', '')).split('/')[0] or None
+                     for client in policies if client in self.stations}
+        shaper = self.qos_shapers[ap_name]
+        # Só a diferença (tc class add/change/del): classids e contadores dos demais clientes ficam
+        commands = shaper.update(compile_plan(policies, addresses, self.balancer.capacity[ap_name]))
+        if not commands:
+            return
+        for command in commands:
+            self.ap_loads[ap_name].cmd(command)
+        plan = shaper.plan()
+        if plan:
+            classes = ', '.join(f"{entry['client']}={entry['qos_class']}/{entry['rate']:g}Mbps"
+                                f" ({entry['classid']})" for entry in plan)
+            info(f"*** QoS {ap_name}: {classes}\n")
+
+    def class_counters(self):
+        """{AP: (geração do plano, {(classid, serial): (classe, bytes)})} dos contadores HTB"""
+        counters = {}
+        for ap_name, shaper in self.qos_shapers.items():
+            output = self.ap_loads[ap_name].cmd(f'tc -s class show dev {shaper.intf}') or ''
+            counters[ap_name] = (shaper.generation, shaper.counters(output))
+        return counters
+
+    def report_qos(self, before, elapsed, duration=2.0):
+        """Vazão por classe no intervalo (contadores tc) ou simulação do plano no modo analítico"""
+        if is_analytic():
+            self.simulate_qos(duration)
+            return
+        after = self.class_counters()
+        for ap_name, (generation, classes) in sorted(after.items()):
+            before_generation, before_classes = before.get(ap_name, (generation, {}))
+            # Classe criada durante a janela começa em zero; classe removida não é lida
+            totals = {}
+            for key, (qos_class, sent) in classes.items():
+                previous = before_classes.get(key, (qos_class, 0))[1]
+                totals[qos_class] = totals.get(qos_class, 0) + sent - previous
+            note = " (plano alterado durante a medição)" if generation != before_generation else ""
+            for qos_class, sent in sorted(totals.items()):
+                info(f"*** {ap_name} [{qos_class}]: {sent * 8 / max(elapsed, 1e-9) / 1e6:.2f}Mbps{note}\n")
+
+    def simulate_qos(self, duration=2.0):
+        """Latência por classe com e sem QoS, com a classe 'low' saturando o enlace"""
+        for ap_name, shaper in sorted(self.qos_shapers.items()):
+            plan = shaper.plan()
+            if not plan:
+                continue
+            capacity = self.balancer.capacity[ap_name]
+            offered = {entry['client']: capacity if entry['qos_class'] == 'low' else entry['rate'] * CONTRACT_LOAD
+                       for entry in plan}
+            enforced = simulate_link(plan, offered, capacity, duration, enforce=True, seed=0)
+            fifo = simulate_link(plan, offered, capacity, duration, enforce=False, seed=0)
+            for qos_class, metrics in enforced.items():
+                with_qos, without_qos = metrics['latency_ms'], fifo[qos_class]['latency_ms']
+                info(f"*** {ap_name} [{qos_class}]: {metrics['throughput_mbps']:.2f}/"
+                     f"{metrics['offered_mbps']:.2f}Mbps, p99 {with_qos['p99'] or 0:.1f}ms com QoS "
+                     f"vs {without_qos['p99'] or 0:.1f}ms sem QoS\n")
+
+    def log_ap_metrics(self, event):
+        info(f"*** {event.ap}: {event.clients} clientes, {event.bandwidth_mbps:g}Mbps total "
+             f"({event.utilization:.0%} da capacidade)\n")
+
+    def log_client_metrics(self, event):
+        if event.ap is None:
+            info(f"*** {event.client}: sem associação\n")
+        elif event.latency_ms is not None:
+            info(f"*** {event.client} ({event.ap}) latência: {event.latency_ms:.1f}ms\n")
+
+    def report_latency(self):
+        """Latência de reação do controlador por tipo de evento"""
+        for event_type, (count, mean_ms, max_ms) in sorted(self.bus.latency_summary().items()):
+            info(f"*** {event_type}: {count} eventos, reação média {mean_ms:.3f}ms (máx {max_ms:.3f}ms)\n")
 
 
 def topology():
@@ -139,11 +360,16 @@ def topology():
     sdn_controller.start()
     
     # Registrar APs no controlador
-    for ap in [ap1, ap2, ap3]:
+    ap_list = [ap1, ap2, ap3]
+    sta_list = [sta1, sta2, sta3, sta4, sta5]
+    for ap in ap_list:
         sdn_controller.register_ap(ap.name, ap)
         ap.start([sdn_controller])
     
-    # Definir políticas QoS
+    for sta in sta_list:
+        sdn_controller.register_station(sta)
+
+    # Definir políticas QoS (antes da admissão: a classe entra no custo)
     info("*** Definindo políticas QoS\n")
     sdn_controller.set_qos_policy('sta1', {'priority': 'high', 'bandwidth': '10Mbps'})
     sdn_controller.set_qos_policy('sta2', {'priority': 'high', 'bandwidth': '10Mbps'})
@@ -151,111 +377,65 @@ def topology():
     sdn_controller.set_qos_policy('sta4', {'priority': 'low', 'bandwidth': '2Mbps'})
     sdn_controller.set_qos_policy('sta5', {'priority': 'iot', 'bandwidth': '1Mbps', 'latency': 'low'})
     
-    # Função para simular balanceamento de carga
-    def simulate_load_balancing():
-        """Simula balanceamento de carga entre APs"""
-        info("*** Iniciando balanceamento de carga SDN\n")
-        while True:
-            # Calcular carga de cada AP
-            loads = {}
-            for ap_name in ['ap1', 'ap2', 'ap3']:
-                loads[ap_name] = len(sdn_controller.client_connections.get(ap_name, []))
-            
-            # Encontrar AP com menor carga
-            min_load_ap = min(loads, key=loads.get)
-            info(f"*** AP com menor carga: {min_load_ap} ({loads[min_load_ap]} clientes)\n")
-            
-            # Simular migração de clientes
-            for ap_name, load in loads.items():
-                if load > 2:  # Se AP tem mais de 2 clientes
-                    info(f"*** Migrando clientes do {ap_name} para {min_load_ap}\n")
-            
-            time.sleep(20)
-    
-    # Iniciar thread de balanceamento
-    load_balancing_thread = threading.Thread(target=simulate_load_balancing)
-    load_balancing_thread.daemon = True
-    load_balancing_thread.start()
-    
-    # Função para monitorar performance SDN
-    def monitor_sdn_performance():
-        """Monitora performance da rede SDN"""
-        info("*** Monitorando performance SDN\n")
-        while True:
-            # Monitorar throughput por AP
-            for ap_name in ['ap1', 'ap2', 'ap3']:
-                clients = sdn_controller.client_connections.get(ap_name, [])
-                total_bandwidth = len(clients) * 5  # 5Mbps por cliente
-                info(f"*** {ap_name}: {len(clients)} clientes, {total_bandwidth}Mbps total\n")
-            
-            # Monitorar latência
-            for sta in [sta1, sta2, sta3, sta4, sta5]:
-                # Simular latência baseada na distância do AP
-                latency = 5 + (sta.getDistanceTo(ap1) * 0.1)
-                info(f"*** {sta.name} latência: {latency:.1f}ms\n")
+    # Associação inicial: admissão pelo balanceador de carga
+    info("*** Associando estações\n")
+    for sta in sta_list:
+        if sdn_controller.admit(sta.name) is None:
+            info(f"*** {sta.name}: nenhum AP ao alcance\n")
             
-            time.sleep(15)
-    
-    # Iniciar thread de monitoramento
-    performance_thread = threading.Thread(target=monitor_sdn_performance)
-    performance_thread.daemon = True
-    performance_thread.start()
+    scheduler = create_scheduler()
+    total_cycles = get_param('cycles', 5)
     
     # Função para testar políticas QoS
     def test_qos_policies():
         """Testa aplicação de políticas QoS"""
         info("*** Testando políticas QoS\n")
-        while True:
+        for _ in range(total_cycles):
+            counters, started = sdn_controller.class_counters(), scheduler.now()
             # Teste de throughput com QoS
             info("*** Teste de throughput com QoS alta prioridade\n")
             sta1.cmd('iperf -s -t 10 &')
-            time.sleep(2)
+            yield 2
             result1 = sta2.cmd('iperf -c 10.0.0.1 -t 8')
             info(f"Throughput alta prioridade: {result1}\n")
             
-            time.sleep(5)
+            yield 5
             
             # Teste de throughput com QoS baixa prioridade
             info("*** Teste de throughput com QoS baixa prioridade\n")
             sta3.cmd('iperf -s -t 10 &')
-            time.sleep(2)
+            yield 2
             result2 = sta4.cmd('iperf -c 10.0.0.3 -t 8')
             info(f"Throughput baixa prioridade: {result2}\n")
             
-            time.sleep(20)
+            # Vazão e latência por classe de QoS
+            info("*** Aplicação de QoS por classe\n")
+            sdn_controller.report_qos(counters, scheduler.now() - started, get_param('qos_duration', 2.0))
     
-    # Iniciar thread de teste QoS
-    qos_thread = threading.Thread(target=test_qos_policies)
-    qos_thread.daemon = True
-    qos_thread.start()
+            yield 20
     
     # Função para simular mobilidade com handoff SDN
     def simulate_sdn_handoff():
         """Simula handoff controlado por SDN"""
         info("*** Simulando handoff controlado por SDN\n")
-        while True:
-            # Mover dispositivos para testar handoff
-            positions = [
-                (25, 25),  # Próximo ao AP1
-                (65, 25),  # Próximo ao AP2
-                (45, 55),  # Próximo ao AP3
-            ]
-            
+        # Pontos para testar handoff
+        positions = [
+            (25, 25, 0),  # Próximo ao AP1
+            (65, 25, 0),  # Próximo ao AP2
+            (45, 55, 0),  # Próximo ao AP3
+        ]
+        for cycle in range(total_cycles):
             for i, sta in enumerate([sta1, sta2, sta3]):
-                pos = positions[i % 3]
-                net.get(sta.name).setPosition(f'{pos[0]},{pos[1]},0')
-                info(f"*** {sta.name} movido para posição {pos} (handoff SDN)\n")
+                pos = positions[(i + cycle) % 3]
+                info(f"*** {sta.name} movido para posição {pos[:2]} (handoff SDN)\n")
+                # A mudança de posição é um evento: o controlador reage na hora
+                sdn_controller.move(net.get(sta.name), pos)
             
-            time.sleep(12)
-    
-    # Iniciar thread de handoff
-    handoff_thread = threading.Thread(target=simulate_sdn_handoff)
-    handoff_thread.daemon = True
-    handoff_thread.start()
-    
-    # Aguardar estabilização
-    info("*** Aguardando estabilização da rede SDN\n")
-    time.sleep(10)
+            yield 12
+            
+    scheduler.process(test_qos_policies())
+    scheduler.process(simulate_sdn_handoff())
+    scheduler.run()
     
     # Testar conectividade
     info("*** Testando conectividade SDN\n")
@@ -270,10 +450,12 @@ def topology():
     info("- STA1-2: Dispositivos alta prioridade (QoS premium)\n")
     info("- STA3-4: Dispositivos baixa prioridade (QoS básica)\n")
     info("- STA5: Dispositivo IoT (QoS específica)\n")
+    info("*** Latência de reação do controlador:\n")
+    sdn_controller.report_latency()
     
     # Iniciar CLI interativa
     info("*** Iniciando CLI interativa SDN\n")
-    CLI_wifi(net)
+    CLI(net)
     
     # Limpeza
     info("*** Parando rede SDN\n")
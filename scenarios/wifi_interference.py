@@ -22,7 +22,17 @@ from mininet.wifi.net import Mininet_wifi
 from mininet.wifi.wmediumdConnector import interference
 import time
 import threading
-import math
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from framework.interference import InterferenceEngine
+from framework.propagation import PropagationModel, node_positions
+
+SINR_THRESHOLD = 10.0    # dB, abaixo disso o enlace é considerado degradado
+MAX_WEAK_STATIONS = 10   # estações com SINR baixo listadas por ciclo
 
 
 def topology():
@@ -86,45 +96,38 @@ def topology():
     for ap in [ap1, ap2, ap3, ap4, ap5]:
         ap.start([c0])
     
-    # Função para calcular interferência
-    def calculate_interference(sta, ap_list):
-        """Calcula nível de interferência para um dispositivo"""
-        total_interference = 0
-        for ap in ap_list:
-            distance = sta.getDistanceTo(ap)
-            if distance > 0:
-                # Modelo de interferência baseado em distância
-                interference_power = 20 * math.log10(1 / distance)
-                total_interference += interference_power
-        return total_interference
+    # Motor de interferência: SINR de todas as estações para todos os APs
+    # (sobreposição entre canais de 2.4 GHz, uma multiplicação de matrizes)
+    ap_list = [ap1, ap2, ap3, ap4, ap5]
+    sta_list = [sta1, sta2, sta3, sta4, sta5]
+    propagation = PropagationModel(tx_power=20, additional_losses=10)
+    engine = InterferenceEngine(propagation, node_positions(ap_list),
+                                [ap.params['channel'] for ap in ap_list])
+    engine.set_stations(node_positions(sta_list))
     
     # Função para monitorar RSSI e interferência
     def monitor_interference():
-        """Monitora RSSI e interferência em tempo real"""
+        """Monitora SINR por canal, recalculando só as estações que se moveram"""
         info("*** Monitorando RSSI e interferência\n")
         while True:
-            for sta in [sta1, sta2, sta3, sta4, sta5]:
-                info(f"\n--- {sta.name} ---\n")
-                
-                # Calcular RSSI para cada AP
-                for ap in [ap1, ap2, ap3, ap4, ap5]:
-                    distance = sta.getDistanceTo(ap)
-                    if distance > 0:
-                        # RSSI baseado em distância e potência de transmissão
-                        rssi = -50 - (20 * math.log10(distance))
-                        
-                        # Adicionar interferência se no mesmo canal
-                        interference_level = 0
-                        if ap in [ap1, ap2] and ap != ap1:  # Canal 1
-                            interference_level = calculate_interference(sta, [ap1, ap2])
-                        elif ap in [ap3, ap4] and ap != ap3:  # Canal 6
-                            interference_level = calculate_interference(sta, [ap3, ap4])
-                        
-                        final_rssi = rssi - interference_level
-                        
-                        status = "✓" if final_rssi > -70 else "✗"
-                        info(f"{status} {ap.name} (Canal {ap.params['channel']}): "
-                             f"RSSI={final_rssi:.1f} dBm, Dist={distance:.1f}m\n")
+            moved = engine.update_stations(node_positions(sta_list))
+            idx, rssi, sinr = engine.best()
+            info(f"\n--- {len(sta_list)} estações x {len(ap_list)} APs "
+                 f"({moved} estações atualizadas) ---\n")
+            for channel, stats in engine.channel_summary(threshold=SINR_THRESHOLD).items():
+                sinr_mean = f"{stats['sinr_mean']:.1f}" if stats['sinr_mean'] is not None else '-'
+                sinr_min = f"{stats['sinr_min']:.1f}" if stats['sinr_min'] is not None else '-'
+                info(f"📡 Canal {channel}: {stats['aps']} APs | {stats['stations']} estações | "
+                     f"SINR médio/mín: {sinr_mean}/{sinr_min} dB | "
+                     f"enlaces OK: {stats['links_ok']}/{stats['links']}\n")
+            
+            # Listar só as estações com SINR abaixo do limiar
+            weak = np.flatnonzero(sinr < SINR_THRESHOLD)
+            for i in weak[:MAX_WEAK_STATIONS]:
+                info(f"✗ {sta_list[i].name} -> {ap_list[idx[i]].name}: "
+                     f"RSSI={rssi[i]:.1f} dBm, SINR={sinr[i]:.1f} dB\n")
+            if weak.size > MAX_WEAK_STATIONS:
+                info(f"✗ ... e mais {weak.size - MAX_WEAK_STATIONS} estações com SINR baixo\n")
             
             time.sleep(10)
     
@@ -2,147 +2,205 @@
 """
 Script para mostrar todos os logs gerados e suas estatísticas
 """
+import argparse
 import os
-import json
 import csv
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+from framework.catalog import RunCatalog, file_format, file_kind
+from framework.jsonlog import is_json_log, iter_json_log, read_json_log_header
+from framework.stats import RunningStats
+
+LOG_FORMATS = ('csv', 'json', 'jsonl', 'jsonl.gz')
+AP_COLUMNS = ('ap', 'best_ap')
 
 def analyze_csv_log(filename):
-    """Analisa um log CSV"""
+    """Analisa um log CSV em uma única passada, sem manter as linhas em memória"""
     if not os.path.exists(filename):
         return None
     
-    with open(filename, 'r') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-    
-    if not rows:
+    with open(filename, 'r', newline='') as f:
+        reader = csv.reader(f)
+        columns = next(reader, None)
+        if not columns:
+            return None
+        rssi_index = columns.index('rssi') if 'rssi' in columns else None
+        ap_column = next((name for name in AP_COLUMNS if name in columns), None)
+        ap_index = columns.index(ap_column) if ap_column else None
+        
+        total_records = 0
+        first_row = last_row = None
+        rssi = RunningStats()
+        ap_counts = {}
+        for row in reader:
+            if not row:
+                continue
+            if first_row is None:
+                first_row = row
+            last_row = row
+            total_records += 1
+            if rssi_index is not None and rssi_index < len(row) and row[rssi_index]:
+                try:
+                    rssi.add(float(row[rssi_index]))
+                except ValueError:
+                    pass
+            if ap_index is not None:
+                ap = row[ap_index] if ap_index < len(row) else 'unknown'
+                ap_counts[ap] = ap_counts.get(ap, 0) + 1
+    
+    if not total_records:
         return None
     
     # Estatísticas básicas
     stats = {
         'filename': filename,
         'format': 'CSV',
-        'total_records': len(rows),
-        'columns': list(rows[0].keys()) if rows else [],
-        'first_record': rows[0] if rows else None,
-        'last_record': rows[-1] if rows else None
+        'total_records': total_records,
+        'columns': columns,
+        'first_record': dict(zip(columns, first_row)),
+        'last_record': dict(zip(columns, last_row))
     }
     
     # Análise de RSSI se disponível
-    if 'rssi' in rows[0]:
-        rssi_values = [float(row['rssi']) for row in rows if row['rssi']]
+    if rssi_index is not None:
         stats['rssi_stats'] = {
-            'min': min(rssi_values) if rssi_values else None,
-            'max': max(rssi_values) if rssi_values else None,
-            'avg': sum(rssi_values) / len(rssi_values) if rssi_values else None
+            'min': rssi.minimum,
+            'max': rssi.maximum,
+            'avg': rssi.mean
         }
     
     # Análise de APs
-    if 'ap' in rows[0]:
-        ap_counts = {}
-        for row in rows:
-            ap = row.get('ap', 'unknown')
-            ap_counts[ap] = ap_counts.get(ap, 0) + 1
+    if ap_counts:
         stats['ap_distribution'] = ap_counts
     
     return stats
 
 def analyze_json_log(filename):
-    """Analisa um log JSON"""
+    """Analisa um log JSON (.json, .jsonl ou .jsonl.gz), um registro por vez"""
     if not os.path.exists(filename):
         return None
     
-    with open(filename, 'r') as f:
-        data = json.load(f)
-    
+    header = read_json_log_header(filename)
     stats = {
         'filename': filename,
-        'format': 'JSON',
-        'scenario': data.get('scenario', 'Unknown'),
-        'description': data.get('description', 'No description'),
-        'total_iterations': data.get('total_iterations', 0),
-        'total_records': len(data.get('logs', [])),
-        'structure': list(data.keys())
+        'format': 'JSONL' if '.jsonl' in filename else 'JSON',
+        'scenario': header.get('scenario', 'Unknown'),
+        'description': header.get('description', 'No description'),
+        'total_iterations': header.get('total_iterations', 0),
+        'total_records': 0,
+        'structure': list(header.keys())
     }
     
-    # Análise dos logs se disponível
-    logs = data.get('logs', [])
-    if logs:
-        stats['first_record'] = logs[0]
-        stats['last_record'] = logs[-1]
-        
-        # Análise de RSSI
-        rssi_values = []
-        ap_counts = {}
-        
-        for log in logs:
-            best_ap = log.get('best_ap')
-            if best_ap and 'rssi' in best_ap:
-                rssi_values.append(best_ap['rssi'])
-                ap_name = best_ap.get('name', 'unknown')
-                ap_counts[ap_name] = ap_counts.get(ap_name, 0) + 1
-        
-        if rssi_values:
-            stats['rssi_stats'] = {
-                'min': min(rssi_values),
-                'max': max(rssi_values),
-                'avg': sum(rssi_values) / len(rssi_values)
-            }
+    # Estatísticas acumuladas em uma passada, sem manter os registros em memória
+    rssi = RunningStats()
+    ap_counts = {}
+    
+    for _, log in iter_json_log(filename):
+        if stats['total_records'] == 0:
+            stats['first_record'] = log
+        stats['last_record'] = log
+        stats['total_records'] += 1
         
-        if ap_counts:
-            stats['ap_distribution'] = ap_counts
+        best_ap = log.get('best_ap')
+        if best_ap and 'rssi' in best_ap:
+            rssi.add(best_ap['rssi'])
+            ap_name = best_ap.get('name', 'unknown')
+            ap_counts[ap_name] = ap_counts.get(ap_name, 0) + 1
+    
+    if not stats['total_iterations']:
+        stats['total_iterations'] = stats['total_records']
+    
+    if rssi.count:
+        stats['rssi_stats'] = {
+            'min': rssi.minimum,
+            'max': rssi.maximum,
+            'avg': rssi.mean
+        }
+    
+    if ap_counts:
+        stats['ap_distribution'] = ap_counts
     
     return stats
 
+def analyze_log(filename):
+    """Analisa um log conforme o formato (CSV ou JSON/JSONL)"""
+    if filename.endswith('.csv'):
+        return analyze_csv_log(filename)
+    if is_json_log(filename):
+        return analyze_json_log(filename)
+    return None
+
+def find_logs(paths):
+    """Logs em arquivos/diretórios informados ou, sem argumentos, no catálogo"""
+    if not paths:
+        # Logs registrados no catálogo (inclui logs/ e runs/)
+        with RunCatalog() as catalog:
+            catalog.backfill('.')
+            entries = catalog.list_files(kind='log', formats=list(LOG_FORMATS), under='.')
+        return sorted(os.path.relpath(entry['path']) for entry in entries)
+    
+    log_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                log_files.extend(os.path.join(root, name) for name in files
+                                 if file_kind(name) == 'log' and file_format(name) in LOG_FORMATS)
+        else:
+            log_files.append(path)
+    return sorted(set(os.path.normpath(f) for f in log_files))
+
+def print_stats(filename, stats):
+    """Mostra as estatísticas de um log"""
+    print(f"\n🔍 Analisando: {filename}")
+    print("-" * 30)
+    
+    if not stats:
+        print(f"❌ Arquivo não encontrado ou vazio")
+        return
+    
+    print(f"✅ Arquivo encontrado e analisado")
+    print(f"   📄 Formato: {stats['format']}")
+    print(f"   📊 Registros: {stats['total_records']}")
+    
+    if 'rssi_stats' in stats and stats['rssi_stats']['avg'] is not None:
+        rssi = stats['rssi_stats']
+        print(f"   📶 RSSI - Min: {rssi['min']:.2f}, Max: {rssi['max']:.2f}, Média: {rssi['avg']:.2f}")
+    
+    if 'ap_distribution' in stats:
+        print(f"   📡 Distribuição de APs:")
+        for ap, count in stats['ap_distribution'].items():
+            print(f"      {ap}: {count} registros")
+    
+    if 'columns' in stats:
+        print(f"   📋 Colunas: {', '.join(stats['columns'])}")
+    
+    if 'scenario' in stats:
+        print(f"   🎯 Cenário: {stats['scenario']}")
+        print(f"   📝 Descrição: {stats['description']}")
+
 def main():
+    parser = argparse.ArgumentParser(description='Mostrar todos os logs gerados e suas estatísticas')
+    parser.add_argument('paths', nargs='*', help='Logs ou diretórios (padrão: logs do catálogo)')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Arquivos analisados em paralelo (padrão: 1)')
+    args = parser.parse_args()
+    
     print("📊 ANÁLISE DE TODOS OS LOGS GERADOS")
     print("=" * 50)
     
-    # Lista de arquivos de log esperados
-    log_files = [
-        'rasp_car_scan_log.csv',
-        'rasp_car_rout_scan_log.csv', 
-        'rasp_car_scan_extended_log.csv',
-        'rasp_car_json_log.json'
-    ]
+    log_files = find_logs(args.paths)
     
-    all_stats = []
+    # Cada arquivo é lido uma vez; em paralelo, a ordem de saída é mantida
+    if args.jobs > 1 and len(log_files) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(analyze_log, log_files))
+    else:
+        results = map(analyze_log, log_files)
     
-    for filename in log_files:
-        print(f"\n🔍 Analisando: {filename}")
-        print("-" * 30)
-        
-        if filename.endswith('.csv'):
-            stats = analyze_csv_log(filename)
-        elif filename.endswith('.json'):
-            stats = analyze_json_log(filename)
-        else:
-            stats = None
-        
+    all_stats = []
+    for filename, stats in zip(log_files, results):
+        print_stats(filename, stats)
         if stats:
             all_stats.append(stats)
-            print(f"✅ Arquivo encontrado e analisado")
-            print(f"   📄 Formato: {stats['format']}")
-            print(f"   📊 Registros: {stats['total_records']}")
-            
-            if 'rssi_stats' in stats:
-                rssi = stats['rssi_stats']
-                print(f"   📶 RSSI - Min: {rssi['min']:.2f}, Max: {rssi['max']:.2f}, Média: {rssi['avg']:.2f}")
-            
-            if 'ap_distribution' in stats:
-                print(f"   📡 Distribuição de APs:")
-                for ap, count in stats['ap_distribution'].items():
-                    print(f"      {ap}: {count} registros")
-            
-            if 'columns' in stats:
-                print(f"   📋 Colunas: {', '.join(stats['columns'])}")
-            
-            if 'scenario' in stats:
-                print(f"   🎯 Cenário: {stats['scenario']}")
-                print(f"   📝 Descrição: {stats['description']}")
-        else:
-            print(f"❌ Arquivo não encontrado ou vazio")
     
     # Resumo geral
     print(f"\n📈 RESUMO GERAL")
@@ -9,6 +9,16 @@ Analisa os logs CSV gerados pelos cenários rasp-car e rasp-car-rout:
 - Performance por AP
 - Gráficos de mobilidade
 
+Com --chunked, o log é lido em blocos de tamanho fixo e todas as
+estatísticas (por coluna e por AP, incluindo quantis aproximados) saem de
+uma única passada com acumuladores mescláveis: logs maiores que a memória
+são analisados com memória limitada.
+
+Com vários arquivos, um diretório ou um padrão glob, roda em lote: os logs
+são analisados em paralelo (um processo por núcleo, backend Agg, sem
+janelas) e o resultado vai para um relatório combinado
+(analysis_report.json + analysis_summary.csv) com gráficos por arquivo.
+
 Autor: Framework Mininet-WiFi
 Data: 2024
 """
@@ -17,29 +27,277 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import argparse
+import contextlib
+import csv
+import glob
+import io
+import json
 import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from framework.apsummary import COLUMN_ALIASES, LATENCY_QUANTILES, ap_summary, resolve_columns, rssi_quality
+from framework.catalog import RunCatalog
+from framework.logstore import POSITION_COLUMNS, has_columnar, load_log, split_positions
+from framework.stats import ColumnSummary
+
+STAT_COLUMNS = ('rssi', 'distance', 'latency')
+CONNECTIVITY_COLUMNS = ('connected', 'mesh_connected')
+# Colunas lidas no modo em blocos: todos os nomes aceitos (ex.: best_ap, latency_ms)
+STREAM_COLUMNS = tuple(alias for aliases in COLUMN_ALIASES.values() for alias in aliases) + CONNECTIVITY_COLUMNS
+QUANTILES = (0.5, 0.9, 0.99)
+DEFAULT_CHUNK_ROWS = 200000
+# Marcadores por ponto só em trajetórias curtas; acima disso, apenas a linha
+MAX_PATH_MARKERS = 2000
+# Posições usadas pelos cenários rasp-car, para logs sem execução no catálogo
+DEFAULT_AP_POSITIONS = {
+    'modem': (10, 30, 0),
+    'mesh1': (40, 30, 0),
+    'mesh2': (70, 30, 0)
+}
+
+# Caminhos longos (10^6 pontos) renderizados em partes pelo Agg
+plt.rcParams['agg.path.chunksize'] = 10000
+
+
+def describe(summary):
+    """Estatísticas de um ColumnSummary como dicionário simples"""
+    return summary.describe(QUANTILES)
+
+
+class LogAccumulator:
+    """Estatísticas de um log acumuladas bloco a bloco (mescláveis)"""
+    
+    def __init__(self):
+        self.records = 0
+        self.connected = 0
+        self.connectivity_total = 0
+        self.columns = {}
+        self.per_ap = {}
+        self.scans = {}
+    
+    def add_chunk(self, chunk):
+        """Inclui um bloco do log (DataFrame), com os nomes de coluna de qualquer cenário"""
+        self.records += len(chunk)
+        columns = resolve_columns(chunk)
+        stat_columns = {column: columns[column] for column in STAT_COLUMNS if column in columns}
+        for column, source in stat_columns.items():
+            values = pd.to_numeric(chunk[source], errors='coerce').to_numpy(dtype=float)
+            self.columns.setdefault(column, ColumnSummary()).add_many(values)
+        connected = next((column for column in CONNECTIVITY_COLUMNS if column in chunk.columns), None)
+        if connected:
+            self.connected += int((chunk[connected] == 'YES').sum())
+            self.connectivity_total += len(chunk)
+        if 'ap' in columns:
+            for ap, group in chunk.groupby(columns['ap'], observed=True, sort=False):
+                ap = str(ap)
+                self.scans[ap] = self.scans.get(ap, 0) + len(group)
+                ap_columns = self.per_ap.setdefault(ap, {})
+                for column, source in stat_columns.items():
+                    values = pd.to_numeric(group[source], errors='coerce').to_numpy(dtype=float)
+                    ap_columns.setdefault(column, ColumnSummary()).add_many(values)
+    
+    def merge(self, other):
+        """Mescla outro acumulador neste (ex.: blocos lidos em paralelo)"""
+        self.records += other.records
+        self.connected += other.connected
+        self.connectivity_total += other.connectivity_total
+        for column, summary in other.columns.items():
+            self.columns.setdefault(column, ColumnSummary()).merge(summary)
+        for ap, scans in other.scans.items():
+            self.scans[ap] = self.scans.get(ap, 0) + scans
+        for ap, ap_columns in other.per_ap.items():
+            merged = self.per_ap.setdefault(ap, {})
+            for column, summary in ap_columns.items():
+                merged.setdefault(column, ColumnSummary()).merge(summary)
+        return self
+    
+    @property
+    def connectivity_rate(self):
+        if not self.connectivity_total:
+            return None
+        return self.connected / self.connectivity_total * 100
+    
+    def report(self):
+        """Resumo serializável (JSON) das colunas e dos APs"""
+        return {
+            'records': self.records,
+            'connectivity_rate': self.connectivity_rate,
+            'columns': {column: describe(summary) for column, summary in self.columns.items()},
+            'aps': {str(ap): {column: describe(summary) for column, summary in ap_columns.items()}
+                    for ap, ap_columns in sorted(self.per_ap.items())}
+        }
+    
+    def ap_table(self):
+        """Tabela por AP com as mesmas colunas do ap_summary (quantis de latência aproximados)"""
+        rows = {}
+        for ap, ap_columns in self.per_ap.items():
+            row = {}
+            if 'rssi' in ap_columns:
+                stats = ap_columns['rssi'].stats
+                row.update(rssi_mean=stats.mean, rssi_min=stats.minimum, rssi_max=stats.maximum)
+            row['scans'] = self.scans.get(ap, 0)
+            if 'distance' in ap_columns:
+                row['distance_mean'] = ap_columns['distance'].stats.mean
+            if 'latency' in ap_columns:
+                row['latency_mean'] = ap_columns['latency'].stats.mean
+                for q in LATENCY_QUANTILES:
+                    row[f'latency_p{int(q * 100)}'] = ap_columns['latency'].quantile(q)
+            rows[ap] = row
+        table = pd.DataFrame.from_dict(rows, orient='index')
+        if 'rssi_mean' in table.columns:
+            table['quality'] = rssi_quality(table['rssi_mean'].to_numpy())
+        table.index.name = 'ap'
+        return table.round(2)
+
 
 class LogAnalyzer:
     """Classe para analisar logs CSV dos cenários Wi-Fi"""
     
-    def __init__(self, log_file):
+    def __init__(self, log_file, chunk_rows=None, output_dir=None, interactive=True, dpi=300):
         self.log_file = log_file
+        self.chunk_rows = chunk_rows
+        self.output_dir = output_dir
+        self.interactive = interactive
+        self.dpi = dpi
+        self.plot_files = []
         self.df = None
-        self.load_data()
+        self.summary = None
+        self._positions = None
+        self._ap_positions = None
+        if chunk_rows:
+            self.stream_stats()
+        else:
+            self.load_data()
     
     def load_data(self):
-        """Carrega dados do arquivo CSV"""
+        """Carrega dados do log (formato colunar .npz, se existir, ou CSV)"""
         try:
-            self.df = pd.read_csv(self.log_file)
+            self.df = load_log(self.log_file)
             print(f"✅ Dados carregados: {len(self.df)} registros")
         except Exception as e:
             print(f"❌ Erro ao carregar {self.log_file}: {e}")
             return
     
+    @property
+    def positions(self):
+        """Trajetória como array (N,3) de floats, calculada uma única vez"""
+        if self._positions is None and self.df is not None:
+            self._positions = self._load_positions()
+        return self._positions
+    
+    def _load_positions(self):
+        columns = set(self.df.columns)
+        if set(POSITION_COLUMNS) <= columns:
+            return self.df[list(POSITION_COLUMNS)].to_numpy(dtype=float)
+        raspberry_columns = [f'raspberry_{axis}' for axis in POSITION_COLUMNS]
+        if set(raspberry_columns) <= columns:
+            return self.df[raspberry_columns].to_numpy(dtype=float)
+        if 'position' not in columns:
+            return None
+        if has_columnar(self.log_file):
+            # x/y/z já decompostos na conversão para .npz
+            xyz = load_log(self.log_file, columns=list(POSITION_COLUMNS))
+            if set(POSITION_COLUMNS) <= set(xyz.columns):
+                return xyz[list(POSITION_COLUMNS)].to_numpy(dtype=float)
+        return split_positions(self.df['position'])
+    
+    def ap_positions(self):
+        """Posições {ap: (x, y, z)} registradas no catálogo para a execução do log"""
+        if self._ap_positions is None:
+            positions = None
+            try:
+                with RunCatalog() as catalog:
+                    positions = catalog.ap_positions(self.log_file)
+            except (sqlite3.Error, OSError) as e:
+                print(f"⚠️  Catálogo indisponível: {e}")
+            if not positions and self.df is not None and 'ap' in self.df.columns:
+                # Log sem execução registrada: posições padrão dos APs presentes no log
+                seen = set(self.df['ap'].dropna().unique())
+                positions = {name: xyz for name, xyz in DEFAULT_AP_POSITIONS.items() if name in seen}
+            self._ap_positions = positions or {}
+        return self._ap_positions
+    
+    def finish_plot(self, prefix, save_plot):
+        """Salva e registra o gráfico atual; só abre a janela no modo interativo"""
+        if save_plot:
+            plot_file = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+            if self.output_dir:
+                plot_file = os.path.join(self.output_dir, plot_file)
+            plt.savefig(plot_file, dpi=self.dpi, bbox_inches='tight')
+            print(f"📈 Gráfico salvo: {plot_file}")
+            self.register_chart(plot_file)
+            self.plot_files.append(plot_file)
+        
+        if self.interactive:
+            plt.show()
+        else:
+            plt.close()
+    
+    def register_chart(self, plot_file):
+        """Registra o gráfico no catálogo, ligado ao log de origem"""
+        with RunCatalog() as catalog:
+            catalog.index_file(plot_file, kind='chart', source=self.log_file)
+    
+    def stream_stats(self):
+        """Lê o log em blocos e acumula todas as estatísticas em uma passada"""
+        try:
+            header = pd.read_csv(self.log_file, nrows=0).columns
+            usecols = [column for column in STREAM_COLUMNS if column in header]
+            summary = LogAccumulator()
+            with pd.read_csv(self.log_file, usecols=usecols, chunksize=self.chunk_rows) as reader:
+                for chunk in reader:
+                    summary.add_chunk(chunk)
+            self.summary = summary
+            print(f"✅ Dados processados em blocos de {self.chunk_rows}: {summary.records} registros")
+        except Exception as e:
+            print(f"❌ Erro ao processar {self.log_file}: {e}")
+    
+    def streamed_stats(self):
+        """Estatísticas básicas a partir dos acumuladores (modo em blocos)"""
+        if self.summary is None or self.summary.records == 0:
+            print("❌ Nenhum dado para analisar")
+            return
+        
+        print("\n📊 ESTATÍSTICAS BÁSICAS")
+        print("=" * 50)
+        
+        labels = {
+            'rssi': ('RSSI', 'dBm', 'Médio', 'Máximo', 'Mínimo'),
+            'distance': ('Distância', 'm', 'Média', 'Máxima', 'Mínima'),
+            'latency': ('Latência', 'ms', 'Média', 'Máxima', 'Mínima')
+        }
+        for column, (label, unit, mean_label, max_label, min_label) in labels.items():
+            if column not in self.summary.columns:
+                continue
+            summary = self.summary.columns[column]
+            print(f"{label} {mean_label}: {summary.stats.mean:.2f} {unit}")
+            print(f"{label} {max_label}: {summary.stats.maximum:.2f} {unit}")
+            print(f"{label} {min_label}: {summary.stats.minimum:.2f} {unit}")
+            if column == 'rssi' and summary.stats.std is not None:
+                print(f"Desvio Padrão RSSI: {summary.stats.std:.2f} dBm")
+            quantiles = ', '.join(f"P{int(q * 100)}: {summary.quantile(q):.2f}" for q in QUANTILES)
+            print(f"{label} Quantis (aprox.): {quantiles} {unit}")
+        
+        rate = self.summary.connectivity_rate
+        if rate is not None:
+            print(f"Taxa de Conectividade: {rate:.1f}% ({self.summary.connected}/{self.summary.connectivity_total})")
+        
+        if self.summary.per_ap:
+            print("\n📡 ANÁLISE POR ACCESS POINT")
+            print("-" * 30)
+            with pd.option_context('display.max_columns', None, 'display.width', None):
+                print(self.summary.ap_table())
+    
     def basic_stats(self):
         """Estatísticas básicas dos dados"""
+        if self.summary is not None:
+            self.streamed_stats()
+            return
         if self.df is None or len(self.df) == 0:
             print("❌ Nenhum dado para analisar")
             return
@@ -73,16 +331,21 @@ class LogAnalyzer:
             connectivity_rate = (connected_count / total_count) * 100
             print(f"Taxa de Conectividade: {connectivity_rate:.1f}% ({connected_count}/{total_count})")
         
+        # Distância percorrida, da trajetória compartilhada com os gráficos
+        positions = self.positions
+        if positions is not None:
+            valid = positions[~np.isnan(positions).any(axis=1)]
+            if len(valid) > 1:
+                travelled = np.linalg.norm(np.diff(valid, axis=0), axis=1).sum()
+                print(f"Distância Percorrida: {travelled:.2f} m")
+        
         # Análise por AP
-        if 'ap' in self.df.columns:
+        ap_table = ap_summary(self.df)
+        if not ap_table.empty:
             print("\n📡 ANÁLISE POR ACCESS POINT")
             print("-" * 30)
-            ap_stats = self.df.groupby('ap').agg({
-                'rssi': ['mean', 'min', 'max', 'count'],
-                'distance': ['mean', 'min', 'max'],
-                'latency': ['mean', 'min', 'max']
-            }).round(2)
-            print(ap_stats)
+            with pd.option_context('display.max_columns', None, 'display.width', None):
+                print(ap_table.round(2))
     
     def plot_rssi_over_time(self, save_plot=True):
         """Gráfico de RSSI ao longo do tempo"""
@@ -99,20 +362,18 @@ class LogAnalyzer:
         plt.legend()
         plt.grid(True, alpha=0.3)
         
-        if save_plot:
-            plot_file = f"rssi_over_time_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            plt.savefig(plot_file, dpi=300, bbox_inches='tight')
-            print(f"📈 Gráfico salvo: {plot_file}")
-        
-        plt.show()
+        self.finish_plot('rssi_over_time', save_plot)
     
     def plot_ap_performance(self, save_plot=True):
         """Gráfico de performance por AP"""
-        if self.df is None or 'ap' not in self.df.columns:
+        if self.summary is not None and self.summary.per_ap:
+            ap_means = pd.Series({ap: columns['rssi'].stats.mean for ap, columns in self.summary.per_ap.items()
+                                  if 'rssi' in columns}).sort_values(ascending=False)
+        elif self.df is None or 'ap' not in self.df.columns:
             print("❌ Dados de AP não disponíveis")
             return
-        
-        ap_means = self.df.groupby('ap')['rssi'].mean().sort_values(ascending=False)
+        else:
+            ap_means = ap_summary(self.df)['rssi_mean'].sort_values(ascending=False)
         
         plt.figure(figsize=(10, 6))
         bars = plt.bar(ap_means.index, ap_means.values, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
@@ -126,46 +387,31 @@ class LogAnalyzer:
             plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5, 
                     f'{value:.1f}', ha='center', va='bottom')
         
-        if save_plot:
-            plot_file = f"ap_performance_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            plt.savefig(plot_file, dpi=300, bbox_inches='tight')
-            print(f"📈 Gráfico salvo: {plot_file}")
-        
-        plt.show()
+        self.finish_plot('ap_performance', save_plot)
     
     def plot_mobility_path(self, save_plot=True):
         """Gráfico do caminho de mobilidade"""
-        if self.df is None or 'position' not in self.df.columns:
+        positions = self.positions
+        if positions is None:
             print("❌ Dados de posição não disponíveis")
             return
         
-        # Extrair coordenadas das posições
-        positions = []
-        for pos_str in self.df['position']:
-            try:
-                coords = pos_str.split(',')
-                x, y = float(coords[0]), float(coords[1])
-                positions.append((x, y))
-            except:
-                continue
-        
-        if not positions:
+        xy = positions[:, :2]
+        xy = xy[~np.isnan(xy).any(axis=1)]
+        if not len(xy):
             print("❌ Não foi possível extrair posições válidas")
             return
         
-        x_coords, y_coords = zip(*positions)
+        # Pontos repetidos em sequência (parado num waypoint) não mudam o traçado
+        moved = np.r_[True, (np.diff(xy, axis=0) != 0).any(axis=1)]
+        xy = xy[moved]
+        style = 'b-o' if len(xy) <= MAX_PATH_MARKERS else 'b-'
         
         plt.figure(figsize=(10, 8))
-        plt.plot(x_coords, y_coords, 'b-o', linewidth=2, markersize=6, label='Caminho do Raspberry')
-        
-        # Marcar posições dos APs (baseado nos cenários)
-        ap_positions = {
-            'modem': (10, 30),
-            'mesh1': (40, 30),
-            'mesh2': (70, 30)
-        }
+        plt.plot(xy[:, 0], xy[:, 1], style, linewidth=2, markersize=6, label='Caminho do Raspberry')
         
-        for ap_name, (x, y) in ap_positions.items():
+        # Marcar posições dos APs (registradas na execução)
+        for ap_name, (x, y, _) in self.ap_positions().items():
             plt.plot(x, y, 'r^', markersize=10, label=f'{ap_name}')
             plt.text(x+2, y+2, ap_name, fontsize=12, fontweight='bold')
         
@@ -176,14 +422,9 @@ class LogAnalyzer:
         plt.grid(True, alpha=0.3)
         plt.axis('equal')
         
-        if save_plot:
-            plot_file = f"mobility_path_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            plt.savefig(plot_file, dpi=300, bbox_inches='tight')
-            print(f"📈 Gráfico salvo: {plot_file}")
-        
-        plt.show()
+        self.finish_plot('mobility_path', save_plot)
     
-    def generate_report(self):
+    def generate_report(self, plots=True):
         """Gera relatório completo"""
         print(f"\n📋 RELATÓRIO DE ANÁLISE: {self.log_file}")
         print("=" * 60)
@@ -191,27 +432,176 @@ class LogAnalyzer:
         self.basic_stats()
         
         # Gerar gráficos
-        print("\n📈 GERANDO GRÁFICOS...")
-        self.plot_rssi_over_time()
-        self.plot_ap_performance()
-        self.plot_mobility_path()
+        if plots:
+            print("\n📈 GERANDO GRÁFICOS...")
+            if self.summary is not None:
+                # Séries completas não ficam em memória no modo em blocos
+                print("⏭️  RSSI ao longo do tempo e mobilidade indisponíveis no modo em blocos")
+                self.plot_ap_performance()
+            else:
+                self.plot_rssi_over_time()
+                self.plot_ap_performance()
+                self.plot_mobility_path()
         
         print("\n✅ Análise concluída!")
+    
+    def accumulator(self):
+        """Estatísticas do log como LogAccumulator (mesclável entre arquivos)"""
+        if self.summary is not None:
+            return self.summary
+        accumulator = LogAccumulator()
+        if self.df is not None:
+            accumulator.add_chunk(self.df)
+        return accumulator
+    
+    def report(self, accumulator=None):
+        """Resumo serializável do log para o relatório combinado"""
+        accumulator = accumulator or self.accumulator()
+        return dict(accumulator.report(), log_file=self.log_file, plots=self.plot_files)
+
+
+def find_log_files(paths):
+    """Expande arquivos, diretórios (recursivo) e padrões glob em logs CSV"""
+    log_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = glob.glob(os.path.join(path, '**', '*.csv'), recursive=True)
+            log_files.extend(f for f in matches if 'log' in os.path.basename(f))
+        elif glob.has_magic(path):
+            log_files.extend(f for f in glob.glob(path, recursive=True) if f.endswith('.csv'))
+        elif os.path.exists(path):
+            log_files.append(path)
+        else:
+            print(f"❌ Arquivo não encontrado: {path}")
+    return sorted(set(os.path.normpath(f) for f in log_files))
+
+
+def _init_batch_worker():
+    """Processos do lote não têm janela: backend Agg"""
+    plt.switch_backend('Agg')
+
+
+def analyze_file(log_file, output_dir, chunk_rows=None, plots=True, dpi=300):
+    """Analisa um log no processo do pool; o relatório em texto vai para report.txt"""
+    start = time.time()
+    file_dir = os.path.join(output_dir, os.path.splitext(os.path.relpath(log_file))[0].replace(os.sep, '__'))
+    os.makedirs(file_dir, exist_ok=True)
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            analyzer = LogAnalyzer(log_file, chunk_rows=chunk_rows, output_dir=file_dir, interactive=False, dpi=dpi)
+            if analyzer.df is None and analyzer.summary is None:
+                raise ValueError(output.getvalue().strip() or 'log ilegível')
+            analyzer.generate_report(plots=plots)
+        accumulator = analyzer.accumulator()
+        report = analyzer.report(accumulator)
+        error = None
+    except Exception as e:
+        accumulator, report, error = None, None, str(e)
+    with open(os.path.join(file_dir, 'report.txt'), 'w') as f:
+        f.write(output.getvalue())
+    return {'log_file': log_file, 'report': report, 'accumulator': accumulator,
+            'error': error, 'elapsed': time.time() - start}
+
+
+def summary_row(report):
+    """Linha do CSV de resumo de um arquivo"""
+    row = {
+        'log_file': report['log_file'],
+        'records': report['records'],
+        'connectivity_rate': report['connectivity_rate'],
+        'aps': ';'.join(report['aps']),
+        'plots': len(report['plots'])
+    }
+    for column in STAT_COLUMNS:
+        for name, value in report['columns'].get(column, {}).items():
+            row[f'{column}_{name}'] = value
+    return row
+
+
+def run_batch(log_files, output_dir, jobs=None, chunk_rows=None, plots=True, dpi=300):
+    """Analisa vários logs em paralelo e grava o relatório combinado (JSON + CSV)"""
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+    print(f"📦 Lote: {len(log_files)} logs | Processos: {jobs} | Saída: {output_dir}")
+    
+    start = time.time()
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker) as pool:
+        futures = [pool.submit(analyze_file, log_file, output_dir, chunk_rows, plots, dpi) for log_file in log_files]
+        for i, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            status = f"❌ {result['error']}" if result['error'] else f"✅ {result['elapsed']:.1f}s"
+            print(f"[{i}/{len(log_files)}] {result['log_file']}: {status}")
+    results.sort(key=lambda result: result['log_file'])
+    
+    overall = LogAccumulator()
+    for result in results:
+        if result['accumulator'] is not None:
+            overall.merge(result['accumulator'])
+    reports = [result['report'] for result in results if result['report'] is not None]
+    errors = [{'log_file': result['log_file'], 'error': result['error']} for result in results if result['error']]
+    
+    combined = {
+        'generated_at': datetime.now().isoformat(),
+        'total_files': len(log_files),
+        'elapsed': time.time() - start,
+        'overall': overall.report(),
+        'files': reports,
+        'errors': errors
+    }
+    json_file = os.path.join(output_dir, 'analysis_report.json')
+    with open(json_file, 'w') as f:
+        json.dump(combined, f, indent=2)
+    
+    rows = [summary_row(report) for report in reports]
+    fieldnames = list(dict.fromkeys(name for row in rows for name in row))
+    csv_file = os.path.join(output_dir, 'analysis_summary.csv')
+    with open(csv_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    
+    print(f"\n📄 Relatório combinado: {json_file}")
+    print(f"📊 Resumo por arquivo: {csv_file}")
+    print(f"✅ {len(reports)} analisados, {len(errors)} com erro em {combined['elapsed']:.1f}s")
+    return combined
 
 
 def main():
     parser = argparse.ArgumentParser(description='Analisar logs CSV dos cenários Wi-Fi')
-    parser.add_argument('log_file', help='Arquivo CSV para analisar')
+    parser.add_argument('log_files', nargs='+',
+                        help='Arquivo CSV para analisar; vários arquivos, diretórios ou padrões glob ativam o modo em lote')
     parser.add_argument('--no-plots', action='store_true', help='Não gerar gráficos')
+    parser.add_argument('--chunked', action='store_true',
+                        help='Analisar em blocos com memória limitada (logs maiores que a RAM)')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f'Linhas por bloco no modo --chunked (padrão: {DEFAULT_CHUNK_ROWS})')
+    parser.add_argument('--jobs', '-j', type=int, help='Processos em paralelo no modo em lote (padrão: CPUs)')
+    parser.add_argument('--output', '-o', default='analysis',
+                        help='Diretório do relatório combinado no modo em lote (padrão: analysis)')
+    parser.add_argument('--dpi', type=int, default=300, help='Resolução dos gráficos salvos (padrão: 300)')
     
     args = parser.parse_args()
+    chunk_rows = args.chunk_rows if args.chunked else None
+    
+    batch = len(args.log_files) > 1 or any(os.path.isdir(p) or glob.has_magic(p) for p in args.log_files)
+    if batch:
+        log_files = find_log_files(args.log_files)
+        if not log_files:
+            print("❌ Nenhum log CSV encontrado")
+            return
+        run_batch(log_files, args.output, args.jobs, chunk_rows, plots=not args.no_plots, dpi=args.dpi)
+        return
     
-    if not os.path.exists(args.log_file):
-        print(f"❌ Arquivo não encontrado: {args.log_file}")
+    log_file = args.log_files[0]
+    if not os.path.exists(log_file):
+        print(f"❌ Arquivo não encontrado: {log_file}")
         return
     
-    analyzer = LogAnalyzer(args.log_file)
-    analyzer.generate_report()
+    analyzer = LogAnalyzer(log_file, chunk_rows=chunk_rows, dpi=args.dpi)
+    analyzer.generate_report(plots=not args.no_plots)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Conversor de Logs para o Formato Colunar
+========================================
+
+Gera, ao lado de cada log CSV, a versão colunar (.npz) lida
+preferencialmente por analyze_logs, show_data e pela interface web:
+- x/y/z da posição como colunas float
+- ap, connected e demais textos codificados por dicionário
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from framework.logstore import columnar_path, convert_csv, has_columnar
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Converter logs CSV para o formato colunar (.npz)')
+    parser.add_argument('log_files', nargs='*', help='Logs CSV (padrão: *.csv e logs/*.csv com "log" no nome)')
+    parser.add_argument('--force', '-f', action='store_true', help='Reconverter mesmo se o .npz estiver atualizado')
+
+    args = parser.parse_args()
+
+    log_files = args.log_files or [f for f in glob.glob('*.csv') + glob.glob('logs/*.csv') if 'log' in f]
+    if not log_files:
+        print("❌ Nenhum log CSV encontrado")
+        return
+
+    for log_file in log_files:
+        if not os.path.exists(log_file):
+            print(f"❌ Arquivo não encontrado: {log_file}")
+            continue
+        if has_columnar(log_file) and not args.force:
+            print(f"⏭️  {log_file}: já atualizado")
+            continue
+        start = time.time()
+        try:
+            npz_file = convert_csv(log_file)
+        except Exception as e:
+            print(f"❌ Erro ao converter {log_file}: {e}")
+            continue
+        csv_size = os.path.getsize(log_file)
+        npz_size = os.path.getsize(npz_file)
+        print(f"✅ {log_file} -> {columnar_path(log_file)} ({csv_size} -> {npz_size} bytes, {time.time() - start:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
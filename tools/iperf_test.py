@@ -16,8 +16,13 @@ import subprocess
 import time
 import json
 import argparse
+import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from framework.catalog import RunCatalog
+
 
 class IperfTester:
     """Classe para executar testes de throughput com iperf"""
@@ -130,6 +135,8 @@ class IperfTester:
             json.dump(report, f, indent=2)
         
         print(f"📄 Relatório salvo em: {filename}")
+        with RunCatalog() as catalog:
+            catalog.index_file(filename, kind='report')
         return report
     
     def calculate_summary(self):
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Consulta ao Catálogo de Execuções
+=================================
+
+Lista as execuções e os arquivos registrados no catálogo SQLite
+(framework.catalog), com filtros por cenário, tipo e período:
+- --scan: cataloga arquivos existentes (diretório atual, logs/ e runs/)
+- --runs: execuções registradas pelos cenários
+- padrão: arquivos catalogados (logs, gráficos e relatórios)
+
+Autor: Framework Mininet-WiFi
+Data: 2024
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from framework.catalog import RunCatalog
+
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S') if timestamp else '-'
+
+
+def format_value(value, fmt='.1f'):
+    return format(value, fmt) if value is not None else '-'
+
+
+def show_runs(catalog, args):
+    runs = catalog.list_runs(scenario=args.scenario, limit=args.limit)
+    print(f"\n🏃 EXECUÇÕES ({len(runs)})")
+    print("=" * 60)
+    for run in runs:
+        duration = run['finished_at'] - run['started_at'] if run['started_at'] else None
+        print(f"#{run['id']} {run['scenario']} [{run['backend']}] {format_time(run['finished_at'])} "
+              f"({format_value(duration)}s, {run['status']})")
+        if run['params']:
+            print(f"   ⚙️  Parâmetros: {run['params']}")
+        aps = catalog.run_aps(run['id'])
+        if aps:
+            print(f"   📡 APs: {', '.join(ap['name'] for ap in aps)}")
+        for entry in catalog.list_files(run_id=run['id']):
+            print(f"   📄 {os.path.relpath(entry['path'])} ({entry['records']} registros)")
+
+
+def show_files(catalog, args):
+    entries = catalog.list_files(kind=args.kind, scenario=args.scenario, since=args.since, until=args.until)
+    if args.limit:
+        entries = entries[:args.limit]
+    print(f"\n📁 ARQUIVOS CATALOGADOS ({len(entries)})")
+    print("=" * 60)
+    for entry in entries:
+        print(f"{os.path.relpath(entry['path'])} [{entry['kind']}/{entry['format']}] {format_time(entry['mtime'])}")
+        if entry['kind'] == 'log':
+            print(f"   📊 {entry['records']} registros | RSSI médio: {format_value(entry['avg_rssi'], '.2f')} dBm | "
+                  f"Conectividade: {format_value(entry['connectivity_rate'])}%")
+        elif entry['source']:
+            print(f"   🔗 Origem: {os.path.relpath(entry['source'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Consultar o catálogo de execuções')
+    parser.add_argument('--scan', action='store_true', help='Catalogar arquivos existentes antes de listar')
+    parser.add_argument('--runs', action='store_true', help='Listar execuções em vez de arquivos')
+    parser.add_argument('--kind', choices=['log', 'chart', 'report'], help='Tipo de arquivo')
+    parser.add_argument('--scenario', help='Filtrar por cenário')
+    parser.add_argument('--since', type=float, help='Logs que terminam após este timestamp')
+    parser.add_argument('--until', type=float, help='Logs que começam antes deste timestamp')
+    parser.add_argument('--limit', type=int, help='Número máximo de itens')
+
+    args = parser.parse_args()
+
+    with RunCatalog() as catalog:
+        if args.scan:
+            indexed = catalog.backfill('.')
+            print(f"✅ {len(indexed)} arquivos catalogados em {catalog.db_path}")
+
+        if args.runs:
+            show_runs(catalog, args)
+        else:
+            show_files(catalog, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -15,26 +15,56 @@ Data: 2024
 
 import pandas as pd
 import argparse
-import os
 import glob
+import json
+import os
+import sys
 from datetime import datetime
 import matplotlib.pyplot as plt
 import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from framework.apsummary import QUALITY_ICONS, ap_summary
+from framework.catalog import RunCatalog
+from framework.compare import ALIGN_MODES, catalog_groups, compare_runs, comparison_table
+from framework.framecache import DEFAULT_MAX_BYTES, FrameCache
+
+
+def summarize_log(df):
+    """Resumo de um log carregado (calculado uma vez por versão do arquivo)"""
+    summary = {'records': len(df)}
+    if 'timestamp' in df.columns and len(df) > 0:
+        summary['time_first'] = float(df['timestamp'].iloc[0])
+        summary['time_last'] = float(df['timestamp'].iloc[-1])
+    for column in ('rssi', 'distance', 'latency'):
+        if column in df.columns:
+            summary[column] = {
+                'mean': df[column].mean(),
+                'min': df[column].min(),
+                'max': df[column].max()
+            }
+    if 'connected' in df.columns:
+        summary['connected'] = int((df['connected'] == 'YES').sum())
+    if 'ap' in df.columns:
+        summary['aps'] = [str(ap) for ap in df['ap'].unique()]
+    return summary
+
 
 class DataViewer:
     """Classe para visualizar dados dos logs CSV de forma amigável"""
     
-    def __init__(self):
+    def __init__(self, cache_bytes=DEFAULT_MAX_BYTES):
         self.logs = {}
+        # Frames e resumos carregados uma vez por sessão (validados por mtime)
+        self.frames = FrameCache(max_bytes=cache_bytes)
         self.find_logs()
     
     def find_logs(self):
-        """Encontra todos os logs CSV disponíveis"""
-        csv_files = glob.glob("*.csv")
-        for file in csv_files:
-            if file.endswith('.csv'):
-                self.logs[file] = file
+        """Encontra os logs CSV registrados no catálogo (inclui logs/ e runs/)"""
+        with RunCatalog() as catalog:
+            catalog.backfill('.')
+            for entry in catalog.list_files(kind='log', formats=['csv'], under='.'):
+                self.logs[os.path.relpath(entry['path'])] = entry
         print(f"📁 Encontrados {len(self.logs)} arquivos de log")
     
     def show_available_logs(self):
@@ -47,111 +77,103 @@ class DataViewer:
             print("💡 Execute um cenário primeiro para gerar logs")
             return
         
-        for i, (name, file) in enumerate(self.logs.items(), 1):
-            try:
-                df = pd.read_csv(file)
-                size = os.path.getsize(file)
-                records = len(df)
-                print(f"{i}. 📄 {name}")
-                print(f"   📊 {records} registros | 📏 {size} bytes")
-                
-                # Mostrar período de tempo se disponível
-                if 'timestamp' in df.columns and len(df) > 0:
-                    start_time = datetime.fromtimestamp(df['timestamp'].iloc[0])
-                    end_time = datetime.fromtimestamp(df['timestamp'].iloc[-1])
-                    duration = end_time - start_time
-                    print(f"   ⏰ {start_time.strftime('%H:%M:%S')} - {end_time.strftime('%H:%M:%S')} ({duration.total_seconds():.1f}s)")
-                
-                # Mostrar APs utilizados
-                if 'ap' in df.columns:
-                    aps = df['ap'].unique()
-                    print(f"   📡 APs: {', '.join(aps)}")
-                
-                print()
-                
-            except Exception as e:
-                print(f"{i}. ❌ {name} (erro: {e})")
+        # Registros, período e APs vêm do catálogo: listar não lê nenhum log
+        for i, (name, entry) in enumerate(self.logs.items(), 1):
+            print(f"{i}. 📄 {name}")
+            print(f"   📊 {entry['records']} registros | 📏 {entry['size']} bytes")
+            
+            # Mostrar período de tempo se disponível
+            if entry['time_start'] is not None and entry['time_end'] is not None:
+                start_time = datetime.fromtimestamp(entry['time_start'])
+                end_time = datetime.fromtimestamp(entry['time_end'])
+                duration = end_time - start_time
+                print(f"   ⏰ {start_time.strftime('%H:%M:%S')} - {end_time.strftime('%H:%M:%S')} ({duration.total_seconds():.1f}s)")
+            
+            # Mostrar APs utilizados
+            if entry['aps']:
+                print(f"   📡 APs: {', '.join(entry['aps'])}")
+            
+            print()
     
     def load_log(self, log_file):
-        """Carrega um log específico"""
+        """Carrega um log específico (do cache da sessão, se inalterado)"""
         try:
-            df = pd.read_csv(log_file)
-            print(f"✅ Log carregado: {log_file}")
+            cached = log_file in self.frames
+            df = self.frames.get(log_file)
+            print(f"✅ Log carregado: {log_file}{' (cache)' if cached else ''}")
             print(f"📊 {len(df)} registros encontrados")
             return df
         except Exception as e:
             print(f"❌ Erro ao carregar {log_file}: {e}")
             return None
     
+    def log_summary(self, log_file):
+        """Resumo pré-calculado de um log (None se não puder ser lido)"""
+        try:
+            return self.frames.summary(log_file, summarize_log)
+        except Exception as e:
+            print(f"❌ Erro ao carregar {log_file}: {e}")
+            return None
+    
     def show_summary(self, log_file):
         """Mostra resumo rápido do log"""
         df = self.load_log(log_file)
         if df is None:
             return
+        summary = self.frames.summary(log_file, summarize_log)
         
         print(f"\n📊 RESUMO: {log_file}")
         print("=" * 60)
         
         # Informações básicas
-        print(f"📈 Total de registros: {len(df)}")
-        print(f"📅 Período: {datetime.fromtimestamp(df['timestamp'].iloc[0]).strftime('%d/%m/%Y %H:%M:%S')} - {datetime.fromtimestamp(df['timestamp'].iloc[-1]).strftime('%d/%m/%Y %H:%M:%S')}")
+        print(f"📈 Total de registros: {summary['records']}")
+        if 'time_first' in summary:
+            print(f"📅 Período: {datetime.fromtimestamp(summary['time_first']).strftime('%d/%m/%Y %H:%M:%S')} - {datetime.fromtimestamp(summary['time_last']).strftime('%d/%m/%Y %H:%M:%S')}")
         
         # Estatísticas de RSSI
-        if 'rssi' in df.columns:
+        if 'rssi' in summary:
             print(f"\n📶 RSSI:")
-            print(f"   🟢 Melhor: {df['rssi'].max():.1f} dBm")
-            print(f"   🔴 Pior: {df['rssi'].min():.1f} dBm")
-            print(f"   📊 Média: {df['rssi'].mean():.1f} dBm")
+            print(f"   🟢 Melhor: {summary['rssi']['max']:.1f} dBm")
+            print(f"   🔴 Pior: {summary['rssi']['min']:.1f} dBm")
+            print(f"   📊 Média: {summary['rssi']['mean']:.1f} dBm")
         
         # Estatísticas de distância
-        if 'distance' in df.columns:
+        if 'distance' in summary:
             print(f"\n📏 Distância:")
-            print(f"   🏠 Mais próxima: {df['distance'].min():.1f} m")
-            print(f"   🏃 Mais distante: {df['distance'].max():.1f} m")
-            print(f"   📊 Média: {df['distance'].mean():.1f} m")
+            print(f"   🏠 Mais próxima: {summary['distance']['min']:.1f} m")
+            print(f"   🏃 Mais distante: {summary['distance']['max']:.1f} m")
+            print(f"   📊 Média: {summary['distance']['mean']:.1f} m")
         
         # Estatísticas de latência
-        if 'latency' in df.columns:
+        if 'latency' in summary:
             print(f"\n⏱️  Latência:")
-            print(f"   ⚡ Menor: {df['latency'].min():.1f} ms")
-            print(f"   🐌 Maior: {df['latency'].max():.1f} ms")
-            print(f"   📊 Média: {df['latency'].mean():.1f} ms")
+            print(f"   ⚡ Menor: {summary['latency']['min']:.1f} ms")
+            print(f"   🐌 Maior: {summary['latency']['max']:.1f} ms")
+            print(f"   📊 Média: {summary['latency']['mean']:.1f} ms")
         
         # Análise de conectividade
-        if 'connected' in df.columns:
-            connected = len(df[df['connected'] == 'YES'])
-            total = len(df)
+        if 'connected' in summary and summary['records']:
+            connected = summary['connected']
+            total = summary['records']
             rate = (connected / total) * 100
             print(f"\n🔗 Conectividade:")
             print(f"   🟢 Conectado: {connected}/{total} ({rate:.1f}%)")
             print(f"   🔴 Desconectado: {total-connected}/{total} ({100-rate:.1f}%)")
         
-        # Análise por AP
-        if 'ap' in df.columns:
+        # Análise por AP (uma agregação agrupada para todos os APs)
+        ap_table = self.frames.summary(log_file, ap_summary)
+        if not ap_table.empty:
             print(f"\n📡 Performance por AP:")
-            ap_stats = df.groupby('ap').agg({
-                'rssi': ['mean', 'count'],
-                'distance': 'mean',
-                'latency': 'mean'
-            }).round(2)
-            
-            for ap in df['ap'].unique():
-                ap_data = df[df['ap'] == ap]
-                rssi_mean = ap_data['rssi'].mean()
-                count = len(ap_data)
-                distance_mean = ap_data['distance'].mean()
-                
-                # Ícone de qualidade baseado no RSSI
-                if rssi_mean > -50:
-                    quality = "🟢 Excelente"
-                elif rssi_mean > -60:
-                    quality = "🟡 Boa"
-                elif rssi_mean > -70:
-                    quality = "🟠 Regular"
-                else:
-                    quality = "🔴 Ruim"
-                
-                print(f"   📶 {ap}: {rssi_mean:.1f} dBm ({quality}) | {count} scans | {distance_mean:.1f}m")
+            for ap, row in ap_table.iterrows():
+                line = f"   📶 {ap}:"
+                if 'rssi_mean' in row:
+                    line += f" {row['rssi_mean']:.1f} dBm ({QUALITY_ICONS[row['quality']]} {row['quality']}) |"
+                line += f" {row['scans']} scans"
+                if 'distance_mean' in row:
+                    line += f" | {row['distance_mean']:.1f}m"
+                if 'latency_p90' in row:
+                    line += f" | latência P50/P90: {row['latency_p50']:.1f}/{row['latency_p90']:.1f} ms"
+                print(line)
     
     def show_table(self, log_file, limit=10):
         """Mostra dados em formato de tabela"""
@@ -204,47 +226,41 @@ class DataViewer:
         if len(df) > limit:
             print(f"\n... e mais {len(df) - limit} registros")
     
-    def compare_logs(self, log1, log2):
-        """Compara dois logs"""
-        df1 = self.load_log(log1)
-        df2 = self.load_log(log2)
+    def compare_logs(self, *log_files, groups=None, baseline=None, align='time', report_file=None):
+        """Compara N logs (ou N grupos de logs) contra uma linha de base"""
+        groups = dict(groups or {})
+        for log_file in log_files:
+            groups[log_file] = [log_file]
         
-        if df1 is None or df2 is None:
-            return
+        try:
+            report = compare_runs(groups, baseline=baseline, align=align, loader=self.frames.get)
+        except (OSError, ValueError) as e:
+            print(f"❌ Erro na comparação: {e}")
+            return None
         
-        print(f"\n🔄 COMPARAÇÃO: {log1} vs {log2}")
+        print(f"\n🔄 COMPARAÇÃO: {len(groups)} grupos (linha de base: {report['baseline']})")
         print("=" * 60)
+        for label, group in report['groups'].items():
+            print(f"   📁 {label}: {group['runs']} execução(ões)")
         
-        # Comparar RSSI médio
-        if 'rssi' in df1.columns and 'rssi' in df2.columns:
-            rssi1 = df1['rssi'].mean()
-            rssi2 = df2['rssi'].mean()
-            diff = rssi2 - rssi1
-            
-            print(f"📶 RSSI Médio:")
-            print(f"   {log1}: {rssi1:.1f} dBm")
-            print(f"   {log2}: {rssi2:.1f} dBm")
-            print(f"   📊 Diferença: {diff:+.1f} dBm")
+        table = comparison_table(report)
+        if not table.empty:
+            print()
+            with pd.option_context('display.max_columns', None, 'display.width', None):
+                print(table.to_string(index=False, float_format=lambda value: f"{value:.3g}"))
         
-        # Comparar conectividade
-        if 'connected' in df1.columns and 'connected' in df2.columns:
-            conn1 = len(df1[df1['connected'] == 'YES']) / len(df1) * 100
-            conn2 = len(df2[df2['connected'] == 'YES']) / len(df2) * 100
-            
-            print(f"\n🔗 Taxa de Conectividade:")
-            print(f"   {log1}: {conn1:.1f}%")
-            print(f"   {log2}: {conn2:.1f}%")
-            print(f"   📊 Diferença: {conn2-conn1:+.1f}%")
+        # Séries alinhadas: onde as execuções mais divergem da linha de base
+        unit = 's' if align == 'time' else ' registros'
+        for metric, series in report['series'].items():
+            for label, delta in series['deltas'].items():
+                print(f"📈 {metric} ({label}): |Δ| médio {delta['mean_abs']:.2f}, "
+                      f"máximo {delta['max_abs']:.2f} em {delta['at']:.1f}{unit}")
         
-        # Comparar latência
-        if 'latency' in df1.columns and 'latency' in df2.columns:
-            lat1 = df1['latency'].mean()
-            lat2 = df2['latency'].mean()
-            
-            print(f"\n⏱️  Latência Média:")
-            print(f"   {log1}: {lat1:.1f} ms")
-            print(f"   {log2}: {lat2:.1f} ms")
-            print(f"   📊 Diferença: {lat2-lat1:+.1f} ms")
+        if report_file:
+            with open(report_file, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"\n📄 Relatório salvo em: {report_file}")
+        return report
     
     def show_quick_stats(self):
         """Mostra estatísticas rápidas de todos os logs"""
@@ -256,24 +272,22 @@ class DataViewer:
             return
         
         for log_file in self.logs:
-            df = self.load_log(log_file)
-            if df is None:
+            summary = self.log_summary(log_file)
+            if summary is None:
                 continue
             
             print(f"\n📄 {log_file}:")
-            print(f"   📊 {len(df)} registros")
+            print(f"   📊 {summary['records']} registros")
             
-            if 'rssi' in df.columns:
-                print(f"   📶 RSSI: {df['rssi'].mean():.1f} dBm (médio)")
+            if 'rssi' in summary:
+                print(f"   📶 RSSI: {summary['rssi']['mean']:.1f} dBm (médio)")
             
-            if 'connected' in df.columns:
-                connected = len(df[df['connected'] == 'YES'])
-                rate = (connected / len(df)) * 100
+            if 'connected' in summary and summary['records']:
+                rate = (summary['connected'] / summary['records']) * 100
                 print(f"   🔗 Conectividade: {rate:.1f}%")
             
-            if 'ap' in df.columns:
-                aps = df['ap'].unique()
-                print(f"   📡 APs utilizados: {len(aps)}")
+            if 'aps' in summary:
+                print(f"   📡 APs utilizados: {len(summary['aps'])}")
     
     def interactive_menu(self):
         """Menu interativo para o usuário"""
@@ -283,7 +297,7 @@ class DataViewer:
             print("1. 📋 Ver logs disponíveis")
             print("2. 📊 Resumo de um log")
             print("3. 📋 Ver dados em tabela")
-            print("4. 🔄 Comparar dois logs")
+            print("4. 🔄 Comparar logs")
             print("5. 📈 Estatísticas rápidas")
             print("6. 🚪 Sair")
             
@@ -315,13 +329,12 @@ class DataViewer:
             elif choice == '4':
                 self.show_available_logs()
                 if len(self.logs) >= 2:
-                    log1 = input("\nDigite o nome do primeiro log: ").strip()
-                    log2 = input("Digite o nome do segundo log: ").strip()
+                    names = input("\nDigite os nomes dos logs (separados por espaço, o primeiro é a base): ").split()
                     
-                    if log1 in self.logs and log2 in self.logs:
-                        self.compare_logs(log1, log2)
+                    if len(names) >= 2 and all(name in self.logs for name in names):
+                        self.compare_logs(*names)
                     else:
-                        print("❌ Um ou ambos os logs não encontrados!")
+                        print("❌ Informe pelo menos 2 logs existentes!")
                 else:
                     print("❌ Precisa de pelo menos 2 logs para comparar!")
             
@@ -342,12 +355,22 @@ def main():
     parser.add_argument('--log', help='Log específico para analisar')
     parser.add_argument('--summary', action='store_true', help='Mostrar resumo')
     parser.add_argument('--table', action='store_true', help='Mostrar tabela')
-    parser.add_argument('--compare', nargs=2, help='Comparar dois logs')
+    parser.add_argument('--compare', nargs='+', metavar='LOG|GRUPO=GLOB',
+                        help='Comparar N logs ou grupos (ex.: A="runs/a/*/*.csv" B="runs/b/*/*.csv")')
+    parser.add_argument('--group-by', metavar='PARAM',
+                        help='Comparar execuções do catálogo agrupadas por um parâmetro (ex.: speed)')
+    parser.add_argument('--scenario', help='Cenário das execuções para --group-by')
+    parser.add_argument('--baseline', help='Linha de base da comparação (padrão: o primeiro)')
+    parser.add_argument('--align', choices=ALIGN_MODES, default='time',
+                        help='Alinhamento das séries: tempo decorrido ou índice do registro')
+    parser.add_argument('--report', help='Salvar a comparação em JSON')
     parser.add_argument('--quick', action='store_true', help='Estatísticas rápidas')
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='Memória máxima para logs carregados na sessão (MB)')
     
     args = parser.parse_args()
     
-    viewer = DataViewer()
+    viewer = DataViewer(cache_bytes=args.cache_mb * 1024 * 1024)
     
     if args.interactive:
         viewer.interactive_menu()
@@ -358,8 +381,17 @@ def main():
             viewer.show_table(args.log)
         else:
             viewer.show_summary(args.log)
-    elif args.compare:
-        viewer.compare_logs(args.compare[0], args.compare[1])
+    elif args.compare or args.group_by:
+        groups = catalog_groups(args.group_by, scenario=args.scenario, under='.') if args.group_by else {}
+        log_files = []
+        for item in args.compare or []:
+            if '=' in item:
+                label, pattern = item.split('=', 1)
+                groups[label] = sorted(glob.glob(pattern, recursive=True))
+            else:
+                log_files.append(item)
+        viewer.compare_logs(*log_files, groups=groups, baseline=args.baseline, align=args.align,
+                            report_file=args.report)
     elif args.quick:
         viewer.show_quick_stats()
     else:
@@ -2,23 +2,63 @@
 """
 Interface Web para Visualização dos Cenários Mininet-WiFi
 """
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, send_file, url_for, stream_with_context
 import pandas as pd
 import os
+import csv
 import glob
 import json
+import itertools
+import threading
+import time
 from datetime import datetime
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 import io
-import base64
 import numpy as np
 from PIL import Image
 
+from framework.apsummary import ap_summary
+from framework.catalog import RunCatalog, file_kind
+from framework.chartcache import ChartCache
+from framework.coverage import LAYERS as COVERAGE_LAYERS, coverage_grid, topology_from_catalog, topology_key
+from framework.jsonlog import is_json_log, iter_json_log
+from framework.logmeta import LogMetadataCache
+from framework.logstore import load_log
+from framework.stats import RunningStats
+
 app = Flask(__name__)
 
+# Cache persistente de metadados dos logs (invalidado por mtime/tamanho)
+log_metadata = LogMetadataCache()
+
+# Catálogo SQLite de execuções; arquivos criados fora dos cenários são
+# catalogados por uma varredura leve (stat) a cada CATALOG_SYNC_INTERVAL s
+CATALOG_SYNC_INTERVAL = 30
+_catalog_local = threading.local()
+_catalog_synced_at = float('-inf')
+
+SCENARIO_NAMES = {
+    'rasp_car_scan': 'Rasp-Car Scanner',
+    'rasp_car_rout_scan': 'Rasp-Car-Rout Scanner',
+    'rasp_car_scan_extended': 'Rasp-Car Scanner (Estendido)',
+    'rasp_car_json_log': 'Rasp-Car Scanner (JSON)',
+    'mastering_scenario_1': 'Mastering Scenario 1'
+}
+
+# Cache em disco dos gráficos renderizados (hash do conteúdo + parâmetros, LRU)
+chart_cache = ChartCache()
+SUMMARY_CHART_DPI = 300
+COVERAGE_RESOLUTION = (0.25, 5.0)  # metros, faixa aceita em ?resolution=
+
+# Linhas por bloco na leitura em streaming de /api/log_data
+LOG_DATA_CHUNK_ROWS = 50000
+
+# Logs só são servidos de dentro do diretório do projeto
+PROJECT_ROOT = os.path.dirname(os.path.realpath(__file__))
+
 # Configurar estilo dos gráficos
 plt.style.use('default')
 sns.set_palette("husl")
@@ -39,22 +79,53 @@ def convert_png_to_jpeg(png_path, jpeg_path=None):
         print(f"Erro ao converter {png_path}: {e}")
         return None
 
+def resolve_log_path(filename):
+    """Caminho real do log pedido na URL, ou None se não existir, estiver fora do
+    projeto ou não for um log (mesma regra do catálogo: file_kind == 'log')"""
+    path = os.path.realpath(filename)
+    if os.path.commonpath([path, PROJECT_ROOT]) != PROJECT_ROOT or not os.path.isfile(path):
+        return None
+    if file_kind(path) != 'log':
+        return None
+    return path
+
+def get_catalog():
+    """Catálogo de execuções (uma conexão SQLite por thread)"""
+    if not hasattr(_catalog_local, 'catalog'):
+        _catalog_local.catalog = RunCatalog(metadata=log_metadata)
+    return _catalog_local.catalog
+
+def sync_catalog(force=False):
+    """Catalogar arquivos criados fora dos cenários (no máximo a cada CATALOG_SYNC_INTERVAL s)"""
+    global _catalog_synced_at
+    if not force and time.monotonic() - _catalog_synced_at < CATALOG_SYNC_INTERVAL:
+        return
+    get_catalog().backfill('.')
+    log_metadata.save()
+    _catalog_synced_at = time.monotonic()
+
+def list_catalog_logs():
+    """Logs CSV catalogados sob o diretório atual (inclui logs/ e runs/)"""
+    sync_catalog()
+    entries = get_catalog().list_files(kind='log', formats=['csv'], under='.')
+    for entry in entries:
+        entry['filename'] = os.path.relpath(entry['path'])
+    return entries
+
 def get_available_logs():
-    """Obter lista de logs CSV disponíveis"""
-    csv_files = glob.glob("*.csv")
+    """Obter lista de logs CSV disponíveis (consulta ao catálogo)"""
     logs = []
-    for file in csv_files:
-        if file.endswith('.csv') and 'log' in file:
-            try:
-                df = pd.read_csv(file)
-                logs.append({
-                    'filename': file,
-                    'records': len(df),
-                    'scenario': 'Rasp-Car Scanner' if 'rasp_car_scan' in file else 'Rasp-Car-Rout Scanner',
-                    'last_modified': datetime.fromtimestamp(os.path.getmtime(file)).strftime('%Y-%m-%d %H:%M:%S')
-                })
-            except:
-                continue
+    for entry in list_catalog_logs():
+        logs.append({
+            'filename': entry['filename'],
+            'records': entry['records'],
+            'columns': entry['columns'],
+            'time_start': entry['time_start'],
+            'time_end': entry['time_end'],
+            'aps': entry['aps'],
+            'scenario': SCENARIO_NAMES.get(entry['scenario'], entry['scenario']),
+            'last_modified': datetime.fromtimestamp(entry['mtime']).strftime('%Y-%m-%d %H:%M:%S')
+        })
     return logs
 
 def get_available_graphs():
@@ -76,19 +147,20 @@ def get_available_graphs():
             })
     return graphs
 
-def create_summary_chart(log_file):
-    """Criar gráfico resumo dos dados"""
+def create_summary_chart(log_file, dpi=SUMMARY_CHART_DPI):
+    """Criar gráfico resumo dos dados (PNG em bytes)"""
     try:
-        df = pd.read_csv(log_file)
+        df = load_log(log_file)
         
         # Criar figura com subplots
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
         fig.suptitle(f'Análise do Cenário: {log_file}', fontsize=16, fontweight='bold')
         
         # 1. RSSI por AP
-        if 'ap' in df.columns:
-            ap_rssi = df.groupby('ap')['rssi'].agg(['mean', 'min', 'max']).reset_index()
-            ax1.bar(ap_rssi['ap'], ap_rssi['mean'], yerr=[ap_rssi['mean'] - ap_rssi['min'], ap_rssi['max'] - ap_rssi['mean']], 
+        ap_rssi = ap_summary(df)
+        if 'rssi_mean' in ap_rssi.columns:
+            ax1.bar(ap_rssi.index, ap_rssi['rssi_mean'],
+                   yerr=[ap_rssi['rssi_mean'] - ap_rssi['rssi_min'], ap_rssi['rssi_max'] - ap_rssi['rssi_mean']], 
                    capsize=5, alpha=0.7)
             ax1.set_title('RSSI Médio por Access Point')
             ax1.set_ylabel('RSSI (dBm)')
@@ -120,55 +192,101 @@ def create_summary_chart(log_file):
         
         plt.tight_layout()
         
-        # Converter para base64
+        # Renderizar PNG em memória
+        img_buffer = io.BytesIO()
+        plt.savefig(img_buffer, format='png', dpi=dpi, bbox_inches='tight')
+        plt.close(fig)
+        
+        return img_buffer.getvalue()
+    except Exception as e:
+        plt.close('all')
+        return None
+
+COVERAGE_LABELS = {
+    'best_rssi': ('Melhor RSSI', 'RSSI (dBm)'),
+    'sinr': ('SINR do Melhor AP', 'SINR (dB)'),
+    'best_ap': ('Área de Cada AP', 'AP')
+}
+
+def create_coverage_chart(log_file, topology, layer='best_rssi', dpi=SUMMARY_CHART_DPI):
+    """Mapa de calor de cobertura da topologia, com o percurso do log (PNG em bytes)"""
+    try:
+        grid = coverage_grid(topology)
+        raster = grid.layer(layer)[0]  # primeira altura
+        title, label = COVERAGE_LABELS[layer]
+        
+        fig, ax = plt.subplots(figsize=(12, 8))
+        step = topology['resolution'] / 2
+        extent = (grid.xs[0] - step, grid.xs[-1] + step, grid.ys[0] - step, grid.ys[-1] + step)
+        if layer == 'best_ap':
+            cmap = plt.get_cmap('tab10', len(grid.ap_names))
+            image = ax.imshow(raster, origin='lower', extent=extent, cmap=cmap, alpha=0.8,
+                              vmin=-0.5, vmax=len(grid.ap_names) - 0.5, interpolation='nearest')
+            colorbar = fig.colorbar(image, ax=ax, ticks=range(len(grid.ap_names)))
+            colorbar.ax.set_yticklabels(grid.ap_names)
+        else:
+            image = ax.imshow(raster, origin='lower', extent=extent, cmap='RdYlGn', interpolation='bilinear')
+            colorbar = fig.colorbar(image, ax=ax)
+        colorbar.set_label(label)
+        
+        # APs e percurso registrado no log
+        for ap in topology['aps']:
+            ax.plot(ap['x'], ap['y'], marker='^', color='black', markersize=12)
+            ax.annotate(ap['name'], (ap['x'], ap['y']), textcoords='offset points', xytext=(0, 10), ha='center')
+        df = load_log(log_file, xyz=True)
+        if {'x', 'y'} <= set(df.columns):
+            ax.plot(df['x'], df['y'], color='blue', linewidth=2, marker='o', markersize=3, alpha=0.7, label='Percurso')
+            ax.legend(loc='upper right')
+        
+        ax.set_title(f'{title} - {log_file}', fontsize=14, fontweight='bold')
+        ax.set_xlabel('X (m)')
+        ax.set_ylabel('Y (m)')
+        plt.tight_layout()
+        
         img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-        plt.close()
+        plt.savefig(img_buffer, format='png', dpi=dpi, bbox_inches='tight')
+        plt.close(fig)
         
-        return img_base64
+        return img_buffer.getvalue()
     except Exception as e:
+        plt.close('all')
         return None
 
+def summary_chart_dpi():
+    """Resolução do gráfico resumo pedida na URL (limitada)"""
+    dpi = request.args.get('dpi', SUMMARY_CHART_DPI, type=int)
+    return min(max(dpi, 50), SUMMARY_CHART_DPI)
+
+def coverage_resolution():
+    """Resolução do mapa de cobertura pedida na URL (limitada)"""
+    resolution = request.args.get('resolution', 1.0, type=float)
+    low, high = COVERAGE_RESOLUTION
+    return min(max(resolution, low), high)
+
 def get_masters_statistics():
     """Calcular estatísticas reais para a seção do mestrado"""
     try:
-        csv_files = glob.glob("*.csv")
-        all_stats = {
-            'total_rssi': [],
-            'total_distance': [],
-            'total_latency': [],
-            'total_connectivity': [],
-            'total_records': 0
-        }
+        # Agregados por arquivo guardados no catálogo, mesclados em O(arquivos)
+        totals = {column: RunningStats() for column in ('rssi', 'distance', 'latency')}
+        connectivity_rates = []
+        total_records = 0
         
-        for file in csv_files:
-            if file.endswith('.csv') and 'log' in file:
-                try:
-                    df = pd.read_csv(file)
-                    all_stats['total_records'] += len(df)
-                    
-                    if 'rssi' in df.columns:
-                        all_stats['total_rssi'].extend(df['rssi'].dropna().tolist())
-                    if 'distance' in df.columns:
-                        all_stats['total_distance'].extend(df['distance'].dropna().tolist())
-                    if 'latency' in df.columns:
-                        all_stats['total_latency'].extend(df['latency'].dropna().tolist())
-                    if 'connected' in df.columns:
-                        connected_count = (df['connected'] == 'YES').sum()
-                        all_stats['total_connectivity'].append(connected_count / len(df) * 100)
-                except:
-                    continue
-        
-        # Calcular médias
+        for entry in list_catalog_logs():
+            total_records += entry['records'] or 0
+            for column, acc in totals.items():
+                if column in entry['stats']:
+                    acc.merge(RunningStats.from_dict(entry['stats'][column]))
+            if entry['connectivity_rate'] is not None:
+                connectivity_rates.append(entry['connectivity_rate'])
+        
+        rssi, distance, latency = totals['rssi'], totals['distance'], totals['latency']
         stats = {
-            'avg_rssi': round(np.mean(all_stats['total_rssi']), 1) if all_stats['total_rssi'] else -45,
-            'min_distance': round(min(all_stats['total_distance']), 1) if all_stats['total_distance'] else 2,
-            'max_distance': round(max(all_stats['total_distance']), 1) if all_stats['total_distance'] else 15,
-            'avg_latency': round(np.mean(all_stats['total_latency']), 1) if all_stats['total_latency'] else 50,
-            'connectivity_rate': round(np.mean(all_stats['total_connectivity']), 1) if all_stats['total_connectivity'] else 95,
-            'total_records': all_stats['total_records']
+            'avg_rssi': round(rssi.mean, 1) if rssi.count else -45,
+            'min_distance': round(distance.minimum, 1) if distance.count else 2,
+            'max_distance': round(distance.maximum, 1) if distance.count else 15,
+            'avg_latency': round(latency.mean, 1) if latency.count else 50,
+            'connectivity_rate': round(np.mean(connectivity_rates), 1) if connectivity_rates else 95,
+            'total_records': total_records
         }
         
         return stats
@@ -201,11 +319,14 @@ def index():
                          total_graphs=total_graphs,
                          masters_stats=masters_stats)
 
-@app.route('/view_log/<filename>')
+@app.route('/view_log/<path:filename>')
 def view_log(filename):
     """Visualizar log específico"""
+    path = resolve_log_path(filename)
+    if path is None:
+        return "Log não encontrado", 404
     try:
-        df = pd.read_csv(filename)
+        df = load_log(path)
         
         # Estatísticas básicas
         stats = {
@@ -218,21 +339,93 @@ def view_log(filename):
             'connectivity_rate': (df['connected'] == 'YES').mean() * 100 if 'connected' in df.columns else 0
         }
         
+        # Resumo por AP (uma agregação agrupada)
+        ap_table = ap_summary(df).round(2).reset_index().to_dict('records')
+        
         # Dados para tabela
         table_data = df.head(20).to_dict('records')
         
-        # Gráfico resumo
-        summary_chart = create_summary_chart(filename)
+        # Gráfico resumo (servido à parte, via cache)
+        summary_chart = url_for('summary_chart', filename=filename)
+        
+        # Mapa de cobertura: só para logs de execuções com APs no catálogo
+        coverage_chart = None
+        if topology_from_catalog(filename, get_catalog()):
+            coverage_chart = url_for('coverage_chart', filename=filename)
         
         return render_template('view_log.html', 
                              filename=filename,
                              stats=stats,
                              table_data=table_data,
+                             ap_table=ap_table,
                              summary_chart=summary_chart,
+                             coverage_chart=coverage_chart,
+                             coverage_layers=COVERAGE_LAYERS,
                              total_records=len(df))
     except Exception as e:
         return f"Erro ao carregar log: {str(e)}"
 
+@app.route('/charts/summary/<path:filename>')
+def summary_chart(filename):
+    """Gráfico resumo de um log, renderizado uma vez e servido do cache"""
+    path = resolve_log_path(filename)
+    if path is None:
+        return "Log não encontrado", 404
+    try:
+        dpi = summary_chart_dpi()
+        key = chart_cache.key(path, chart='summary', dpi=dpi)
+        
+        # Cliente já tem esta versão: nem renderizar nem ler o PNG
+        if key in request.if_none_match:
+            response = app.response_class(status=304)
+            response.set_etag(key)
+            return response
+        
+        chart_path = chart_cache.get_or_render(key, lambda: create_summary_chart(path, dpi=dpi))
+        if chart_path is None:
+            return "Erro ao gerar gráfico", 500
+        
+        response = send_file(chart_path, mimetype='image/png', etag=key, conditional=True)
+        response.cache_control.no_cache = True  # sempre revalidar: o log pode crescer
+        return response
+    except Exception as e:
+        return f"Erro ao gerar gráfico: {str(e)}", 500
+
+@app.route('/charts/coverage/<path:filename>')
+def coverage_chart(filename):
+    """Mapa de calor de cobertura da execução que gerou o log (?layer=best_rssi|sinr|best_ap)"""
+    path = resolve_log_path(filename)
+    if path is None:
+        return "Log não encontrado", 404
+    layer = request.args.get('layer', 'best_rssi')
+    if layer not in COVERAGE_LAYERS:
+        return f"Camada inválida: {layer}", 400
+    try:
+        topology = topology_from_catalog(filename, get_catalog(), resolution=coverage_resolution())
+    except ValueError as e:
+        return str(e), 400
+    try:
+        if topology is None:
+            return "Topologia da execução não encontrada no catálogo", 404
+        dpi = summary_chart_dpi()
+        key = chart_cache.key(path, chart='coverage', layer=layer, topology=topology_key(topology), dpi=dpi)
+        
+        if key in request.if_none_match:
+            response = app.response_class(status=304)
+            response.set_etag(key)
+            return response
+        
+        chart_path = chart_cache.get_or_render(
+            key, lambda: create_coverage_chart(path, topology, layer=layer, dpi=dpi))
+        if chart_path is None:
+            return "Erro ao gerar mapa de cobertura", 500
+        
+        response = send_file(chart_path, mimetype='image/png', etag=key, conditional=True)
+        response.cache_control.no_cache = True
+        return response
+    except Exception as e:
+        return f"Erro ao gerar mapa de cobertura: {str(e)}", 500
+
 @app.route('/view_graph/<filename>')
 def view_graph(filename):
     """Visualizar gráfico específico"""
@@ -267,14 +460,129 @@ def api_logs():
     logs = get_available_logs()
     return jsonify(logs)
 
-@app.route('/api/log_data/<filename>')
+def window_chunks(chunks, columns=None, start=None, end=None, offset=0, limit=None):
+    """Aplicar projeção, filtro de tempo e janela (offset/limit) a blocos de DataFrame
+
+    Colunas e timestamp são validados só no primeiro bloco (antes de a resposta
+    começar); nos blocos seguintes, campos ausentes viram nulos.
+    """
+    time_filter = start is not None or end is not None
+    to_skip = offset
+    remaining = limit
+    validated = False
+    for chunk in chunks:
+        if not validated:
+            missing = [column for column in columns or [] if column not in chunk.columns]
+            if missing:
+                raise ValueError(f"Colunas inexistentes: {', '.join(missing)}")
+            if time_filter and 'timestamp' not in chunk.columns:
+                raise ValueError("Log sem coluna 'timestamp' para filtro de tempo")
+            validated = True
+        if time_filter:
+            timestamps = chunk['timestamp'] if 'timestamp' in chunk.columns else pd.Series(np.nan, index=chunk.index)
+            mask = pd.Series(True, index=chunk.index)
+            if start is not None:
+                mask &= timestamps >= start
+            if end is not None:
+                mask &= timestamps <= end
+            chunk = chunk[mask]
+        if to_skip:
+            skipped = min(to_skip, len(chunk))
+            chunk = chunk.iloc[skipped:]
+            to_skip -= skipped
+        if remaining is not None:
+            chunk = chunk.iloc[:remaining]
+            remaining -= len(chunk)
+        if len(chunk):
+            yield chunk.reindex(columns=columns) if columns else chunk
+        if remaining == 0:
+            break
+
+def iter_log_chunks(filename, columns=None, start=None, end=None, offset=0, limit=None):
+    """Ler um log CSV em blocos, aplicando projeção, filtro de tempo e janela"""
+    with open(filename, newline='') as f:
+        header = next(csv.reader(f), [])
+    
+    missing = [column for column in columns or [] if column not in header]
+    if missing:
+        raise ValueError(f"Colunas inexistentes: {', '.join(missing)}")
+    
+    time_filter = start is not None or end is not None
+    if time_filter and 'timestamp' not in header:
+        raise ValueError("Log sem coluna 'timestamp' para filtro de tempo")
+    usecols = None
+    if columns:
+        usecols = list(columns) + (['timestamp'] if time_filter and 'timestamp' not in columns else [])
+    
+    # Sem filtro de tempo, as linhas anteriores ao offset nem viram DataFrame
+    skiprows = range(1, offset + 1) if offset and not time_filter else None
+    if skiprows:
+        offset = 0
+    
+    reader = pd.read_csv(filename, usecols=usecols, skiprows=skiprows, chunksize=LOG_DATA_CHUNK_ROWS)
+    with reader:
+        yield from window_chunks(reader, columns, start, end, offset, limit)
+
+def iter_json_log_chunks(filename, columns=None, start=None, end=None, offset=0, limit=None):
+    """Ler um log JSON/JSONL em blocos de registros achatados (ex.: best_ap.rssi)"""
+    def batches():
+        batch = []
+        for _, record in iter_json_log(filename):
+            batch.append(record)
+            if len(batch) >= LOG_DATA_CHUNK_ROWS:
+                yield pd.json_normalize(batch)
+                batch = []
+        if batch:
+            yield pd.json_normalize(batch)
+    
+    yield from window_chunks(batches(), columns, start, end, offset, limit)
+
+def generate_json_array(chunks):
+    """Serializar blocos como um único array JSON, sem montar a lista inteira"""
+    yield '['
+    first = True
+    for chunk in chunks:
+        records = chunk.to_json(orient='records')[1:-1]
+        if records:
+            yield records if first else ',' + records
+            first = False
+    yield ']'
+
+def generate_ndjson(chunks):
+    """Serializar blocos como NDJSON (um registro por linha)"""
+    for chunk in chunks:
+        yield chunk.to_json(orient='records', lines=True).rstrip('\n') + '\n'
+
+@app.route('/api/log_data/<path:filename>')
 def api_log_data(filename):
-    """API para obter dados do log"""
+    """API para obter dados do log
+    
+    Parâmetros opcionais: offset, limit, columns (separadas por vírgula),
+    start/end (faixa de timestamp) e format=ndjson para streaming por linha.
+    Logs JSON/JSONL são lidos registro a registro, com campos aninhados
+    achatados (ex.: columns=timestamp,best_ap.rssi).
+    """
+    path = resolve_log_path(filename)
+    if path is None:
+        return jsonify({'error': 'Log não encontrado'}), 404
     try:
-        df = pd.read_csv(filename)
-        return jsonify(df.to_dict('records'))
-    except:
-        return jsonify([])
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        limit = request.args.get('limit', type=int)
+        columns = [column for column in request.args.get('columns', '').split(',') if column]
+        start = request.args.get('start', type=float)
+        end = request.args.get('end', type=float)
+        
+        read_chunks = iter_json_log_chunks if is_json_log(path) else iter_log_chunks
+        chunks = read_chunks(path, columns, start, end, offset,
+                             max(limit, 0) if limit is not None else None)
+        first_chunk = next(chunks, None)  # valida parâmetros antes de iniciar a resposta
+        chunks = itertools.chain([first_chunk] if first_chunk is not None else [], chunks)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if request.args.get('format') == 'ndjson':
+        return app.response_class(stream_with_context(generate_ndjson(chunks)), mimetype='application/x-ndjson')
+    return app.response_class(stream_with_context(generate_json_array(chunks)), mimetype='application/json')
 
 @app.route('/run_scenario/<scenario>')
 def run_scenario(scenario):